@@ -1,6 +1,35 @@
 import numpy as np
 import random as rd
 import types as tp
+import os
+import concurrent.futures as cf
+import json
+import time
+import tracemalloc
+import hashlib
+import pickle
+import statistics
+
+## Numba is optional, and only used by the 'numba' backend of the batch engine
+try:
+    import numba
+except ImportError:
+    numba = None
+
+## SciPy is optional, and only used by analyse_game to solve large boards with sparse matrices
+try:
+    import scipy.sparse as sps
+    import scipy.sparse.csgraph as csgraph
+    import scipy.sparse.linalg as spsla
+except ImportError:
+    sps = None
+
+
+## Version of the engines, which is part of every cache key (changed whenever a change to the engines changes the games played for a seed)
+_ENGINE_VERSION = 1
+
+## Largest number of squares analyse_game solves as a dense matrix when SciPy isn't installed
+_DENSE_ANALYSIS_SQUARES = 5000
 
 
 class SnakesAndLadders:
@@ -11,15 +40,39 @@ class SnakesAndLadders:
     Snakes: the 2D list/ndarray containing the start and end square for every snake.
     Ladders: the 2D list/ndarray containing the start and end square for every ladder.
     Overflow: What to do if the rolled square is beyond the last on the board. 'classic': overflows count as last square; 'rollback': overflows are subtracted from last; 'ignore': overflows aren't counted.
-    Squares: The list that stores each square (defined as Square class) on the board.
+    Dice: the Dice rolled to move (one six-sided die by default).
+    Storage: how the tables below are stored. 'dense': arrays with a row for every square; 'sparse': only the squares with a snake/ladder are stored (see SparseJumpTable, SparseNextTable), and every other square is worked out from its number when it is looked up.
+    Squares: The list-like SquareList of each square (defined as Square class) on the board, built from the tables below only when a square is asked for.
+    JumpTable: the array of the square at the end of the snake/ladder on each square (itself if it has neither), indexed by square number.
+    ChainTable: the same as JumpTable, but following any snakes/ladders chained after the first (only the first for chains that loop).
+    OverflowTables: the dictionary with an array for each Overflow type of the square reached for each roll in Dice.Rolls (columns) from each square (rows), with overflows dealt with.
+    TerminalMask: the array of whether each square ends the game, indexed by square number.
+    NextTable: the array of the square reached for each roll in Dice.Rolls (columns) from each square (rows), with a snake/ladder being a separate turn.
+    MergedNextTable: the same as NextTable, but with the snake/ladder on the rolled square (and any chained after it) taken in the same turn.
+    Die: the Die that play_game rolls when it isn't given its own seed/rng, carrying on from where the last call stopped.
 
         Methods:
     __init__(...): instantiates the class (defines and creates a Snakes and Ladders game).
     play_game(...): plays Snakes and Ladder game a specified number of times.
+    iter_games(...): plays Snakes and Ladder game a specified number of times, yielding the games a chunk at a time.
+    archive_games(...): plays Snakes and Ladder game a specified number of times, writing the games to an archive on disk a chunk at a time.
+    play_until(...): plays Snakes and Ladder game in batches until the game statistics are known to a given precision.
+    transition_matrix(...): gets the probability of moving from each square to each other square in one turn.
+    analyse_game(...): calculates the exact game length distribution and expected square visits for a single player game.
+    analyse_multiplayer_game(...): calculates the exact winner and game length distributions for a game with several players.
+    _compile_board(...): compiles the Snakes and Ladders lists and Overflow into the flat lookup tables that the games are played with.
+    _compile_sparse_board(...): compiles the checked snakes and ladders into sparse tables.
+    _cache_key(...): gets the ResultCache key of a run on this board.
+    _get_die(...): gets the Die that a run rolls.
+    _event_table(...): gets the snake hits, ladder hits and overflows of a move from each square for each roll, for the run report.
+    _play_game_loop(...): plays the games of a play_game call one at a time, move by move.
+    _play_game_parallel(...): splits the games of a play_game call between processes that each play their share with the batch engine.
+    _play_game_batch(...): plays every game of a play_game call at once, moving all unfinished games forward together each turn.
+    _play_game_rolls(...): plays games from a given array of die rolls for every turn and player, for comparing games on the same rolls.
     '''
 
 
-    def __init__(self, numSquares, Snakes, Ladders, Overflow='classic'):
+    def __init__(self, numSquares, Snakes, Ladders, Overflow='classic', seed=None, rng=None, dice=None, Storage='auto'):
         '''Instantiates the class (defines and creates a Snakes and Ladders game).
 
             Inputs:
@@ -27,6 +80,10 @@ class SnakesAndLadders:
         Snakes: the 2D list/ndarray containing the start and end square for every snake.
         Ladders: the 2D list/ndarray containing the start and end square for every ladder.
         Overflow: What to do if the rolled square is beyond the last on the board. 'classic': overflows count as last square; 'rollback': overflows are subtracted from last; 'ignore': overflows aren't counted.
+        seed: the seed (e.g. an integer or numpy.random.SeedSequence) for the game's die, so the same seed gives the same games over the same play_game calls. None gives different games each time.
+        rng: the numpy.random.Generator for the game's die (used instead of seed).
+        dice: the Dice rolled to move (or the dictionary of its inputs, see Dice.spec). None gives one six-sided die.
+        Storage: how the tables are stored. 'dense': arrays with a row for every square; 'sparse': only the squares with a snake/ladder are stored, so boards with millions of squares take little memory and build at once; 'auto': sparse for boards with more than a million squares.
            
             Outputs:
         [No Outputs]
@@ -67,28 +124,32 @@ class SnakesAndLadders:
                         print(f"WARNING: {name} should be an (n by 2) array but is {type(snkOrLddr)}, where n is the number of {name}. Therefore, replaced with empty list.")
                     newSnkOrLddr = []
 
-            ## Predefines number for counting number of Snakes list rows, and flag for invalid 'snake'
-            num = 0
-            invalid = False
+            if len(newSnkOrLddr) == 0:
+                return newSnkOrLddr
+
+            ## Finds the 'snakes/ladders' with invalid bound(s) all at once
+            bounds = np.asarray(newSnkOrLddr)
+            minBounds, maxBounds = np.min(bounds, axis=1), np.max(bounds, axis=1)
+            tooSmall = minBounds < 1 ### Less than minimum
+            tooBig = ~tooSmall & (maxBounds > self.numSquares) ### More than maximum
+            same = ~tooSmall & ~tooBig & (minBounds == maxBounds) ### Same square values
+            invalid = tooSmall | tooBig | same
 
-            ### Removes 'snakes/ladders' from the list with invalid bound(s)
-            for nsl in newSnkOrLddr:
-                invalid = False
+            if not np.any(invalid):
+                return newSnkOrLddr
 
-                if np.min(nsl) < 1: ### Less than minimum
+            ### Warns about each invalid bound in order
+            for num in np.flatnonzero(invalid):
+                nsl = newSnkOrLddr[num]
+                if tooSmall[num]:
                     print(f"WARNING: A min. bound in {name} can't be less than 1, therefore bound {nsl} is deleted.")
-                    invalid = True
-                elif np.max(nsl) > self.numSquares: ### More than maximum
+                elif tooBig[num]:
                     print(f"WARNING: A max. bound in {name} can't be greater than {self.numSquares}, therefore bound {nsl} is deleted.")
-                    invalid = True
-                elif np.min(nsl) == np.max(nsl): ### Same square values
+                else:
                     print(f"WARNING: The bounds in {name} can't be the same, therefore bound {nsl} is deleted.")
-                    invalid = True
-                else: 
-                    num = num + 1
 
-                if invalid == True:
-                    newSnkOrLddr = np.delete(newSnkOrLddr, num, 0) #### Deletes bounds (row of list) if it is invalid
+            ### Removes the invalid bounds (rows of list)
+            newSnkOrLddr = bounds[~invalid]
 
             return newSnkOrLddr
 
@@ -113,352 +174,3419 @@ class SnakesAndLadders:
             print(f"WARNING: {str(e)}, so Overflow is not valid. Setting to Classic.") ### e is the error message
             self.Overflow = 'classic'
 
-        ## Predefines list of squares
-        self.Squares = []
+        ## Makes sure that dice is valid and stores it as an attribute
+        if dice is None:
+            self.Dice = Dice()
+        elif isinstance(dice, Dice):
+            self.Dice = dice
+        elif isinstance(dice, dict):
+            self.Dice = Dice(**dice)
+        else:
+            print(f"WARNING: dice should be a Dice but is {type(dice)}, so one six-sided die is used.")
+            self.Dice = Dice()
+
+        ## Makes sure that Storage type is valid and stores it as an attribute
+        default = 'sparse' if self.numSquares > 1000000 else 'dense' ## default storage for 'auto' and invalid inputs
+        try:
+            match Storage.lower():
+                case 'dense'|'d':
+                    self.Storage = 'dense'
+                case 'sparse'|'s':
+                    self.Storage = 'sparse'
+                case 'auto'|'a':
+                    self.Storage = default
+                case _: #### Invalid type
+                    print(f"WARNING: Storage is not valid. Setting to {default}.")
+                    self.Storage = default
+        except Exception as e: ## Catch any exceptions, especially AttributeError from not having lower() method
+            print(f"WARNING: {str(e)}, so Storage is not valid. Setting to {default}.") ### e is the error message
+            self.Storage = default
+
+        ## Compiles the board into the lookup tables that the games are played with
+        self._compile_board()
+
+        ## Die used by play_game when it isn't given its own seed/rng
+        self.Die = Die(seed=seed, rng=rng, dice=self.Dice)
+
+
+
+    def _compile_board(self):
+        '''Compiles the Snakes and Ladders lists and Overflow into the flat lookup tables that the games are played with.
+
+            Inputs:
+        [No Inputs]
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        ## Smallest integer type that fits every square number (row 0 of each table is unused padding so square numbers can index directly)
+        if self.numSquares < np.iinfo(np.int16).max:
+            self._sqrDtype = np.int16
+        else:
+            self._sqrDtype = np.int32
+
+        ## Start and end squares of each snake (top to bottom) and ladder (bottom to top)
+        snakes = np.reshape(np.asarray(self.Snakes, dtype=np.int64), (-1, 2))
+        ladders = np.reshape(np.asarray(self.Ladders, dtype=np.int64), (-1, 2))
+        snkStarts, snkEnds = np.max(snakes, axis=1), np.min(snakes, axis=1)
+        lddrStarts, lddrEnds = np.min(ladders, axis=1), np.max(ladders, axis=1)
+
+        ## Removes snakes/ladders on the last square
+        if np.any(snkStarts == self.numSquares):
+            print("WARNING: The last square can't have a snake.")
+        if np.any(lddrStarts == self.numSquares):
+            print("WARNING: The last square can't have a ladder.")
+
+        snkEnds, snkStarts = snkEnds[snkStarts != self.numSquares], snkStarts[snkStarts != self.numSquares]
+        lddrEnds, lddrStarts = lddrEnds[lddrStarts != self.numSquares], lddrStarts[lddrStarts != self.numSquares]
+
+        ## Only keeps the first snake/ladder listed for each square
+        snkStarts, first = np.unique(snkStarts, return_index=True)
+        snkEnds = snkEnds[first]
+        lddrStarts, first = np.unique(lddrStarts, return_index=True)
+        lddrEnds = lddrEnds[first]
+
+        ## Removes both the snake and the ladder from squares that have both
+        both = np.intersect1d(snkStarts, lddrStarts)
+        for sqrNum in both:
+            print(f"WARNING: Square {sqrNum} can't have both snakes and ladders, so it will have neither.")
+
+        if self.Storage == 'sparse':
+            self._compile_sparse_board(snkStarts, snkEnds, lddrStarts, lddrEnds, both)
+            return
+
+        sqrNums = np.arange(0, self.numSquares + 1, dtype=np.int32)
+
+        ## Square at the end of the snake/ladder on each square (itself if it has neither)
+        self.JumpTable = sqrNums.astype(self._sqrDtype)
+        self.JumpTable[snkStarts] = snkEnds
+        self.JumpTable[lddrStarts] = lddrEnds
+        self.JumpTable[both] = both
+
+        ## Square at the end of a chain of snakes/ladders (where one lands on another) from each square, found by jumping twice as far each time
+        jumpSqrs = np.flatnonzero(self.JumpTable != sqrNums)
+        chainTable = self.JumpTable.astype(np.int64)
+        for i in range(0, int(len(jumpSqrs)).bit_length()): ### A chain can't be longer than the number of snakes/ladders
+            chainTable = chainTable[chainTable]
+
+        ### Chains that end in a loop never end, so only their first snake/ladder is kept
+        inLoop = self.JumpTable[chainTable] != chainTable
+        if np.any(inLoop):
+            print(f"WARNING: The snakes and ladders on squares {np.unique(chainTable[inLoop]).tolist()} form a loop that can't be left.")
+
+        self.ChainTable = np.where(inLoop, self.JumpTable, chainTable).astype(self._sqrDtype)
+
+        ## Square reached for each roll from each square, with overflows dealt with for each Overflow type (the rollback window is as wide as the largest roll)
+        maxRoll = self.Dice.maxRoll
+        rolls = sqrNums[:, None] + self.Dice.Rolls.astype(np.int32) ### Rolled square numbers (rows are the squares, columns are the rolls)
+        rollbackRows = (self.numSquares - maxRoll < sqrNums) & (sqrNums < self.numSquares) ### Squares within the largest roll of the last square
+
+        self.OverflowTables = {
+            'classic': np.minimum(rolls, self.numSquares), ### Overflows count as last square
+            'rollback': np.where(rollbackRows[:, None], np.maximum(self.numSquares - maxRoll + self.Dice.Rolls, 1), rolls), ### Last maxRoll squares from end
+            'ignore': np.where(rolls > self.numSquares, sqrNums[:, None], rolls), ### Overflows stay on the current square
+        }
+
+        for overflow in self.OverflowTables:
+            self.OverflowTables[overflow][self.numSquares, :] = self.numSquares ### The last square is never left
+            self.OverflowTables[overflow] = self.OverflowTables[overflow].astype(self._sqrDtype, copy=False)
+
+        ## Whether each square ends the game
+        self.TerminalMask = sqrNums == self.numSquares
+
+        ## Square reached for each roll when the snake/ladder is a separate turn (the die isn't used on a snake/ladder square)
+        self.NextTable = np.where((self.JumpTable != sqrNums)[:, None], self.JumpTable[:, None], self.OverflowTables[self.Overflow])
+
+        ## Square reached for each roll when the snake/ladder on the rolled square (and any chained after it) is taken in the same turn
+        self.MergedNextTable = self.ChainTable[self.NextTable]
+
+
+
+    def _compile_sparse_board(self, snkStarts, snkEnds, lddrStarts, lddrEnds, both):
+        '''Compiles the checked snakes and ladders into sparse tables (see SparseJumpTable, SparseNextTable), which only store the squares with a snake/ladder, so the memory and time taken don't grow with the number of squares.
+
+            Inputs:
+        snkStarts, snkEnds: the arrays of the start and end square of each snake (with one per square).
+        lddrStarts, lddrEnds: the arrays of the start and end square of each ladder (with one per square).
+        both: the array of the squares with both a snake and a ladder, which have neither.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        ## Squares with a snake/ladder, in order
+        keepSnakes, keepLadders = ~np.isin(snkStarts, both), ~np.isin(lddrStarts, both)
+        jumpStarts = np.concat((snkStarts[keepSnakes], lddrStarts[keepLadders]))
+        jumpEnds = np.concat((snkEnds[keepSnakes], lddrEnds[keepLadders]))
+        order = np.argsort(jumpStarts)
+        jumpStarts, jumpEnds = jumpStarts[order], jumpEnds[order]
+
+        self.JumpTable = SparseJumpTable(jumpStarts, jumpEnds, numSquares=self.numSquares, dtype=self._sqrDtype)
+
+        ## Square at the end of a chain of snakes/ladders from each snake/ladder, found by jumping twice as far each time
+        chainEnds = np.copy(jumpEnds)
+        for i in range(0, int(len(jumpStarts)).bit_length()): ### A chain can't be longer than the number of snakes/ladders
+            chainEnds = SparseJumpTable(jumpStarts, chainEnds, numSquares=self.numSquares, dtype=np.int64)[chainEnds]
+
+        ### Chains that end in a loop never end, so only their first snake/ladder is kept
+        inLoop = self.JumpTable[chainEnds] != chainEnds
+        if np.any(inLoop):
+            print(f"WARNING: The snakes and ladders on squares {np.unique(chainEnds[inLoop]).tolist()} form a loop that can't be left.")
+
+        self.ChainTable = SparseJumpTable(jumpStarts, np.where(inLoop, jumpEnds, chainEnds), numSquares=self.numSquares, dtype=self._sqrDtype)
+
+        ## Square reached for each roll from each square, worked out when looked up
+        self.OverflowTables = {overflow: SparseNextTable(self.numSquares, self.Dice, overflow, dtype=self._sqrDtype) for overflow in ['classic', 'rollback', 'ignore']}
+        self.TerminalMask = SparseTerminalMask(self.numSquares)
+        self.NextTable = SparseNextTable(self.numSquares, self.Dice, self.Overflow, jumpTable=self.JumpTable, dtype=self._sqrDtype)
+        self.MergedNextTable = SparseNextTable(self.numSquares, self.Dice, self.Overflow, jumpTable=self.JumpTable, chainTable=self.ChainTable, dtype=self._sqrDtype)
+
+
+
+    @property
+    def Squares(self):
+        return SquareList(self)
+
+
+
+    def _cache_key(self, kind, **params):
+        '''Gets the ResultCache key of a run on this board, from the snakes and ladders actually on the board (so the order and repeats of the Snakes and Ladders lists don't matter) and the run's parameters.
+
+            Inputs:
+        kind: the name of the run, e.g. 'play_game'.
+        **params: the parameters of the run (any that change the result). A 'seed' parameter must be an integer or numpy.random.SeedSequence.
+
+            Outputs:
+        key: the cache key, or None if the seed can't be used in one.
+        '''
+
+        ## Normalises the seed, since only a seeded run can be repeated
+        if 'seed' in params:
+            seed = params['seed']
+            if isinstance(seed, np.random.SeedSequence):
+                params['seed'] = ['SeedSequence', str(seed.entropy), list(seed.spawn_key), seed.pool_size]
+            elif isinstance(seed, (int, np.integer)) and not isinstance(seed, bool):
+                params['seed'] = int(seed)
+            else:
+                return None
+
+        ## Snakes and ladders actually on the board, in square order
+        if self.Storage == 'sparse':
+            jumpSqrs = self.JumpTable.starts
+        else:
+            jumpSqrs = np.flatnonzero(self.JumpTable != np.arange(0, self.numSquares + 1))
+
+        params.update({
+            'kind': kind,
+            'numSquares': self.numSquares,
+            'Overflow': self.Overflow,
+            'Dice': self.Dice.spec(),
+            'Snakes': [[int(sqr), int(self.JumpTable[sqr])] for sqr in jumpSqrs if self.JumpTable[sqr] < sqr],
+            'Ladders': [[int(sqr), int(self.JumpTable[sqr])] for sqr in jumpSqrs if self.JumpTable[sqr] > sqr],
+            'engineVersion': _ENGINE_VERSION,
+        })
+
+        return ResultCache.make_key(params)
+
+
+
+    def _get_die(self, seed=None, rng=None):
+        '''Gets the Die that a run rolls: a new one from rng or seed if given, otherwise the game's own.
+
+            Inputs:
+        seed: the seed (e.g. an integer or numpy.random.SeedSequence) for the die rolls.
+        rng: the numpy.random.Generator (or Die) for the die rolls, used instead of seed.
+
+            Outputs:
+        die: the Die, which rolls the game's Dice.
+        '''
+
+        if isinstance(rng, Die):
+            if rng.Dice.spec() != self.Dice.spec():
+                print(f"WARNING: The given Die rolls {rng.Dice} rather than the game's {self.Dice}, so a new Die is made from its rng.")
+                return Die(rng=rng.rng, dice=self.Dice)
+            return rng
+        elif (rng != None) or (seed != None):
+            return Die(seed=seed, rng=rng, dice=self.Dice)
+        else:
+            return self.Die
+
+
+
+    def play_game(self, numPlayers, numTimes, maxTurns=100, Verbosity='full', sepSLturns=True, Engine='auto', seed=None, rng=None, numWorkers=1, collect='games', sinks=None, report=None, cache=None, Backend='auto'):
+        '''Plays Snakes and Ladder game a specified number of times.
+
+            Inputs:
+        numPlayers: the number of players for the game.
+        numTimes: the number of times to play the game.
+        maxTurns: the maximum number of turns before the game ends automatically.
+        Verbosity: the amount of messages about the game to show the user (shown by adding a PrintSink to sinks). 'full': shows the square for each player for each turn; 'reduced': only shows a summary including the number of turns, the winner and the final square of the other players at the end of the game; 'none': shows no messages about the game, only showing warning/error messages
+        sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together (along with any snakes/ladders chained after it).
+        Engine: how the games are played. 'batch': all games are played at once with NumPy arrays (no game events are sent, so no game messages are shown); 'loop': games are played one at a time, move by move; 'auto': 'batch' when there are no sinks (including from Verbosity), otherwise 'loop'.
+        seed: the seed (e.g. an integer or numpy.random.SeedSequence) for the die rolls, so the same seed gives the same games. None uses the game's Die.
+        rng: the numpy.random.Generator (or Die) for the die rolls, used instead of seed.
+        numWorkers: the number of processes to split the games between (batch engine only), with each process getting its own die roll stream from the seed. The same seed and numWorkers give the same games. None uses every CPU.
+        collect: what to return. 'games': the square numbers of every game; 'stats': only the statistics of the games, which are added up as the games are played without storing them (memory use depends on the board size rather than the number of games).
+        sinks: the callable (or list of callables) that each GameEvent of the games is sent to as it happens (loop engine only), e.g. a PrintSink or TraceSink. None sends no events.
+        report: whether to also return a run report. None: no report; 'timing': times the phases of the run and counts what happened in the games; 'memory': also traces the peak memory with tracemalloc (which slows the loop engine down a lot).
+        cache: the ResultCache (or its directory) to look the result up in and store it in. Only runs with an integer or SeedSequence seed, and no sinks (Verbosity 'none') or report, are cached. None doesn't use a cache.
+        Backend: how the batch engine moves the games each turn (both give the same games for the same seed). 'numpy': with NumPy array operations; 'numba': with a loop compiled by Numba (if it is installed), which makes no temporary arrays; 'auto': 'numba' if it is installed, otherwise 'numpy'.
+
+            Outputs:
+        gamesList: the GameBatch (list-like) of arrays containing the square number of each player for each turn of a game (starting from the zeroth turn), if collect is 'games'.
+        stats: the dictionary of game statistics, if collect is 'stats', containing:
+            'numGames': the number of games played.
+            'squareFreq': the array of the number of times any player was on each square in any turn, starting from the zeroth turn (index 0 is square 1).
+            'gameLengthCounts': the array of the number of games lasting each number of turns (index 0 is zero turns), with timed out games lasting maxTurns.
+            'winnerCounts': the array of the number of games each player won (index 0 is player 1).
+            'timeoutCount': the number of games that reached maxTurns without a winner.
+        runReport: the dictionary of the run report, if report isn't None (returned as a tuple with gamesList/stats), containing:
+            'engine': the engine that played the games.
+            'wallTime': the time (in seconds) that the run took.
+            'phaseTimes': the dictionary of the time (in seconds) spent on each phase, added up over the processes if there are several. 'lookup': finding the squares reached in the tables; 'rng': rolling the die; 'bookkeeping': tracking the unfinished games and statistics; 'output': storing the games and sending events.
+            'numGames', 'numMoves': the number of games and player moves played.
+            'gamesPerSec', 'movesPerSec': the number of games and player moves played per second.
+            'snakeHits', 'ladderHits': the number of times a player went down a snake/up a ladder.
+            'overflows': the number of rolls past the last square.
+            'timeouts': the number of games that reached maxTurns without a winner.
+            'peakMemoryMB': the peak memory (in MB) traced during the run, or None if report isn't 'memory'.
+        '''
+
+        ## Makes sure that Verbosity type is valid and stores it as a new variable
+        default = 'full' ## default verbosity type for invalid inputs
+        try:
+            match Verbosity.lower():
+                case 'full'|'f':
+                    newVerbosity = 'full'
+                case 'reduced'|'r':
+                    newVerbosity = 'reduced'
+                case 'none'|'n':
+                    newVerbosity = 'none'
+                case _: #### Invalid type
+                    print(f"WARNING: Verbosity is not valid. Setting to {default}.")
+                    newVerbosity = default
+        except Exception as e: ## Catch any exceptions, especially AttributeError from not having lower() method
+            if Verbosity == None:
+                newVerbosity = 'none'
+            else:
+                print(f"WARNING: {str(e)}, so Verbosity is not valid. Setting to {default}.") #### e is the error message
+                newVerbosity = default
+
+        ## Event sinks, including the one that prints the game messages for the Verbosity
+        if sinks == None:
+            sinkList = []
+        elif callable(sinks):
+            sinkList = [sinks]
+        else:
+            sinkList = list(sinks)
+
+        if newVerbosity != 'none':
+            sinkList.append(PrintSink(Verbosity=newVerbosity))
+
+        ## Makes sure that Engine type is valid and stores it as a new variable
+        try:
+            match Engine.lower():
+                case 'batch'|'b':
+                    newEngine = 'batch'
+                case 'loop'|'l':
+                    newEngine = 'loop'
+                case 'auto'|'a':
+                    newEngine = 'batch' if len(sinkList) == 0 else 'loop'
+                case _: #### Invalid type
+                    print("WARNING: Engine is not valid. Setting to auto.")
+                    newEngine = 'batch' if len(sinkList) == 0 else 'loop'
+        except Exception as e: ## Catch any exceptions, especially AttributeError from not having lower() method
+            print(f"WARNING: {str(e)}, so Engine is not valid. Setting to auto.") #### e is the error message
+            newEngine = 'batch' if len(sinkList) == 0 else 'loop'
+
+        ## Makes sure that collect type is valid and stores it as a new variable
+        try:
+            match collect.lower():
+                case 'games'|'g':
+                    newCollect = 'games'
+                case 'stats'|'s':
+                    newCollect = 'stats'
+                case _: #### Invalid type
+                    print("WARNING: collect is not valid. Setting to games.")
+                    newCollect = 'games'
+        except Exception as e: ## Catch any exceptions, especially AttributeError from not having lower() method
+            print(f"WARNING: {str(e)}, so collect is not valid. Setting to games.") #### e is the error message
+            newCollect = 'games'
+
+        ## Makes sure that report type is valid and stores it as a new variable
+        try:
+            match report.lower():
+                case 'timing'|'t':
+                    newReport = 'timing'
+                case 'memory'|'m':
+                    newReport = 'memory'
+                case 'none'|'n':
+                    newReport = 'none'
+                case _: #### Invalid type
+                    print("WARNING: report is not valid. Setting to timing.")
+                    newReport = 'timing'
+        except Exception as e: ## Catch any exceptions, especially AttributeError from not having lower() method
+            if (report == None) or (report == False):
+                newReport = 'none'
+            elif report == True:
+                newReport = 'timing'
+            else:
+                print(f"WARNING: {str(e)}, so report is not valid. Setting to timing.") #### e is the error message
+                newReport = 'timing'
+
+        if (self.Storage == 'sparse') and (newReport != 'none'):
+            print("WARNING: The run report counts the moves with a table of every square, which a sparse board has to build, so it can use a lot of memory.")
+
+        ## Makes sure that Backend type is valid and stores it as a new variable
+        default = 'numba' if numba != None else 'numpy' ## default backend for 'auto' and invalid inputs
+        try:
+            match Backend.lower():
+                case 'numpy'|'np':
+                    newBackend = 'numpy'
+                case 'numba'|'nb':
+                    if numba == None:
+                        print("WARNING: Numba isn't installed, so Backend is set to numpy.")
+                    newBackend = default
+                case 'auto'|'a':
+                    newBackend = default
+                case _: #### Invalid type
+                    print(f"WARNING: Backend is not valid. Setting to {default}.")
+                    newBackend = default
+        except Exception as e: ## Catch any exceptions, especially AttributeError from not having lower() method
+            print(f"WARNING: {str(e)}, so Backend is not valid. Setting to {default}.") #### e is the error message
+            newBackend = default
+
+        ## Die for the rolls: a new one from rng or seed if given, otherwise the game's own
+        die = self._get_die(seed=seed, rng=rng)
+
+        ## Looks the result up in the cache, which only works for runs that can be repeated and have nothing else to show
+        cacheKey = None
+        if cache != None:
+            if isinstance(cache, (str, os.PathLike)):
+                cache = ResultCache(cache)
+
+            if (len(sinkList) > 0) or (newReport != 'none'):
+                print("WARNING: Runs with game messages, sinks or a report aren't cached.")
+            else:
+                if numWorkers == None:
+                    numWorkers = os.cpu_count()
+
+                cacheKey = self._cache_key('play_game', numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns, sepSLturns=bool(sepSLturns), seed=seed if rng == None else None,
+                                           engine=newEngine, numWorkers=numWorkers if newEngine == 'batch' else 1, collect=newCollect)
+                if cacheKey == None:
+                    print("WARNING: Only runs with an integer or SeedSequence seed (and no rng) can be cached.")
+                else:
+                    result = cache.get(cacheKey)
+                    if result != None:
+                        return result
+
+        ## Recorder for the run report, with the memory traced by tracemalloc if asked for
+        recorder = None
+        if newReport != 'none':
+            stopTracing = False
+            if newReport == 'memory':
+                if tracemalloc.is_tracing():
+                    tracemalloc.reset_peak()
+                else:
+                    tracemalloc.start()
+                    stopTracing = True
+
+            recorder = _RunRecorder()
+            startTime = recorder.lastTime
+
+        ## Plays all games at once if using the batch engine, otherwise one at a time
+        if newEngine == 'batch':
+            if len(sinkList) > 0:
+                print("WARNING: The batch engine doesn't send game events, so no game messages are shown.")
+
+            result = self._play_game_parallel(numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns, sepSLturns=sepSLturns, die=die, numWorkers=numWorkers, collect=newCollect, recorder=recorder, backend=newBackend)
+        else:
+            if numWorkers != 1:
+                print("WARNING: The loop engine can't be split between processes, so only one is used.")
+
+            result = self._play_game_loop(numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns, sepSLturns=sepSLturns, die=die, collect=newCollect, sinkList=sinkList, recorder=recorder)
+
+        if cacheKey != None:
+            cache.put(cacheKey, result)
+
+        if recorder == None:
+            return result
+
+        ## Makes the run report
+        wallTime = time.perf_counter() - startTime
+        peakMemory = None
+        if newReport == 'memory':
+            peakMemory = tracemalloc.get_traced_memory()[1]
+            if stopTracing == True:
+                tracemalloc.stop()
+
+        runReport = recorder.make_report(result, numPlayers=numPlayers, engine=newEngine, wallTime=wallTime, peakMemory=peakMemory)
+
+        return result, runReport
+
+
+
+    def _play_game_loop(self, numPlayers, numTimes, maxTurns, sepSLturns, die, collect='games', sinkList=[], recorder=None):
+        '''Plays the games of a play_game call one at a time, move by move, sending the events of each move to the sinks.
+
+            Inputs:
+        numPlayers, numTimes, maxTurns, sepSLturns, collect: see play_game.
+        die: the Die rolled for the games.
+        sinkList: the list of sinks that each GameEvent is sent to.
+        recorder: the _RunRecorder for the run report, or None if there isn't one.
+
+            Outputs:
+        gamesList: the GameBatch (list-like) of arrays containing the square number of each player for each turn of a game (starting from the zeroth turn), or the game statistics dictionary if collect is 'stats'.
+        '''
+
+        ## Predefines gamesList, or the game statistics
+        if collect == 'stats':
+            stats = _empty_game_stats(numSquares=self.numSquares, numPlayers=numPlayers, maxTurns=maxTurns)
+            stats['numGames'] = numTimes
+        else:
+            gamesList = GameBatch(numPlayers=numPlayers, dtype=self._sqrDtype)
+
+        ## Predefines the array reused by every game for its square numbers (rows are the players, columns are the turns)
+        gameSqrNums = np.ones((numPlayers, maxTurns + 1), dtype=self._sqrDtype)
+
+        ## Events are only made when there are sinks to send them to, and the moves are only timed and counted when there is a recorder
+        emit = len(sinkList) > 0
+        recording = recorder != None
+
+        ## Merged turns need the snakes/ladders taken one at a time only to send their events, otherwise the merged table already has them
+        mergeJumps = (sepSLturns == False) and (emit == True)
+
+        ## List copies of the tables, which are faster than NumPy arrays for looking up one square at a time (sparse tables are looked up directly, as a list would need every square)
+        jumpTable = self.JumpTable
+        chainTable = self.ChainTable
+        nextTable = self.MergedNextTable if (sepSLturns == False) and (emit == False) else self.NextTable
+        terminalMask = self.TerminalMask
+        if self.Storage == 'dense':
+            jumpTable, chainTable, nextTable, terminalMask = jumpTable.tolist(), chainTable.tolist(), nextTable.tolist(), terminalMask.tolist()
+        rollNums = self.Dice.Rolls.tolist() ### Rolled number of each roll index
+        ignoreOverflow = (self.Overflow == 'ignore')
+
+        ## Die roll, timed if there is a recorder (the time since the last tick before it is bookkeeping)
+        roll = die.roll
+
+        if recording == True:
+            eventTable = self._event_table(sepSLturns=sepSLturns).tolist()
+            moveCounts = [0, 0, 0] ### Snake hits, ladder hits and overflows
+
+            def roll():
+                '''Rolls the die, timing it for the run report.'''
+                recorder.tick('bookkeeping')
+                face = die.roll()
+                recorder.tick('rng')
+                return face
+
+        def send(**eventInfo):
+            '''Sends a GameEvent to every sink.'''
+            event = GameEvent(**eventInfo)
+            for sink in sinkList:
+                sink(event)
+
+        ## Loop per game
+        for i in range(0,numTimes):
+            game = i + 1
+            turn = 0
+            gameEnd = False
+            gameSqrNums[:, 0] = 1 ### Zeroth turn at square 1
+
+            if emit == True:
+                send(kind='game', game=game)
+
+
+            ### Loop within each game
+            while gameEnd == False:
+                turn = turn + 1
+                firstWinner = True #### Indicates whether the current player would be the first winner if they won
+                player = 1 #### Player number
+                winner = None #### The winning player's number
+
+                if emit == True:
+                    send(kind='turn', game=game, turn=turn)
+
+
+                #### Turn loop
+                for j in range(0,numPlayers):
+                    player = j + 1
+                    prevNum = int(gameSqrNums[j,turn-1]) ##### The previous turn's square number for the player, converted from a NumPy integer to int
+                    face = roll() ##### Roll index (in Dice.Rolls)
+                    currNum = nextTable[prevNum][face] ##### The current turn's square number for the player, with snakes/ladders and overflows already dealt with by the table
+
+                    ##### Events for the move (the previous square's snake/ladder is included on the off-chance that the first square has a ladder for merged turns)
+                    if emit == True:
+                        prevJumpNum = jumpTable[prevNum] ###### The square at the end of the previous square's snake/ladder (itself if it has neither)
+
+                        if prevJumpNum != prevNum:
+                            send(kind='snake' if prevJumpNum < prevNum else 'ladder', game=game, turn=turn, player=player, fromSquare=prevNum, toSquare=prevJumpNum)
+                        else:
+                            send(kind='roll', game=game, turn=turn, player=player, fromSquare=prevNum, toSquare=currNum, roll=rollNums[face])
+
+                            if ignoreOverflow and (prevNum + rollNums[face] > self.numSquares):
+                                send(kind='overflow', game=game, turn=turn, player=player, fromSquare=prevNum, toSquare=currNum, roll=rollNums[face])
+
+
+                    ##### For merged Snake and Ladder turn, takes the current square's snake/ladder and any chained after it one at a time
+                    if mergeJumps == True:
+                        chainNum = chainTable[currNum] ###### The square at the end of the chain (itself if it has no snake/ladder)
+
+                        while currNum != chainNum:
+                            jumpNum = jumpTable[currNum]
+                            send(kind='snake' if jumpNum < currNum else 'ladder', game=game, turn=turn, player=player, fromSquare=currNum, toSquare=jumpNum)
+                            currNum = jumpNum
+
+
+                    ##### Player reaches the last square
+                    if terminalMask[currNum] == True:
+                        gameEnd = True
+
+                        ###### Makes sure that this is the first valid winner
+                        if firstWinner == True:
+                            winner = player
+                            firstWinner = False
+
+                    if recording == True:
+                        recorder.tick('lookup')
+                        counts = eventTable[prevNum][face]
+                        moveCounts[0] += counts[0]
+                        moveCounts[1] += counts[1]
+                        moveCounts[2] += counts[2]
+
+                    if emit == True:
+                        send(kind='move', game=game, turn=turn, player=player, fromSquare=prevNum, toSquare=currNum)
+
+                        if recording == True:
+                            recorder.tick('output')
+
+                    ##### Adds player's current square number to the array
+                    gameSqrNums[j, turn] = currNum
+
+
+                #### Deals with end game
+                if (gameEnd == True)|(turn == maxTurns):
+                    if emit == True:
+                        send(kind='win' if gameEnd == True else 'timeout', game=game, turn=turn, player=winner, squares=tuple(gameSqrNums[:, turn].tolist()))
+
+                    gameEnd = True ##### Flags game as ending if max turn is reached
+
+            if recording == True:
+                recorder.tick('bookkeeping')
+
+
+            ## Adds array of square numbers for the game to the list for all games, or adds it to the game statistics
+            if collect == 'stats':
+                stats['squareFreq'] += np.bincount(np.ravel(gameSqrNums[:, :turn+1]), minlength=self.numSquares + 1)[1:]
+                stats['gameLengthCounts'][turn] += 1
+
+                if winner == None:
+                    stats['timeoutCount'] += 1
+                else:
+                    stats['winnerCounts'][winner - 1] += 1
+            else:
+                gamesList.append(gameSqrNums[:, :turn+1])
+
+            if recording == True:
+                if winner == None:
+                    recorder.counts['timeouts'] += 1
+                recorder.tick('output')
+
+        if recording == True:
+            recorder.counts['snakeHits'] += moveCounts[0]
+            recorder.counts['ladderHits'] += moveCounts[1]
+            recorder.counts['overflows'] += moveCounts[2]
+
+        if collect == 'stats':
+            return stats
+
+        gamesList.trim()
+
+        return gamesList
+
+
+
+    def iter_games(self, numPlayers, numTimes, maxTurns=100, Verbosity='none', sepSLturns=True, Engine='auto', seed=None, rng=None, numWorkers=1, chunkSize=None, sinks=None):
+        '''Plays Snakes and Ladder game a specified number of times like play_game, but yields the games a chunk at a time instead of returning all of them, so memory use doesn't grow with numTimes.
+
+            Inputs:
+        numPlayers, numTimes, maxTurns, Verbosity, sepSLturns, Engine, seed, rng, numWorkers, sinks: see play_game (Verbosity is 'none' by default).
+        chunkSize: the number of games played at once and yielded together as a GameBatch. None plays 10,000 games at once but yields each game array on its own.
+
+            Outputs (yielded):
+        gamesList: the GameBatch of each chunk of games, or game: each game's array of square numbers (rows are the players, columns are the turns) if chunkSize is None.
+        '''
+
+        ## Every chunk rolls the same die, so the same seed gives the same games
+        die = self._get_die(seed=seed, rng=rng)
+
+        if chunkSize == None:
+            size = 10000
+        else:
+            size = max(int(chunkSize), 1)
+
+        ## Loop per chunk
+        gamesLeft = numTimes
+        while gamesLeft > 0:
+            chunkTimes = min(size, gamesLeft)
+            gamesList = self.play_game(numPlayers=numPlayers, numTimes=chunkTimes, maxTurns=maxTurns, Verbosity=Verbosity, sepSLturns=sepSLturns, Engine=Engine, rng=die, numWorkers=numWorkers, sinks=sinks)
+            gamesLeft = gamesLeft - chunkTimes
+
+            if chunkSize == None:
+                yield from gamesList
+            else:
+                yield gamesList
+
+
+
+    def archive_games(self, path, numPlayers, numTimes, maxTurns=100, sepSLturns=True, Engine='auto', seed=None, rng=None, numWorkers=1, chunkSize=100000, encoding='none'):
+        '''Plays Snakes and Ladder game a specified number of times like iter_games, writing each chunk of games to an archive on disk as it is played, so the games don't have to fit in memory.
+
+            Inputs:
+        path: the directory to write the archive to.
+        numPlayers, numTimes, maxTurns, sepSLturns, Engine, seed, rng, numWorkers: see play_game.
+        chunkSize: the number of games played at once and written as one segment of the archive.
+        encoding: how the square numbers are stored. 'none': as they are; 'delta': as the change in square from the previous turn, which is smaller on boards without long snakes/ladders.
+
+            Outputs:
+        archive: the GameArchive for reading the games back, which can be used like the list of game arrays returned by play_game.
+        '''
+
+        if chunkSize == None:
+            chunkSize = 100000
+
+        with GameArchiveWriter(path, numPlayers=numPlayers, dtype=self._sqrDtype, encoding=encoding) as writer:
+            for gamesList in self.iter_games(numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns, Verbosity='none', sepSLturns=sepSLturns, Engine=Engine, seed=seed, rng=rng, numWorkers=numWorkers, chunkSize=chunkSize):
+                writer.add(gamesList)
+
+        archive = GameArchive(path)
+
+        return archive
+
+
+
+    def play_until(self, numPlayers, maxTurns=100, sepSLturns=True, meanHalfWidth=None, squareFreqHalfWidth=None, winProbHalfWidth=None, confidence=0.95,
+                   batchSize=1000, maxGames=10000000, seed=None, rng=None, numWorkers=1):
+        '''Plays Snakes and Ladder game in batches (with collect 'stats') until the game statistics are known to a given precision, instead of playing a fixed number of games.
+
+            Inputs:
+        numPlayers, maxTurns, sepSLturns, seed, rng, numWorkers: see play_game.
+        meanHalfWidth: the largest allowed confidence interval half-width of the mean number of turns of the game (None for no target).
+        squareFreqHalfWidth: the largest allowed confidence interval half-width of every square's relative frequency, per game and per player (None for no target).
+        winProbHalfWidth: the largest allowed confidence interval half-width of every player's probability of winning (None for no target).
+        confidence: the confidence level of the confidence intervals.
+        batchSize: the number of games played in the first batch (and the fewest in any batch). Later batches are sized from how many more games the targets look like they need, up to doubling the games played so far.
+        maxGames: the maximum number of games to play, even if the targets aren't reached.
+
+            Outputs:
+        stats: the dictionary of game statistics of all the games played (see play_game).
+        precision: the dictionary containing:
+            'numGames': the number of games played.
+            'converged': whether every target was reached.
+            'confidence': the confidence level of the confidence intervals.
+            'meanLength', 'squareFreq', 'winProbs': the estimated mean number of turns (with timed out games lasting maxTurns), array of each square's relative frequency (index 0 is square 1) and array of each player's probability of winning (index 0 is player 1).
+            'meanHalfWidth', 'squareFreqHalfWidth', 'winProbHalfWidth': the confidence interval half-width of each estimate (an array for squareFreq and winProbs, with the Wilson score interval for winProbs).
+            'targets': the dictionary of the target half-widths.
+        '''
+
+        targets = {'meanHalfWidth': meanHalfWidth, 'squareFreqHalfWidth': squareFreqHalfWidth, 'winProbHalfWidth': winProbHalfWidth}
+        if all(target == None for target in targets.values()):
+            print("WARNING: No precision targets were given, so only one batch is played.")
+
+        ## Every batch rolls the same die, so the same seed gives the same games
+        die = self._get_die(seed=seed, rng=rng)
+
+        batchSize = max(int(batchSize), 1)
+        zScore = statistics.NormalDist().inv_cdf((1 + confidence) / 2) ### Half-width in standard errors
+        turns = np.arange(0, maxTurns + 1)
+
+        ## Square frequencies of a game aren't independent of each other, so their error comes from the spread of the batch means (needs a few batches)
+        minBatches = 10 if squareFreqHalfWidth != None else 1
+        batchSquareFreqs, batchGames = [], []
+
+        ## Loop per batch
+        stats = None
+        nextSize = batchSize
+        while True:
+            batchStats = self.play_game(numPlayers=numPlayers, numTimes=min(nextSize, maxGames - (0 if stats == None else stats['numGames'])), maxTurns=maxTurns, Verbosity='none',
+                                        sepSLturns=sepSLturns, Engine='batch', rng=die, numWorkers=numWorkers, collect='stats')
+            stats = batchStats if stats == None else merge_game_stats([stats, batchStats])
+            numGames = stats['numGames']
+
+            if squareFreqHalfWidth != None:
+                batchSquareFreqs.append(batchStats['squareFreq'] / (batchStats['numGames'] * numPlayers))
+                batchGames.append(batchStats['numGames'])
+
+            ### Mean game length, with its variance from the game length counts
+            lengthProbs = stats['gameLengthCounts'] / numGames
+            meanLength = float(np.sum(turns * lengthProbs))
+            lengthVar = max(float(np.sum(turns**2 * lengthProbs)) - meanLength**2, 0)
+            meanError = zScore * np.sqrt(lengthVar / numGames)
+
+            ### Win probabilities, each a proportion of the games, with the half-width of the Wilson score interval (which isn't zero when a player won none or all of the games)
+            winProbs = stats['winnerCounts'] / numGames
+            winErrors = zScore / (1 + zScore**2 / numGames) * np.sqrt(winProbs * (1 - winProbs) / numGames + zScore**2 / (4 * numGames**2))
+
+            ### Square frequencies, with the variance of a game's frequencies estimated from the batch means (weighted by each batch's number of games)
+            squareFreq = stats['squareFreq'] / (numGames * numPlayers)
+            numBatches = len(batchSquareFreqs)
+            if numBatches >= 2:
+                gameVar = np.sum(np.array(batchGames)[:, None] * (np.array(batchSquareFreqs) - squareFreq)**2, axis=0) / (numBatches - 1)
+                squareFreqErrors = zScore * np.sqrt(gameVar / numGames)
+            else:
+                squareFreqErrors = np.full(self.numSquares, np.inf)
+
+            converged = ((meanHalfWidth == None) or (meanError <= meanHalfWidth)) and \
+                        ((winProbHalfWidth == None) or (np.max(winErrors) <= winProbHalfWidth)) and \
+                        ((squareFreqHalfWidth == None) or ((numBatches >= minBatches) and (np.max(squareFreqErrors) <= squareFreqHalfWidth)))
+
+            if (converged == True) or (numGames >= maxGames):
+                break
+
+            ### Games needed for each target, as the half-width shrinks with the square root of the number of games
+            ratios = [1.0]
+            if meanHalfWidth != None:
+                ratios.append(meanError / meanHalfWidth)
+            if winProbHalfWidth != None:
+                ratios.append(np.max(winErrors) / winProbHalfWidth)
+            if (squareFreqHalfWidth != None) and (numBatches >= minBatches):
+                ratios.append(np.max(squareFreqErrors) / squareFreqHalfWidth)
+
+            neededGames = int(np.ceil(numGames * max(ratios)**2))
+            nextSize = int(min(max(neededGames - numGames, batchSize), numGames))
+
+        if converged == False:
+            print(f"WARNING: The precision targets weren't reached within {maxGames} games.")
+
+        precision = {
+            'numGames': numGames,
+            'converged': converged,
+            'confidence': confidence,
+            'meanLength': meanLength,
+            'squareFreq': squareFreq,
+            'winProbs': winProbs,
+            'meanHalfWidth': meanError,
+            'squareFreqHalfWidth': squareFreqErrors,
+            'winProbHalfWidth': winErrors,
+            'targets': targets,
+        }
+
+        return stats, precision
+
+
+
+    def _event_table(self, sepSLturns):
+        '''Gets the number of snake hits, ladder hits and overflows of a move from each square for each roll.
+
+            Inputs:
+        sepSLturns: see play_game.
+
+            Outputs:
+        eventTable: the array of the counts (last axis: snake hits, ladder hits, overflows) for each roll in Dice.Rolls (columns) from each square (rows).
+        '''
+
+        sqrNums = np.arange(0, self.numSquares + 1)
+        jumps = np.asarray(self.JumpTable, dtype=np.int64) ### Dense copies of sparse tables
+        chainTable = np.asarray(self.ChainTable)
+        nextTable = np.asarray(self.NextTable)
+        onJump = jumps != sqrNums ### The move is the snake/ladder on the square instead of a roll
+
+        eventTable = np.zeros((self.numSquares + 1, len(self.Dice.Rolls), 3), dtype=np.int64)
+        eventTable[:, :, 0] = (jumps < sqrNums)[:, None]
+        eventTable[:, :, 1] = (jumps > sqrNums)[:, None]
+        eventTable[:, :, 2] = ~onJump[:, None] & (sqrNums[:, None] + self.Dice.Rolls > self.numSquares) & (sqrNums[:, None] < self.numSquares)
+
+        ## Snakes/ladders on the rolled square (and chained after it) are also hit in merged turns
+        if sepSLturns == False:
+            snakeHops = np.zeros(self.numSquares + 1, dtype=np.int64)
+            ladderHops = np.zeros(self.numSquares + 1, dtype=np.int64)
+            currSqrs = sqrNums
+            moving = currSqrs != chainTable
+            while np.any(moving):
+                nextSqrs = jumps[currSqrs]
+                snakeHops += moving & (nextSqrs < currSqrs)
+                ladderHops += moving & (nextSqrs > currSqrs)
+                currSqrs = np.where(moving, nextSqrs, currSqrs)
+                moving = currSqrs != chainTable
+
+            eventTable[:, :, 0] += snakeHops[nextTable]
+            eventTable[:, :, 1] += ladderHops[nextTable]
+
+        return eventTable
+
+
+
+    def _play_game_parallel(self, numPlayers, numTimes, maxTurns, sepSLturns, die=None, numWorkers=1, collect='games', recorder=None, backend='numpy'):
+        '''Splits the games of a play_game call between processes that each play their share with the batch engine, then joins them back in order.
+
+            Inputs:
+        numPlayers, numTimes, maxTurns, sepSLturns, numWorkers, collect: see play_game.
+        backend: the batch engine backend, 'numpy' or 'numba' (see play_game's Backend).
+        die: the Die rolled for the games (by this process), whose next roll seeds the processes' own dice if there are several.
+        recorder: the _RunRecorder for the run report (with the times and counts of every process added to it), or None if there isn't one.
+
+            Outputs:
+        gamesList: the GameBatch (list-like) of arrays containing the square number of each player for each turn of a game (starting from the zeroth turn), or the game statistics dictionary if collect is 'stats'.
+        '''
+
+        if numWorkers == None:
+            numWorkers = os.cpu_count()
+        numWorkers = max(min(numWorkers, numTimes), 1) ## No more processes than games
+
+        if numWorkers == 1:
+            return self._play_game_batch(numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns, sepSLturns=sepSLturns, die=die, collect=collect, recorder=recorder, backend=backend)
+
+        ## Independent die roll streams for each process, and the number of games each plays
+        if die == None:
+            die = self.Die
+        workerSeeds = np.random.SeedSequence(int(die.rng.integers(0, 2**63))).spawn(numWorkers)
+        workerTimes = [np.size(games) for games in np.array_split(np.arange(0, numTimes), numWorkers)]
+
+        with cf.ProcessPoolExecutor(max_workers=numWorkers) as executor:
+            futures = [executor.submit(_play_game_worker, self, numPlayers, workerTimes[w], maxTurns, sepSLturns, workerSeeds[w], collect, recorder != None, backend) for w in range(0, numWorkers)]
+            results = [future.result() for future in futures] ### In the order of the processes (not the order they finish in)
+
+        ## Adds up the run report times and counts of each process
+        if recorder != None:
+            for workerResult, workerRecorder in results:
+                recorder.add(workerRecorder)
+            results = [workerResult for workerResult, workerRecorder in results]
+
+        ## Adds up the statistics of each process
+        if collect == 'stats':
+            return merge_game_stats(results)
+
+        ## Joins the games in the order of the processes
+        gamesList = GameBatch(numPlayers=numPlayers, dtype=self._sqrDtype)
+        for workerResult in results:
+            gamesList.extend(workerResult)
+
+        gamesList.trim()
+
+        return gamesList
+
+
+
+    def _play_game_batch(self, numPlayers, numTimes, maxTurns, sepSLturns, die=None, collect='games', recorder=None, backend='numpy'):
+        '''Plays every game of a play_game call at once, moving all unfinished games forward together each turn.
+
+            Inputs:
+        numPlayers: the number of players for the game.
+        numTimes: the number of times to play the game.
+        maxTurns: the maximum number of turns before the game ends automatically.
+        sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together (along with any snakes/ladders chained after it).
+        die: the Die rolled for the games (the game's Die if None).
+        collect: what to return. 'games': the square numbers of every game; 'stats': only the statistics of the games (see play_game).
+        recorder: the _RunRecorder for the run report, or None if there isn't one.
+        backend: how the games are moved each turn, 'numpy' or 'numba' (see play_game's Backend).
+
+            Outputs:
+        gamesList: the GameBatch (list-like) of arrays containing the square number of each player for each turn of a game (starting from the zeroth turn), or the game statistics dictionary if collect is 'stats'.
+        '''
+
+        if die == None:
+            die = self.Die
+
+        ## Plays large numbers of games for statistics in chunks, so memory use doesn't grow with numTimes
+        chunkTimes = 100000
+        if (collect == 'stats') and (numTimes > chunkTimes):
+            return merge_game_stats([self._play_game_batch(numPlayers=numPlayers, numTimes=min(chunkTimes, numTimes - start), maxTurns=maxTurns, sepSLturns=sepSLturns, die=die, collect=collect, recorder=recorder, backend=backend) for start in range(0, numTimes, chunkTimes)])
+
+        ## Table of the square reached from each square for each roll
+        if sepSLturns == True:
+            nextTable = self.NextTable
+        else:
+            nextTable = self.MergedNextTable
+
+        ## Each different combination of snake hits, ladder hits and overflows of a move gets a code, so the moves can be counted by code each turn
+        if recorder != None:
+            eventCombos, eventCodes = np.unique(np.reshape(self._event_table(sepSLturns=sepSLturns), (-1, 3)), axis=0, return_inverse=True)
+            eventCodes = np.reshape(eventCodes, np.shape(nextTable))
+            codeCounts = np.zeros(len(eventCombos), dtype=np.int64)
+
+        ## Predefines the unfinished games and their square numbers (rows are the games, columns are the players)
+        activeGames = np.arange(0, numTimes, dtype=np.int32)
+        activeSqrNums = np.ones((numTimes, numPlayers), dtype=self._sqrDtype)
+
+        ## Function that moves the unfinished games each turn (sparse tables are looked up with NumPy, as the compiled loops need arrays)
+        move_turn = _MOVE_TURN[backend] if self.Storage == 'dense' else _move_turn_numpy
+
+        if collect == 'stats':
+            ### Statistics, with square counts indexed by square number until the end
+            stats = _empty_game_stats(numSquares=self.numSquares + 1, numPlayers=numPlayers, maxTurns=maxTurns)
+            stats['numGames'] = numTimes
+            stats['squareFreq'][1] = numTimes*numPlayers ### Zeroth turn at square 1
+            squareFreq, winnerCounts = stats['squareFreq'], stats['winnerCounts']
+        else:
+            ### Square numbers of the unfinished games for each turn, stored with the games they belong to
+            gameLengths = np.zeros(numTimes, dtype=np.int64)
+            turnGames = [activeGames]
+            turnSqrNums = [activeSqrNums]
+            squareFreq, winnerCounts = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64) ### Not counted
+
+        ## Loop per turn (of every unfinished game)
+        turn = 0
+        while (turn < maxTurns) and (np.size(activeGames) > 0):
+            turn = turn + 1
+
+            ### Moves every player of every unfinished game
+            if recorder != None:
+                recorder.tick('bookkeeping')
+
+            faces = die.roll(np.shape(activeSqrNums))
+
+            if recorder != None:
+                recorder.tick('rng')
+                moveCodes = eventCodes[activeSqrNums, faces] #### Code of the snake hits, ladder hits and overflows of each move
+
+            ### Moves the games, counts the squares and winners, and removes the finished games
+            turnActiveGames = activeGames
+            movedSqrNums, activeGames, activeSqrNums, endedGames = move_turn(nextTable, self.TerminalMask, activeGames, activeSqrNums, faces, collect == 'stats', squareFreq, winnerCounts)
+
+            if recorder != None:
+                recorder.tick('lookup')
+                codeCounts += np.bincount(np.ravel(moveCodes), minlength=len(eventCombos))
+
+            if collect == 'stats':
+                stats['gameLengthCounts'][turn] += np.size(endedGames)
+            else:
+                turnGames.append(turnActiveGames)
+                turnSqrNums.append(movedSqrNums)
+                gameLengths[endedGames] = turn
+
+        ## Timed out games, and the counts of the run report
+        if recorder != None:
+            moveCounts = codeCounts @ eventCombos
+            recorder.counts['snakeHits'] += int(moveCounts[0])
+            recorder.counts['ladderHits'] += int(moveCounts[1])
+            recorder.counts['overflows'] += int(moveCounts[2])
+            recorder.counts['timeouts'] += np.size(activeGames)
+            recorder.tick('bookkeeping')
+
+        if collect == 'stats':
+            stats['timeoutCount'] = np.size(activeGames)
+            stats['gameLengthCounts'][turn] += np.size(activeGames)
+            stats['squareFreq'] = stats['squareFreq'][1:] ### Index 0 is square 1
+
+            return stats
+
+        gameLengths[activeGames] = turn
+
+        ## Places each turn's square numbers into the games list, with each game's turns next to each other
+        gamesList = GameBatch(numPlayers=numPlayers, dtype=self._sqrDtype, capacity=int(np.sum(gameLengths + 1)))
+        gameStarts = gamesList._add_games(gameLengths)
+
+        for t in range(0, len(turnGames)):
+            gamesList.sqrNums[:, gameStarts[turnGames[t]] + t] = turnSqrNums[t].T
+
+        if recorder != None:
+            recorder.tick('output')
+
+        return gamesList
+
+
+
+    def _play_game_rolls(self, faces, sepSLturns):
+        '''Plays games from a given array of die rolls for every turn and player, like the batch engine, so that different games can be compared on the same rolls (see compare_variants).
+
+            Inputs:
+        faces: the 3D array of the roll index (in Dice.Rolls) of each game (first axis), roll of the player (second axis, index 0 is their first roll) and player (third axis). The number of rolls is maxTurns. Each player only moves on to their next roll when they use the die, so separate snake/ladder turns don't put the variants' rolls out of step.
+        sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together (along with any snakes/ladders chained after it).
+
+            Outputs:
+        gameLengths: the array of the number of turns of each game, with timed out games lasting maxTurns.
+        winners: the array of the winning player of each game (0 is player 1), or -1 for timed out games.
+        squareCounts: the 2D array of the number of times any player was on each square (columns, index 0 is square 1) in any turn of each game (rows), starting from the zeroth turn.
+        '''
+
+        numTimes, maxTurns, numPlayers = np.shape(faces)
+
+        if sepSLturns == True:
+            nextTable = self.NextTable
+        else:
+            nextTable = self.MergedNextTable
+
+        activeGames = np.arange(0, numTimes, dtype=np.int64)
+        activeSqrNums = np.ones((numTimes, numPlayers), dtype=self._sqrDtype)
+        activeRollNums = np.zeros((numTimes, numPlayers), dtype=np.int64)
+        players = np.arange(0, numPlayers)
+        gameLengths = np.full(numTimes, maxTurns, dtype=np.int64)
+        winners = np.full(numTimes, -1, dtype=np.int64)
+
+        ## Each visit is stored as the game number and square number in one index, counted at the end
+        visits = [np.repeat(activeGames * self.numSquares, numPlayers)] ### Zeroth turn at square 1
+
+        ## Loop per turn (of every unfinished game), each player using their own next roll
+        for turn in range(1, maxTurns + 1):
+            if np.size(activeGames) == 0:
+                break
+
+            ### The die isn't used on a snake/ladder square when it is a separate turn
+            if sepSLturns == True:
+                usesDie = self.JumpTable[activeSqrNums] == activeSqrNums
+            else:
+                usesDie = True
+
+            activeSqrNums = nextTable[activeSqrNums, faces[activeGames[:, None], activeRollNums, players]]
+            activeRollNums = activeRollNums + usesDie
+            visits.append(np.ravel(activeGames[:, None] * self.numSquares + activeSqrNums - 1))
+
+            ### Finds games where a player reached the last square (the first player in turn order to finish wins)
+            finished = self.TerminalMask[activeSqrNums]
+            gameEnd = np.any(finished, axis=1)
+            gameLengths[activeGames[gameEnd]] = turn
+            winners[activeGames[gameEnd]] = np.argmax(finished[gameEnd], axis=1)
+
+            activeGames = activeGames[~gameEnd]
+            activeSqrNums = activeSqrNums[~gameEnd]
+            activeRollNums = activeRollNums[~gameEnd]
+
+        squareCounts = np.reshape(np.bincount(np.concat(visits), minlength=numTimes * self.numSquares), (numTimes, self.numSquares))
+
+        return gameLengths, winners, squareCounts
+
+
+
+    def transition_matrix(self, sepSLturns=True):
+        '''Gets the probability of moving from each square to each other square in one turn (the board as a Markov chain, where the last square is absorbing).
+
+            Inputs:
+        sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together (along with any snakes/ladders chained after it).
+
+            Outputs:
+        transMatrix: the 2D ndarray where the value in row i, column j is the probability of moving from square i+1 to square j+1 in one turn.
+        '''
+
+        if sepSLturns == True:
+            nextTable = np.asarray(self.NextTable)[1:]
+        else:
+            nextTable = np.asarray(self.MergedNextTable)[1:]
+
+        ## Each roll has its chance in Dice.Probs, added up for rolls reaching the same square
+        numRolls = len(self.Dice.Rolls)
+        transMatrix = np.zeros((self.numSquares, self.numSquares))
+        np.add.at(transMatrix, (np.repeat(np.arange(0, self.numSquares), numRolls), np.ravel(nextTable) - 1), np.tile(self.Dice.Probs, self.numSquares))
+
+        return transMatrix
+
+
+
+    def analyse_game(self, maxTurns=100, sepSLturns=True, cache=None):
+        '''Calculates the exact game length distribution and expected square visits for a single player game, treating the board as an absorbing Markov chain.
+
+            Inputs:
+        maxTurns: the maximum number of turns before the game ends automatically (only used for lengthPMF, timeoutProb and maxTurnsVisits).
+        sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together (along with any snakes/ladders chained after it).
+        cache: the ResultCache (or its directory) to look the analysis up in and store it in. None doesn't use a cache.
+
+            Outputs:
+        analysis: the dictionary containing:
+            'expectedLength': the expected number of turns to reach the last square (from the fundamental matrix, without maxTurns), inf if it might never be reached. Solved as a sparse matrix if SciPy is installed, otherwise NaN for boards with more than 5000 reachable squares.
+            'lengthPMF': the array of the probability of the game ending on each turn (index 0 is the zeroth turn) up to maxTurns.
+            'timeoutProb': the probability of the game not ending within maxTurns.
+            'expectedVisits': the array of the expected number of turns spent on each square (index 0 is square 1), starting from the zeroth turn on square 1 and counting the last square once (without maxTurns).
+            'maxTurnsVisits': the same as expectedVisits, but only counting turns up to maxTurns (comparable to simulated square frequencies per game).
+        '''
+
+        ## Looks the analysis up in the cache
+        if cache != None:
+            if isinstance(cache, (str, os.PathLike)):
+                cache = ResultCache(cache)
+
+            cacheKey = self._cache_key('analyse_game', maxTurns=maxTurns, sepSLturns=bool(sepSLturns))
+            analysis = cache.get(cacheKey)
+            if analysis != None:
+                return analysis
+
+            analysis = self.analyse_game(maxTurns=maxTurns, sepSLturns=sepSLturns)
+            cache.put(cacheKey, analysis)
+
+            return analysis
+
+        ## Looks the squares up in the tables themselves, so sparse tables only work out the squares reached (no dense matrix of every pair of squares is made)
+        if sepSLturns == True:
+            nextTable = self.NextTable
+        else:
+            nextTable = self.MergedNextTable
+
+        numSquares, numRolls = self.numSquares, len(self.Dice.Rolls)
+        nextSqrIdxs = np.ravel(nextTable[1:]).astype(np.int64) - 1 ### Square reached (index 0 is square 1) for each roll from each square, in rows of numRolls
+        fromSqrIdxs = np.repeat(np.arange(0, numSquares), numRolls)
+        terminal = np.asarray(self.TerminalMask[1:])
+
+        ## Finds the squares that can be reached from square 1, and the squares that the last square can be reached from, searching the board breadth first (index 0 is square 1)
+        if sps != None:
+            chainMatrix = sps.csr_matrix((np.tile(self.Dice.Probs, numSquares), (fromSqrIdxs, nextSqrIdxs)), shape=(numSquares, numSquares)) ### Chances of each roll added up for rolls reaching the same square
+            reachable = np.zeros(numSquares, dtype=bool)
+            reachable[csgraph.breadth_first_order(chainMatrix, 0, return_predecessors=False)] = True
+
+            backwardMatrix = chainMatrix.T.tocsr()
+            canFinish = np.copy(terminal)
+            for sqrIdx in np.flatnonzero(terminal):
+                canFinish[csgraph.breadth_first_order(backwardMatrix, sqrIdx, return_predecessors=False)] = True
+        else:
+            reachable = _search_squares(fromSqrIdxs, nextSqrIdxs, [0], numSquares)
+            canFinish = _search_squares(nextSqrIdxs, fromSqrIdxs, np.flatnonzero(terminal), numSquares)
+
+        ## Fundamental matrix of the reachable transient squares, giving the expected visits to each from square 1
+        transient = np.flatnonzero(reachable & ~terminal)
+        if np.any(reachable & ~canFinish):
+            print("WARNING: The last square might never be reached, so the expected game length and visits are infinite.")
+            expectedVisits = np.full(numSquares, np.inf)
+            expectedLength = np.inf
+        elif (sps == None) and (np.size(transient) > _DENSE_ANALYSIS_SQUARES):
+            print(f"WARNING: Boards with more than {_DENSE_ANALYSIS_SQUARES} reachable squares need SciPy to solve for the expected game length and visits, so they are NaN (lengthPMF, timeoutProb and maxTurnsVisits are still calculated).")
+            expectedVisits = np.full(numSquares, np.nan)
+            expectedLength = np.nan
+        else:
+            start = (transient == 0).astype(float)
+
+            ### Solves for the first row of the fundamental matrix, (I - Q)^-1, instead of inverting all of it
+            if sps != None:
+                transientMatrix = chainMatrix[transient][:, transient]
+                transientVisits = spsla.spsolve((sps.identity(np.size(transient), format='csr') - transientMatrix).T.tocsc(), start)
+            else:
+                transientPositions = np.full(numSquares, -1)
+                transientPositions[transient] = np.arange(0, np.size(transient))
+                rows, columns = transientPositions[fromSqrIdxs], transientPositions[nextSqrIdxs]
+                inTransient = (rows >= 0) & (columns >= 0)
+
+                transientMatrix = np.zeros((np.size(transient), np.size(transient)))
+                np.add.at(transientMatrix, (rows[inTransient], columns[inTransient]), np.tile(self.Dice.Probs, numSquares)[inTransient])
+                transientVisits = np.linalg.solve(np.eye(np.size(transient)) - transientMatrix.T, start)
+
+            expectedVisits = np.zeros(numSquares)
+            expectedVisits[transient] = transientVisits
+            expectedVisits[-1] = 1 ### The last square is reached once
+            expectedLength = float(np.sum(transientVisits)) ### Each turn is spent on a transient square
+
+        ## Steps the probability of being on each square forward turn by turn (index is the square number)
+        sqrProbs = np.zeros(numSquares + 1)
+        sqrProbs[1] = 1
+        lengthPMF = np.zeros(maxTurns + 1)
+        maxTurnsVisits = np.copy(sqrProbs)
+
+        for turn in range(1, maxTurns + 1):
+            sqrProbs[numSquares] = 0 ### Finished games are no longer on the board
+            onBoard = np.flatnonzero(sqrProbs) ### Only the squares the game might be on are moved
+            sqrProbs = np.bincount(np.ravel(nextTable[onBoard]), weights=np.ravel(sqrProbs[onBoard, None] * self.Dice.Probs), minlength=numSquares + 1)
+            lengthPMF[turn] = sqrProbs[numSquares]
+            maxTurnsVisits = maxTurnsVisits + sqrProbs
+
+        analysis = {
+            'expectedLength': expectedLength,
+            'lengthPMF': lengthPMF,
+            'timeoutProb': max(1 - float(np.sum(lengthPMF)), 0),
+            'expectedVisits': expectedVisits,
+            'maxTurnsVisits': maxTurnsVisits[1:],
+        }
+
+        return analysis
+
+
+
+    def analyse_multiplayer_game(self, numPlayers, maxTurns=100, sepSLturns=True, cache=None):
+        '''Calculates the exact winner and game length distributions for a game with several players (see multiplayer_distributions).
+
+            Inputs:
+        numPlayers: the number of players for the game.
+        maxTurns: the maximum number of turns before the game ends automatically.
+        sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together (along with any snakes/ladders chained after it).
+        cache: the ResultCache (or its directory) for the single player analysis (see analyse_game). None doesn't use a cache.
+
+            Outputs:
+        analysis: the dictionary returned by multiplayer_distributions.
+        '''
+
+        singleAnalysis = self.analyse_game(maxTurns=maxTurns, sepSLturns=sepSLturns, cache=cache)
+
+        return multiplayer_distributions(lengthPMF=singleAnalysis['lengthPMF'], numPlayers=numPlayers)
+
+
+
+
+def _search_squares(fromSqrIdxs, toSqrIdxs, startSqrIdxs, numSquares):
+    '''Finds the squares that can be reached from some starting squares by a breadth first search, visiting each square once (used by analyse_game when SciPy isn't installed).
+
+        Inputs:
+    fromSqrIdxs, toSqrIdxs: the arrays of the square moved from and to (index 0 is square 1) of each move.
+    startSqrIdxs: the list/ndarray of the squares the search starts from.
+    numSquares: the number of squares on the board.
+
+        Outputs:
+    found: the boolean array of whether each square (index 0 is square 1) can be reached.
+    '''
+
+    ## Moves sorted by the square moved from, so the moves from each square are found by a binary search
+    order = np.argsort(fromSqrIdxs, kind='stable')
+    fromSqrIdxs, toSqrIdxs = fromSqrIdxs[order], toSqrIdxs[order]
+    moveStarts = np.searchsorted(fromSqrIdxs, np.arange(0, numSquares + 1))
+
+    found = np.zeros(numSquares, dtype=bool)
+    frontier = np.unique(np.asarray(startSqrIdxs, dtype=np.int64))
+    found[frontier] = True
+
+    ## Each turn of the loop moves on from the squares found last time
+    while np.size(frontier) > 0:
+        numMoves = moveStarts[frontier + 1] - moveStarts[frontier]
+        moveIdxs = np.repeat(moveStarts[frontier] - np.cumsum(numMoves) + numMoves, numMoves) + np.arange(0, np.sum(numMoves))
+        frontier = np.unique(toSqrIdxs[moveIdxs])
+        frontier = frontier[~found[frontier]]
+        found[frontier] = True
+
+    return found
+
+
+
+def _play_game_worker(game, numPlayers, numTimes, maxTurns, sepSLturns, seedSequence, collect='games', record=False, backend='numpy'):
+    '''Plays a share of the games of a play_game call in a separate process (see SnakesAndLadders._play_game_parallel).
+
+        Inputs:
+    game: the SnakesAndLadders game to play.
+    numPlayers, numTimes, maxTurns, sepSLturns, collect: see play_game.
+    seedSequence: the numpy.random.SeedSequence for this process' die.
+    record: True to also time and count the moves for the run report.
+    backend: the batch engine backend, 'numpy' or 'numba' (see play_game's Backend).
+
+        Outputs:
+    gamesList: the GameBatch of the played games, or the game statistics dictionary if collect is 'stats'.
+    recorder: the process' _RunRecorder, only if record is True (returned as a tuple with gamesList).
+    '''
+
+    if record == False:
+        return game._play_game_batch(numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns, sepSLturns=sepSLturns, die=Die(seed=seedSequence, dice=game.Dice), collect=collect, backend=backend)
+
+    recorder = _RunRecorder()
+    gamesList = game._play_game_batch(numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns, sepSLturns=sepSLturns, die=Die(seed=seedSequence, dice=game.Dice), collect=collect, recorder=recorder, backend=backend)
+
+    return gamesList, recorder
+
+
+
+
+def _move_turn_numpy(nextTable, terminalMask, activeGames, activeSqrNums, faces, countStats, squareFreq, winnerCounts):
+    '''Moves every player of every unfinished game one turn with NumPy array operations (the 'numpy' backend of the batch engine).
+
+        Inputs:
+    nextTable: the array of the square reached for each roll in Dice.Rolls (columns) from each square (rows).
+    terminalMask: the array of whether each square ends the game.
+    activeGames: the array of the game numbers of the unfinished games.
+    activeSqrNums: the 2D array of the square number of each player (columns) of each unfinished game (rows).
+    faces: the 2D array of the roll index (in Dice.Rolls) rolled by each player of each unfinished game.
+    countStats: True to add the squares reached to squareFreq and the winners to winnerCounts.
+    squareFreq: the array of the number of times any player was on each square (index is the square number), added to in place.
+    winnerCounts: the array of the number of games each player won (index 0 is player 1), added to in place.
+
+        Outputs:
+    movedSqrNums: the 2D array of the square number of each player of each game in activeGames after the turn.
+    newActiveGames, newActiveSqrNums: activeGames and movedSqrNums without the games that finished.
+    endedGames: the array of the game numbers of the games that finished.
+    '''
+
+    movedSqrNums = nextTable[activeSqrNums, faces]
+
+    ## Finds games where a player reached the last square
+    finished = terminalMask[movedSqrNums]
+    gameEnd = np.any(finished, axis=1)
+
+    if countStats == True:
+        squareFreq += np.bincount(np.ravel(movedSqrNums), minlength=np.size(squareFreq))
+        winnerCounts += np.bincount(np.argmax(finished[gameEnd], axis=1), minlength=np.size(winnerCounts)) ### First player in turn order to finish
+
+    return movedSqrNums, activeGames[~gameEnd], movedSqrNums[~gameEnd], activeGames[gameEnd]
+
+
+
+def _move_turn_loops(nextTable, terminalMask, activeGames, activeSqrNums, faces, countStats, squareFreq, winnerCounts):
+    '''Moves every player of every unfinished game one turn with plain loops, for Numba to compile (the 'numba' backend of the batch engine). Gives the same results as _move_turn_numpy.
+
+        Inputs:
+    [The same as _move_turn_numpy]
+
+        Outputs:
+    [The same as _move_turn_numpy]
+    '''
+
+    numActive, numPlayers = activeSqrNums.shape
+    movedSqrNums = np.empty_like(activeSqrNums)
+    newActiveGames = np.empty_like(activeGames)
+    newActiveSqrNums = np.empty_like(activeSqrNums)
+    endedGames = np.empty_like(activeGames)
+    numLeft, numEnded = 0, 0
+
+    ## Loop per game, keeping the unfinished games in order
+    for g in range(0, numActive):
+        winner = -1
+        for p in range(0, numPlayers):
+            sqrNum = nextTable[activeSqrNums[g, p], faces[g, p]]
+            movedSqrNums[g, p] = sqrNum
+            if (winner < 0) and terminalMask[sqrNum]: ### First player in turn order to finish
+                winner = p
+            if countStats:
+                squareFreq[sqrNum] += 1
+
+        if winner >= 0:
+            endedGames[numEnded] = activeGames[g]
+            numEnded += 1
+            if countStats:
+                winnerCounts[winner] += 1
+        else:
+            newActiveGames[numLeft] = activeGames[g]
+            newActiveSqrNums[numLeft, :] = movedSqrNums[g, :]
+            numLeft += 1
+
+    return movedSqrNums, newActiveGames[:numLeft], newActiveSqrNums[:numLeft], endedGames[:numEnded]
+
+
+
+## Move functions of each batch engine backend (Numba compiles the loops the first time each type of board is played, and keeps them on disk)
+_MOVE_TURN = {'numpy': _move_turn_numpy}
+if numba != None:
+    _MOVE_TURN['numba'] = numba.njit(cache=True, nogil=True)(_move_turn_loops)
+
+
+
+
+def _empty_game_stats(numSquares, numPlayers, maxTurns):
+    '''Creates the game statistics dictionary (see play_game) for no games.
+
+        Inputs:
+    numSquares: the number of squares on the board.
+    numPlayers: the number of players for the game.
+    maxTurns: the maximum number of turns before the game ends automatically.
+
+        Outputs:
+    stats: the game statistics dictionary, with every count set to zero.
+    '''
+
+    stats = {
+        'numGames': 0,
+        'squareFreq': np.zeros(numSquares, dtype=np.int64),
+        'gameLengthCounts': np.zeros(maxTurns + 1, dtype=np.int64),
+        'winnerCounts': np.zeros(numPlayers, dtype=np.int64),
+        'timeoutCount': 0,
+    }
+
+    return stats
+
+
+
+
+def merge_game_stats(statsList):
+    '''Adds up game statistics dictionaries (see play_game) from games played on the same board with the same settings.
+
+        Inputs:
+    statsList: the list of game statistics dictionaries.
+
+        Outputs:
+    stats: the game statistics dictionary of all the games.
+    '''
+
+    stats = {key: np.copy(value) if isinstance(value, np.ndarray) else value for key, value in statsList[0].items()}
+
+    for otherStats in statsList[1:]:
+        for key in stats:
+            stats[key] = stats[key] + otherStats[key]
+
+    return stats
+
+
+
+
+def multiplayer_distributions(lengthPMF, numPlayers):
+    '''Calculates the exact winner and game length distributions for players taking turns in order, from the game length distribution of a single player.
+
+    Each player moves independently, so a player finishing on turn t wins if every earlier player (in turn order) is still playing after turn t and every later player is still playing after turn t-1.
+
+        Inputs:
+    lengthPMF: the array of the probability of a single player game ending on each turn (index 0 is the zeroth turn) up to maxTurns, e.g. from analyse_game.
+    numPlayers: the number of players for the game.
+
+        Outputs:
+    analysis: the dictionary containing:
+        'winProbs': the array of the probability of each player winning (index 0 is player 1).
+        'timeoutProb': the probability of no player finishing within maxTurns.
+        'winTurnProbs': the 2D array of the probability of each player (rows) winning on each turn (columns).
+        'lengthPMF': the array of the probability of the game lasting each number of turns, with timed out games lasting maxTurns.
+        'expectedLength': the expected number of turns of the game (with timed out games lasting maxTurns).
+    '''
+
+    lengthPMF = np.asarray(lengthPMF, dtype=float)
+    maxTurns = np.size(lengthPMF) - 1
+
+    ## Probability of a single player still playing after each turn, and at the start of each turn
+    survival = np.clip(1 - np.cumsum(lengthPMF), 0, 1)
+    prevSurvival = np.concat(([1], survival[:-1]))
+
+    ## Probability of each player winning on each turn
+    players = np.arange(0, numPlayers)[:, None] ### Number of players before each player
+    winTurnProbs = lengthPMF * survival**players * prevSurvival**(numPlayers - 1 - players)
+
+    ## Probability of the game ending on each turn (any player finishing), with timed out games ending on the last turn
+    gameLengthPMF = prevSurvival**numPlayers - survival**numPlayers
+    timeoutProb = float(survival[-1]**numPlayers)
+    gameLengthPMF[-1] = gameLengthPMF[-1] + timeoutProb
+
+    analysis = {
+        'winProbs': np.sum(winTurnProbs, axis=1),
+        'timeoutProb': timeoutProb,
+        'winTurnProbs': winTurnProbs,
+        'lengthPMF': gameLengthPMF,
+        'expectedLength': float(np.sum(np.arange(0, maxTurns + 1) * gameLengthPMF)),
+    }
+
+    return analysis
+
+
+
+
+def compare_variants(variants, numPlayers, numTimes, maxTurns=100, seed=None, rng=None, confidence=0.95, chunkSize=10000):
+    '''Compares games with different boards, Overflow types or sepSLturns (with the same dice) by playing every variant with the same die rolls for each game and player (common random numbers). The paired differences to the first variant vary much less than differences between separate runs, so they need far fewer games for the same precision.
+
+        Inputs:
+    variants: the dictionary of each variant's name and its (SnakesAndLadders game, sepSLturns), e.g. {'classic': (slg_c, True), 'rollback': (slg_r, True)}. The first variant is the baseline that the others are compared to.
+    numPlayers: the number of players for the game.
+    numTimes: the number of games to play with each variant.
+    maxTurns: the maximum number of turns before the game ends automatically.
+    seed: the seed (e.g. an integer or numpy.random.SeedSequence) for the die rolls, so the same seed gives the same games. None gives different games each time.
+    rng: the numpy.random.Generator (or Die) for the die rolls, used instead of seed.
+    confidence: the confidence level of the confidence intervals.
+    chunkSize: the number of games played at once (the rolls of a chunk take chunkSize*maxTurns*numPlayers bytes).
+
+        Outputs:
+    comparison: the dictionary containing:
+        'numGames': the number of games played with each variant.
+        'confidence': the confidence level of the confidence intervals.
+        'baseline': the name of the baseline variant.
+        'variants': the dictionary of each variant's estimated 'meanLength' (with timed out games lasting maxTurns), 'squareFreq' (array of each square's relative frequency per game and per player, index 0 is square 1), 'winProbs' (array, index 0 is player 1) and 'timeoutProb'.
+        'differences': the dictionary of each other variant's differences to the baseline (variant minus baseline), containing:
+            'meanLength', 'squareFreq', 'winProbs': the differences of the estimates (squareFreq is None if the boards have different numbers of squares).
+            'meanHalfWidth', 'squareFreqHalfWidth', 'winProbHalfWidth': the confidence interval half-widths of the differences, from the paired games.
+            'meanIndependentHalfWidth': the half-width the mean length difference would have from separate runs of the same number of games, for comparison.
+    '''
+
+    ## Every variant needs the baseline's dice for their rolls to be shared
+    baseGame = list(variants.values())[0][0]
+    for name, (game, sepSLturns) in list(variants.items()):
+        if game.Dice.spec() != baseGame.Dice.spec():
+            print(f"WARNING: Variant '{name}' rolls {game.Dice} rather than the baseline's {baseGame.Dice}, so it can't share its rolls and is left out.")
+            variants = {otherName: variant for otherName, variant in variants.items() if otherName != name}
+
+    names = list(variants.keys())
+    if len(names) < 2:
+        print("WARNING: There is only one variant, so there is nothing to compare it to.")
+
+    baseline = names[0]
+
+    ## Every variant needs the same number of squares for their square frequencies to be compared
+    sameSquares = all(game.numSquares == baseGame.numSquares for game, sepSLturns in variants.values())
+    if sameSquares == False:
+        print("WARNING: The variants have different numbers of squares, so their square frequencies aren't compared.")
+
+    die = baseGame._get_die(seed=seed, rng=rng)
+
+    ## Sums of each variant's values and of the squared paired differences to the baseline, added up over the chunks
+    sums = {name: {'length': 0.0, 'lengthSq': 0.0, 'wins': np.zeros(numPlayers), 'squares': np.zeros(game.numSquares)} for name, (game, sepSLturns) in variants.items()}
+    diffSums = {name: {'length': 0.0, 'lengthSq': 0.0, 'wins': np.zeros(numPlayers), 'winsSq': np.zeros(numPlayers), 'squares': 0.0, 'squaresSq': 0.0} for name in names[1:]}
+
+    ## Loop per chunk, with the same rolls for every variant
+    for start in range(0, numTimes, max(int(chunkSize), 1)):
+        faces = die.roll((min(chunkSize, numTimes - start), maxTurns, numPlayers))
+
+        for name, (game, sepSLturns) in variants.items():
+            gameLengths, winners, squareCounts = game._play_game_rolls(faces, sepSLturns=sepSLturns)
+            wins = (winners[:, None] == np.arange(0, numPlayers)).astype(float)
+            relSquares = squareCounts / numPlayers
+
+            sums[name]['length'] += float(np.sum(gameLengths))
+            sums[name]['lengthSq'] += float(np.sum(gameLengths.astype(float)**2))
+            sums[name]['wins'] += np.sum(wins, axis=0)
+            sums[name]['squares'] += np.sum(relSquares, axis=0)
+
+            if name == baseline:
+                baseLengths, baseWins, baseSquares = gameLengths, wins, relSquares
+            else:
+                lengthDiffs = gameLengths - baseLengths
+                diffSums[name]['length'] += float(np.sum(lengthDiffs))
+                diffSums[name]['lengthSq'] += float(np.sum(lengthDiffs.astype(float)**2))
+                diffSums[name]['wins'] += np.sum(wins - baseWins, axis=0)
+                diffSums[name]['winsSq'] += np.sum((wins - baseWins)**2, axis=0)
+                if sameSquares == True:
+                    diffSums[name]['squares'] += np.sum(relSquares - baseSquares, axis=0)
+                    diffSums[name]['squaresSq'] += np.sum((relSquares - baseSquares)**2, axis=0)
+
+    zScore = statistics.NormalDist().inv_cdf((1 + confidence) / 2) ## Half-width in standard errors
+
+    def half_width(total, totalSq):
+        '''Gets the confidence interval half-width of a mean from the sum and sum of squares of its values.'''
+        return zScore * np.sqrt(np.maximum(totalSq / numTimes - (total / numTimes)**2, 0) / numTimes)
+
+    ## Estimates of each variant
+    estimates = {}
+    for name in names:
+        winProbs = sums[name]['wins'] / numTimes
+        estimates[name] = {
+            'meanLength': sums[name]['length'] / numTimes,
+            'squareFreq': sums[name]['squares'] / numTimes,
+            'winProbs': winProbs,
+            'timeoutProb': float(1 - np.sum(winProbs)),
+        }
+
+    ## Paired differences to the baseline
+    differences = {}
+    for name in names[1:]:
+        differences[name] = {
+            'meanLength': diffSums[name]['length'] / numTimes,
+            'meanHalfWidth': float(half_width(diffSums[name]['length'], diffSums[name]['lengthSq'])),
+            'meanIndependentHalfWidth': float(np.sqrt(half_width(sums[name]['length'], sums[name]['lengthSq'])**2 + half_width(sums[baseline]['length'], sums[baseline]['lengthSq'])**2)),
+            'squareFreq': diffSums[name]['squares'] / numTimes if sameSquares == True else None,
+            'squareFreqHalfWidth': half_width(diffSums[name]['squares'], diffSums[name]['squaresSq']) if sameSquares == True else None,
+            'winProbs': diffSums[name]['wins'] / numTimes,
+            'winProbHalfWidth': half_width(diffSums[name]['wins'], diffSums[name]['winsSq']),
+        }
+
+    comparison = {
+        'numGames': numTimes,
+        'confidence': confidence,
+        'baseline': baseline,
+        'variants': estimates,
+        'differences': differences,
+    }
+
+    return comparison
+
+
+
+
+def _square_index(index, numSquares):
+    '''Turns an index into a sparse table (an int, array, slice or boolean mask of square numbers) into an array of square numbers.
+
+        Inputs:
+    index: the index.
+    numSquares: the number of squares on the board.
+
+        Outputs:
+    sqrNums: the ndarray of the square numbers.
+    '''
+
+    if isinstance(index, slice) or (np.asarray(index).dtype == bool):
+        return np.arange(0, numSquares + 1)[index]
+
+    return np.asarray(index)
+
+
+
+
+class SparseJumpTable:
+    '''Looks up the square at the end of the snake/ladder on each square like the JumpTable (or ChainTable) array of a dense board, but only stores the squares that have one,
+    in sorted arrays that are searched for the squares asked for (every other square leads to itself).
+
+        Attributes:
+    starts: the sorted array of the squares with a snake/ladder.
+    ends: the array of the square at the end of each one.
+    numSquares: the number of squares on the board.
+    dtype: the integer type of the square numbers given back.
+    shape: the shape of the dense array it stands for.
+
+        Methods:
+    __init__(...): instantiates the class (defines and creates the table).
+    __getitem__(...): array-like lookup of the squares (an int, array, slice or boolean mask of square numbers).
+    __len__(...), __array__(...): the length and dense array of the table (the dense array uses memory for every square).
+    '''
+
+    __slots__ = ('starts', 'ends', 'numSquares', 'dtype')
+
+
+    def __init__(self, starts, ends, numSquares, dtype=np.int32):
+        '''Instantiates the class (defines and creates the table).
+
+            Inputs:
+        starts: the sorted list/ndarray of the squares with a snake/ladder.
+        ends: the list/ndarray of the square at the end of each one.
+        numSquares: the number of squares on the board.
+        dtype: the integer type of the square numbers given back.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.numSquares = numSquares
+        self.dtype = dtype
+
+
+    @property
+    def shape(self):
+        return (self.numSquares + 1,)
+
+
+    def __len__(self):
+        return self.numSquares + 1
+
+
+    def __getitem__(self, index):
+        sqrNums = _square_index(index, self.numSquares)
+        if len(self.starts) == 0:
+            return sqrNums.astype(self.dtype)[()]
+
+        positions = np.minimum(np.searchsorted(self.starts, sqrNums), len(self.starts) - 1)
+        onJump = self.starts[positions] == sqrNums
+
+        return np.where(onJump, self.ends[positions], sqrNums).astype(self.dtype)[()] ## [()] gives a single value for a single square
+
+
+    def __array__(self, dtype=None, copy=None):
+        return self[:].astype(dtype if dtype != None else self.dtype)
+
+
+
+
+class SparseTerminalMask:
+    '''Looks up whether each square ends the game like the TerminalMask array of a dense board, from the square number (only the last square does).
+
+        Attributes:
+    numSquares: the number of squares on the board.
+    shape: the shape of the dense array it stands for.
+
+        Methods:
+    __init__(...): instantiates the class (defines and creates the mask).
+    __getitem__(...): array-like lookup of the squares (an int, array, slice or boolean mask of square numbers).
+    __len__(...), __array__(...): the length and dense array of the mask.
+    '''
+
+    __slots__ = ('numSquares',)
+
+
+    def __init__(self, numSquares):
+        '''Instantiates the class (defines and creates the mask).
+
+            Inputs:
+        numSquares: the number of squares on the board.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.numSquares = numSquares
+
+
+    @property
+    def shape(self):
+        return (self.numSquares + 1,)
+
+
+    def __len__(self):
+        return self.numSquares + 1
+
+
+    def __getitem__(self, index):
+        return (_square_index(index, self.numSquares) == self.numSquares)[()]
+
+
+    def __array__(self, dtype=None, copy=None):
+        return self[:].astype(dtype if dtype != None else bool)
+
+
+
+
+class SparseNextTable:
+    '''Looks up the square reached for each roll from each square like the NextTable, MergedNextTable or OverflowTables arrays of a dense board, working the squares out
+    from the square numbers, rolls, Overflow type and sparse jump tables instead of storing them.
+
+        Attributes:
+    numSquares: the number of squares on the board.
+    Dice: the Dice rolled to move (the columns are the rolls in Dice.Rolls).
+    Overflow: the Overflow type (see SnakesAndLadders).
+    jumpTable: the SparseJumpTable of the snakes/ladders taken instead of rolling on their squares (None for none, as in OverflowTables).
+    chainTable: the SparseJumpTable of the snakes/ladders (and any chained after them) taken on the rolled square (None for separate snake/ladder turns).
+    dtype: the integer type of the square numbers given back.
+    shape: the shape of the dense array it stands for.
+
+        Methods:
+    __init__(...): instantiates the class (defines and creates the table).
+    __getitem__(...): array-like lookup of the squares (rows) and rolls (columns), e.g. table[sqrNums, faces] or table[sqrNum] for every roll from one square.
+    __len__(...), __array__(...): the length and dense array of the table (the dense array uses memory for every square and roll).
+    _next_squares(...): works out the squares reached.
+    '''
+
+    __slots__ = ('numSquares', 'Dice', 'Overflow', 'jumpTable', 'chainTable', 'dtype')
+
+
+    def __init__(self, numSquares, Dice, Overflow, jumpTable=None, chainTable=None, dtype=np.int32):
+        '''Instantiates the class (defines and creates the table).
+
+            Inputs:
+        numSquares: the number of squares on the board.
+        Dice: the Dice rolled to move.
+        Overflow: the Overflow type ('classic', 'rollback' or 'ignore').
+        jumpTable: the SparseJumpTable of the snakes/ladders taken instead of rolling on their squares (None for none).
+        chainTable: the SparseJumpTable of the snakes/ladders (and any chained after them) taken on the rolled square (None for none).
+        dtype: the integer type of the square numbers given back.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.numSquares = numSquares
+        self.Dice = Dice
+        self.Overflow = Overflow
+        self.jumpTable = jumpTable
+        self.chainTable = chainTable
+        self.dtype = dtype
+
+
+    @property
+    def shape(self):
+        return (self.numSquares + 1, len(self.Dice.Rolls))
+
+
+    def __len__(self):
+        return self.numSquares + 1
+
+
+    def _next_squares(self, sqrNums, rollNums):
+        '''Works out the squares reached, in the same way as the dense tables are compiled.
+
+            Inputs:
+        sqrNums: the ndarray of the squares moved from.
+        rollNums: the ndarray of the rolled numbers (broadcast with sqrNums).
+
+            Outputs:
+        nextSqrNums: the ndarray of the squares reached.
+        '''
+
+        numSquares, maxRoll = self.numSquares, self.Dice.maxRoll
+        sqrNums = sqrNums.astype(np.int64)
+        rolls = sqrNums + rollNums ### Rolled square numbers
+
+        match self.Overflow:
+            case 'classic': ### Overflows count as last square
+                nextSqrNums = np.minimum(rolls, numSquares)
+            case 'rollback': ### Last maxRoll squares from end
+                nextSqrNums = np.where((numSquares - maxRoll < sqrNums) & (sqrNums < numSquares), np.maximum(numSquares - maxRoll + rollNums, 1), rolls)
+            case _: ### Overflows stay on the current square
+                nextSqrNums = np.where(rolls > numSquares, sqrNums, rolls)
+
+        nextSqrNums = np.where(sqrNums == numSquares, numSquares, nextSqrNums) ### The last square is never left
+
+        ## The snake/ladder on the square is taken instead of rolling
+        if self.jumpTable != None:
+            jumpSqrNums = self.jumpTable[sqrNums]
+            nextSqrNums = np.where(jumpSqrNums != sqrNums, jumpSqrNums, nextSqrNums)
+
+        ## The snake/ladder on the rolled square (and any chained after it) is taken in the same turn
+        if self.chainTable != None:
+            nextSqrNums = self.chainTable[nextSqrNums]
+
+        return nextSqrNums.astype(self.dtype)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            rows, columns = index
+            sqrNums = _square_index(rows, self.numSquares)
+            if isinstance(columns, slice):
+                sqrNums = sqrNums[..., None]
+            rollNums = self.Dice.Rolls[columns]
+        else:
+            sqrNums = _square_index(index, self.numSquares)[..., None]
+            rollNums = self.Dice.Rolls
+
+        return self._next_squares(sqrNums, rollNums)[()]
+
+
+    def __array__(self, dtype=None, copy=None):
+        return self[:].astype(dtype if dtype != None else self.dtype)
+
+
+
+
+class SquareList:
+    '''Builds the squares (defined as Square class) of a Snakes and Ladders game from its lookup tables when they are asked for, and can be used like a list of them.
+
+        Attributes:
+    game: the SnakesAndLadders game that the squares are on.
+
+        Methods:
+    __init__(...): instantiates the class (defines the squares of a game).
+    __len__(...), __getitem__(...), __iter__(...): list-like access to the squares (the first square is at index 0).
+    '''
+
+
+    def __init__(self, game):
+        '''Instantiates the class (defines the squares of a game).
+
+            Inputs:
+        game: the SnakesAndLadders game that the squares are on.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.game = game
+
+
+    def __len__(self):
+        return self.game.numSquares
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        i = int(index)
+        if i < 0: ## Negative index counts from the end
+            i = i + len(self)
+        if not (0 <= i < len(self)):
+            raise IndexError("SquareList index out of range")
+
+        ## Finds the Square parameters from the game's tables
+        numSquares = self.game.numSquares
+        sqrNum = i + 1
+        jumpNum = int(self.game.JumpTable[sqrNum])
+        hsSnk = False
+        hsLdr = False
+
+        if sqrNum == numSquares:
+            nxtSqrs = None
+        elif jumpNum != sqrNum: ### Square has a snake/ladder
+            nxtSqrs = jumpNum
+            hsSnk = jumpNum < sqrNum
+            hsLdr = jumpNum > sqrNum
+        elif (self.game.Overflow == 'rollback') and ((numSquares - self.game.Dice.maxRoll) < sqrNum): ### Squares within the largest roll of the last square
+            nxtSqrs = np.maximum(numSquares - self.game.Dice.maxRoll + self.game.Dice.Rolls, 1) #### NP array with the last maxRoll square numbers from end that can be rolled
+        else:
+            nxtSqrs = sqrNum + self.game.Dice.Rolls #### NP array with the square numbers that can be rolled from current
+
+        return Square(squareNum=sqrNum, nextSquares=nxtSqrs, hasSnake=hsSnk, hasLadder=hsLdr)
+
+
+    def __iter__(self):
+        for i in range(0, len(self)):
+            yield self[i]
+
+
+
+
+class Square:
+    '''Implements each square on a snakes and ladder board.
+
+        Attributes:
+    squareNum: the number of the square.
+    hasSnake = True (has a snake) if square is on the top of a snake.
+    hasLadder = True (has a ladder) if square is on the bottom of a ladder.
+    nextSquares: the list/ndarray of the numbers, or value of the number, of the square(s) that can be reached by this square.
+
+        Methods:
+    __init__(...): instantiates the class (defines and creates a square).
+    roll_die(...): Gets a random square that can be reached from current square.
+    '''
+
+    __slots__ = ('squareNum', 'nextSquares', 'hasSnake', 'hasLadder') ## Fixed attributes, so each square doesn't need a dictionary
+
+
+    def __init__(self, squareNum, nextSquares=None, hasSnake=False, hasLadder=False):
+        '''instantiates the class (defines and creates a square). 
+
+           Inputs:
+        squareNum: the number of the square.
+        hasSnake = True (has a snake) if square is on the top of a snake.
+        hasLadder = True (has a ladder) if square is on the bottom of a ladder.
+        nextSquares: the list/ndarray of the numbers, or value of the number, of the square(s) that can be reached by this square.
+
+           Outputs:
+        [No Outputs]
+        '''
+
+        ## Makes sure that squareNum is the correct type
+        if type(squareNum) == int: 
+            self.squareNum = squareNum
+        else:
+            print("WARNING: The given square number isn't an integer, so it is set to zero.")
+            self.squareNum = 0
+
+
+        if ( isinstance(nextSquares, tp.NoneType) ) or (np.size(nextSquares) == 0): ## Square has no following squares
+            ### Checks if it has a snake/ladder
+            if (hasSnake == True) and (hasLadder == False): 
+                print("WARNING: Square",self.squareNum,"can't have a snake as it has no following squares, so it is removed.")
+            elif (hasSnake == False) and (hasLadder == True):
+                print("WARNING: Square",self.squareNum,"can't have a ladder as it has no following squares, so it is removed.")
+            elif (hasSnake == True) and (hasLadder == True):
+                print("WARNING: Square",self.squareNum,"can't have a snake or ladder as it has no following squares, so both are removed.")
+                
+            self.hasSnake = False
+            self.hasLadder = False
+            self.nextSquares = None
+            
+        elif (hasSnake == True) and (hasLadder == True): ## Square has both a snake and ladder
+            print("WARNING: Square",self.squareNum,"can't have both snakes and ladders, so it will have neither.")
+            
+            self.nextSquares = nextSquares
+            self.hasSnake = False
+            self.hasLadder = False
+
+        elif ((hasSnake == True) or (hasLadder == True)) and (np.size(nextSquares) > 1):
+            ## If there is a snake/ladder and more than one following square
+            print("WARNING: Square",self.squareNum,"has a snake/ladder, so it should have only one following square.")
+
+            self.hasSnake = hasSnake
+            self.hasLadder = hasLadder
+
+            for i in nextSquares:
+                if ((hasSnake == True) and (i < squareNum)) or ((hasLadder == True) and (i > squareNum)):
+                    #### If next square in list is on the bottom of a snake or the top of a ladder (whichever is applicable)
+                    if self.hasSnake == True:
+                        print(f"Valid nextSquares number found ({i}) for square {self.squareNum} (with snake). Setting nextSquares to it.")
+                    elif self.hasLadder == True:
+                        print(f"Valid nextSquares number found ({i}) for square {self.squareNum} (with ladder). Setting nextSquares to it.")                    
+
+                    self.nextSquares = i
+                    break
+            else:
+                print("WARNING: Square",self.squareNum,"has no valid following squares, so none will be selected.")
+                self.nextSquares = None
+
+        else: ### Default case
+            self.hasSnake = hasSnake
+            self.hasLadder = hasLadder
+            self.nextSquares = nextSquares
+
+    
+
+    def roll_die(self):
+        '''Gets a random square that can be reached from current square.
+
+           Inputs:
+        [No Inputs]
+
+           Output:
+        Next: the number/ID of a random square following this one (False if there is no next square available).
+        '''
+
+        match self:
+            
+            case Square(nextSquares=None): ### If there are no squares after this one
+                print("WARNING: Square",self.squareNum,"has no connections.")
+                Next = False
+            
+            case _: ### Anything else 
+                if isinstance(self.nextSquares,int): #### nextSquares is an integer
+                    Next = self.nextSquares
+                else:
+                    Next = rd.choice(self.nextSquares) ## Gets random square from nextSquares list
+        
+        return Next
+
+
+
+
+class Dice:
+    '''Implements the dice rolled to move on a Snakes and Ladders board: any number of dice with any number of (weighted) faces, added together, with the option
+    to roll again on a given total (e.g. 'roll again on a 6'), where the extra rolls are added on to the move.
+
+    The dice are compiled into the distinct totals a move can have and their probabilities, with an alias table so that a move is drawn in the same time whatever
+    the dice (one random integer and one random float), e.g. for 2d20 or heavily weighted dice.
+
+        Attributes:
+    numFaces: the number of faces on each die (numbered 1 to numFaces).
+    numDice: the number of dice rolled and added together.
+    Weights: the array of the probability of each face (index 0 is face 1).
+    rollAgainOn: the total of a roll that earns another roll, added on to the move (None for no extra rolls).
+    maxRollAgain: the largest number of extra rolls in a move (the roll after the last extra roll is kept whatever it is).
+    Rolls: the array of every total a move can have, in order. The tables of a game have a column for each, and Die rolls are indexes into it.
+    Probs: the array of the probability of each total in Rolls.
+    maxRoll: the largest total a move can have.
+    AliasProbs: the array of the probability of keeping each column of the alias table (otherwise its alias is used).
+    AliasRolls: the array of the index (in Rolls) of each column's alias.
+
+        Methods:
+    __init__(...): instantiates the class (defines and creates the dice).
+    spec(...): gets the definition of the dice as a dictionary.
+    _make_alias_table(...): makes the alias table of a distribution.
+    '''
+
+
+    def __init__(self, numFaces=6, numDice=1, Weights=None, rollAgainOn=None, maxRollAgain=2):
+        '''Instantiates the class (defines and creates the dice).
+
+            Inputs:
+        numFaces: the number of faces on each die (numbered 1 to numFaces).
+        numDice: the number of dice rolled and added together.
+        Weights: the list/ndarray of the relative weight of each face (index 0 is face 1). None gives fair dice.
+        rollAgainOn: the total of a roll that earns another roll, added on to the move (e.g. 6 for 'roll again on a 6'). None for no extra rolls.
+        maxRollAgain: the largest number of extra rolls in a move, so that moves have a largest total (None, for no limit, isn't allowed).
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        ## Makes sure that the numbers of faces and dice are the correct type
+        if isinstance(numFaces, (int, np.integer)) and (numFaces >= 1):
+            self.numFaces = int(numFaces)
+        else:
+            print("WARNING: The number of faces isn't a positive integer, so it is set to 6.")
+            self.numFaces = 6
+
+        if isinstance(numDice, (int, np.integer)) and (numDice >= 1):
+            self.numDice = int(numDice)
+        else:
+            print("WARNING: The number of dice isn't a positive integer, so it is set to 1.")
+            self.numDice = 1
+
+        ## Face probabilities
+        if Weights is None:
+            self.Weights = np.full(self.numFaces, 1 / self.numFaces)
+        elif (np.shape(Weights) != (self.numFaces,)) or np.any(np.asarray(Weights) < 0) or (np.sum(Weights) <= 0):
+            print(f"WARNING: Weights should be {self.numFaces} non-negative numbers (one for each face) that aren't all zero, so the dice are fair.")
+            self.Weights = np.full(self.numFaces, 1 / self.numFaces)
+        else:
+            self.Weights = np.asarray(Weights, dtype=float) / np.sum(Weights)
+
+        ## Probability of each total of the dice (index is the total), adding one die at a time
+        rollProbs = np.concat(([0], self.Weights))
+        for i in range(1, self.numDice):
+            rollProbs = np.convolve(rollProbs, np.concat(([0], self.Weights)))
+
+        ## Extra rolls, each one added on to the move
+        if rollAgainOn != None:
+            if not (isinstance(rollAgainOn, (int, np.integer)) and (0 < rollAgainOn < len(rollProbs)) and (rollProbs[rollAgainOn] > 0)):
+                print(f"WARNING: rollAgainOn can't be rolled with {self.numDice}d{self.numFaces}, so there are no extra rolls.")
+                rollAgainOn = None
+            elif rollProbs[rollAgainOn] == 1:
+                print("WARNING: rollAgainOn is the only total that can be rolled, so there are no extra rolls.")
+                rollAgainOn = None
+
+        self.rollAgainOn = None if rollAgainOn == None else int(rollAgainOn)
+
+        ### Moves need a largest total (for the columns of the tables), so there is always a limit on the extra rolls
+        if self.rollAgainOn == None:
+            self.maxRollAgain = 0
+        elif isinstance(maxRollAgain, (int, np.integer)) and (maxRollAgain >= 0):
+            self.maxRollAgain = int(maxRollAgain)
+        else:
+            print("WARNING: maxRollAgain isn't a non-negative integer (extra rolls need a limit), so it is set to 2.")
+            self.maxRollAgain = 2
+
+        moveProbs = np.zeros(len(rollProbs) + self.maxRollAgain * (len(rollProbs) - 1))
+        if self.rollAgainOn == None:
+            moveProbs[:len(rollProbs)] = rollProbs
+        else:
+            ### Moves with k extra rolls: k rolls of rollAgainOn, then a last roll (any total if it is the last allowed)
+            lastProbs = np.copy(rollProbs)
+            lastProbs[self.rollAgainOn] = 0
+            for k in range(0, self.maxRollAgain + 1):
+                if k == self.maxRollAgain:
+                    lastProbs = rollProbs
+                start = k * self.rollAgainOn
+                moveProbs[start:start + len(rollProbs)] += rollProbs[self.rollAgainOn]**k * lastProbs
+
+        self.Rolls = np.flatnonzero(moveProbs > 0)
+        self.Probs = moveProbs[self.Rolls] / np.sum(moveProbs[self.Rolls])
+        self.maxRoll = int(self.Rolls[-1])
+
+        self.AliasProbs, self.AliasRolls = self._make_alias_table(self.Probs)
+
+
+
+    @staticmethod
+    def _make_alias_table(probs):
+        '''Makes the alias table of a distribution (Vose's method), where a draw picks a column at random, then keeps it with its probability or uses its alias.
+
+            Inputs:
+        probs: the array of the probability of each outcome.
+
+            Outputs:
+        aliasProbs: the array of the probability of keeping each column.
+        aliasRolls: the array of the alias outcome of each column.
+        '''
+
+        numRolls = len(probs)
+        scaledProbs = np.asarray(probs, dtype=float) * numRolls
+        aliasProbs = np.ones(numRolls)
+        aliasRolls = np.arange(0, numRolls)
+
+        small = [i for i in range(0, numRolls) if scaledProbs[i] < 1]
+        large = [i for i in range(0, numRolls) if scaledProbs[i] >= 1]
+
+        ## Fills each small column with probability from a large one
+        while (len(small) > 0) and (len(large) > 0):
+            s, l = small.pop(), large.pop()
+            aliasProbs[s] = scaledProbs[s]
+            aliasRolls[s] = l
+            scaledProbs[l] = scaledProbs[l] - (1 - scaledProbs[s])
+
+            if scaledProbs[l] < 1:
+                small.append(l)
+            else:
+                large.append(l)
+
+        ### Anything left over is full (up to rounding)
+        for i in small + large:
+            aliasProbs[i] = 1
+
+        return aliasProbs, aliasRolls
+
+
+
+    def spec(self):
+        '''Gets the definition of the dice as a dictionary, which can be saved as JSON and given back to Dice(**spec).
+
+            Inputs:
+        [No Inputs]
+
+            Outputs:
+        spec: the dictionary of numFaces, numDice, Weights, rollAgainOn and maxRollAgain.
+        '''
+
+        spec = {
+            'numFaces': self.numFaces,
+            'numDice': self.numDice,
+            'Weights': self.Weights.tolist(),
+            'rollAgainOn': self.rollAgainOn,
+            'maxRollAgain': self.maxRollAgain,
+        }
+
+        return spec
+
+
+    def __repr__(self):
+        return f"Dice({self.numDice}d{self.numFaces}, Rolls={self.Rolls.tolist()})"
+
+
+
+
+class Die:
+    '''Implements the dice (see Dice) that draws its rolls from a numpy.random.Generator in large blocks, then hands them out from a buffer.
+
+    The rolls only depend on the seed (and blockSize), not on how many are asked for at once, so runs with the same seed are the same bit for bit.
+
+        Attributes:
+    rng: the numpy.random.Generator the rolls are drawn from.
+    Dice: the Dice being rolled.
+    blockSize: the number of rolls drawn from rng at once.
+    faces: the buffer of drawn rolls, as indexes into Dice.Rolls (the rolled number minus one for one six-sided die).
+    position: the index of the next unused roll in faces.
+
+        Methods:
+    __init__(...): instantiates the class (defines and creates a die).
+    roll(...): gets the next roll(s) of the die.
+    _draw_block(...): draws a block of rolls from rng.
+    '''
+
+    __slots__ = ('rng', 'Dice', 'blockSize', 'faces', 'position', '_faceList', '_uniform', '_dtype')
+
+
+    def __init__(self, seed=None, rng=None, blockSize=65536, dice=None):
+        '''Instantiates the class (defines and creates a die).
+
+            Inputs:
+        seed: the seed (e.g. an integer or numpy.random.SeedSequence) for the rolls. None gives different rolls each time.
+        rng: the numpy.random.Generator to draw the rolls from (used instead of seed).
+        blockSize: the number of rolls drawn from rng at once.
+        dice: the Dice to roll. None gives one six-sided die.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        if rng == None:
+            rng = np.random.default_rng(seed)
+
+        self.rng = rng
+        self.Dice = Dice() if dice is None else dice
+        self.blockSize = blockSize
+
+        ## Rolls that are all as likely are drawn directly, otherwise from the alias table
+        self._uniform = bool(np.all(self.Dice.Probs == self.Dice.Probs[0]))
+        self._dtype = np.uint8 if len(self.Dice.Rolls) <= 256 else np.uint16
+
+        self.faces = np.empty(0, dtype=self._dtype)
+        self.position = 0
+        self._faceList = None ## List copy of faces for single rolls, made when first needed
+
+
+
+    def roll(self, size=None):
+        '''Gets the next roll(s) of the die.
+
+            Inputs:
+        size: the shape of the array of rolls to get. None gets one roll.
+
+            Outputs:
+        faces: the roll index (in Dice.Rolls) as an int, or the array of them if size is given.
+        '''
+
+        numRolls = 1 if size == None else int(np.prod(size))
+
+        ## Draws more blocks if there aren't enough rolls left in the buffer
+        if self.position + numRolls > len(self.faces):
+            numBlocks = -(-(self.position + numRolls - len(self.faces)) // self.blockSize) ### Rounded up
+            newFaces = [self._draw_block() for i in range(0, numBlocks)]
+            self.faces = np.concat([self.faces[self.position:]] + newFaces)
+            self.position = 0
+            self._faceList = None
+
+        ## Single roll, from the list copy as it is faster than indexing the array
+        if size == None:
+            if self._faceList == None:
+                self._faceList = self.faces.tolist()
+
+            self.position = self.position + 1
+            return self._faceList[self.position - 1]
+
+        faces = self.faces[self.position:self.position + numRolls]
+        self.position = self.position + numRolls
+
+        return np.reshape(faces, size)
+
+
+
+    def _draw_block(self):
+        '''Draws a block of rolls from rng, using the alias table of the Dice (one random integer and one random float per roll) unless every roll is as likely.
+
+            Inputs:
+        [No Inputs]
+
+            Outputs:
+        faces: the array of blockSize roll indexes (in Dice.Rolls).
+        '''
+
+        numRolls = len(self.Dice.Rolls)
+        columns = self.rng.integers(0, numRolls, size=self.blockSize, dtype=self._dtype)
+        if self._uniform == True:
+            return columns
+
+        keep = self.rng.random(self.blockSize) < self.Dice.AliasProbs[columns]
+
+        return np.where(keep, columns, self.Dice.AliasRolls[columns].astype(self._dtype))
+
+
+
+
+class GameSession:
+    '''Holds the state of many Snakes and Ladders games that are played one move at a time (e.g. live games where each player rolls when they choose), in arrays with one row per game rather than an object per game.
+
+    The games follow the same rules as play_game: the Overflow type and tables of the game, sepSLturns, and maxTurns. A game ends at the end of the turn in which a player first reaches the last square (the other players still move that turn) or the end of turn maxTurns, and the first player in turn order to reach the last square wins.
+
+        Attributes:
+    game: the SnakesAndLadders game being played.
+    numPlayers: the number of players in every game.
+    maxTurns: the maximum number of turns before a game ends automatically.
+    sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together (along with any snakes/ladders chained after it).
+    Die: the Die rolled for the moves.
+    numGames: the number of games in the session (finished or not).
+    Positions: the 2D array of the square number of each player (columns) of each game (rows).
+    Turns: the array of the turn being played in each game (starting from 1), or the last turn played in finished games.
+    CurrentPlayer: the array of the player who moves next in each game (starting from 1).
+    Winner: the array of the winning player of each game, or 0 if there isn't one (yet).
+    Finished: the array of whether each game has ended.
+
+        Methods:
+    __init__(...): instantiates the class (defines and creates a session with no games).
+    new_games(...): adds new games to the session.
+    reset(...): starts games again from the beginning, reusing their rows.
+    step(...): moves the current player of each of a set of games.
+    finish(...): moves a set of games until they end.
+    _grow(...): makes space for more games.
+    '''
+
+
+    def __init__(self, game, numPlayers, maxTurns=100, sepSLturns=True, seed=None, rng=None, capacity=1024):
+        '''Instantiates the class (defines and creates a session with no games).
+
+            Inputs:
+        game: the SnakesAndLadders game to play.
+        numPlayers: the number of players in every game.
+        maxTurns: the maximum number of turns before a game ends automatically.
+        sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together (along with any snakes/ladders chained after it).
+        seed: the seed (e.g. an integer or numpy.random.SeedSequence) for the die rolls. None uses the game's Die.
+        rng: the numpy.random.Generator (or Die) for the die rolls, used instead of seed.
+        capacity: the number of games to allocate space for at the start.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.game = game
+        self.numPlayers = numPlayers
+        self.maxTurns = maxTurns
+        self.sepSLturns = sepSLturns
+
+        self.Die = game._get_die(seed=seed, rng=rng)
+
+        if sepSLturns == True:
+            self._nextTable = game.NextTable
+        else:
+            self._nextTable = game.MergedNextTable
+
+        ## State arrays, with space for more games at the end
+        capacity = max(capacity, 1)
+        self.numGames = 0
+        self._positions = np.empty((capacity, numPlayers), dtype=game._sqrDtype)
+        self._turns = np.empty(capacity, dtype=np.int32)
+        self._currentPlayer = np.empty(capacity, dtype=np.int16)
+        self._winner = np.empty(capacity, dtype=np.int16)
+        self._finished = np.empty(capacity, dtype=bool)
+
+
+    @property
+    def Positions(self):
+        return self._positions[:self.numGames]
+
+    @property
+    def Turns(self):
+        return self._turns[:self.numGames]
+
+    @property
+    def CurrentPlayer(self):
+        return self._currentPlayer[:self.numGames]
+
+    @property
+    def Winner(self):
+        return self._winner[:self.numGames]
+
+    @property
+    def Finished(self):
+        return self._finished[:self.numGames]
+
+
+    def __len__(self):
+        return self.numGames
+
+
+
+    def _grow(self, numGames):
+        '''Makes space for a number of games, growing the state arrays to at least double their size if they are too small.
+
+            Inputs:
+        numGames: the total number of games that need space.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        capacity = len(self._turns)
+        if numGames <= capacity:
+            return
+
+        newCapacity = max(numGames, 2*capacity)
+        for name in ['_positions', '_turns', '_currentPlayer', '_winner', '_finished']:
+            oldArray = getattr(self, name)
+            newArray = np.empty((newCapacity,) + np.shape(oldArray)[1:], dtype=oldArray.dtype)
+            newArray[:self.numGames] = oldArray[:self.numGames]
+            setattr(self, name, newArray)
+
+
+
+    def new_games(self, numGames=1):
+        '''Adds new games to the session, with every player on square 1 at the start of turn 1.
+
+            Inputs:
+        numGames: the number of games to add.
+
+            Outputs:
+        gameIds: the array of the new games' ids (their rows in the state arrays).
+        '''
+
+        gameIds = np.arange(self.numGames, self.numGames + numGames, dtype=np.int64)
+        self._grow(self.numGames + numGames)
+        self.numGames = self.numGames + numGames
+        self.reset(gameIds)
+
+        return gameIds
+
+
+
+    def reset(self, gameIds=None):
+        '''Starts games again from the beginning (e.g. to reuse the rows of finished games).
+
+            Inputs:
+        gameIds: the list/ndarray of the ids of the games to reset. None resets every game.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        if gameIds is None:
+            gameIds = slice(0, self.numGames)
+
+        self._positions[gameIds] = 1
+        self._turns[gameIds] = 1
+        self._currentPlayer[gameIds] = 1
+        self._winner[gameIds] = 0
+        self._finished[gameIds] = False
+
+
+
+    def step(self, gameIds=None):
+        '''Moves the current player of each of a set of games (one move each), all at once.
+
+            Inputs:
+        gameIds: the list/ndarray of the ids of the games to move (repeats are only moved once, and finished games aren't moved). None moves every unfinished game.
+
+            Outputs:
+        moves: the dictionary of arrays describing each move (one element per moved game, in order of id), containing:
+            'gameIds': the ids of the moved games.
+            'players': the player who moved (starting from 1).
+            'turns': the turn of the move.
+            'rolls': the rolled number, or 0 if the die wasn't used (a separate snake/ladder turn).
+            'fromSquares', 'toSquares': the squares the player moved from and to (with snakes/ladders and overflows dealt with).
+            'finished': whether the game ended with the move.
+        '''
+
+        if gameIds is None:
+            ids = np.flatnonzero(~self.Finished)
+        else:
+            ids = np.unique(np.asarray(gameIds, dtype=np.int64))
+            if (np.size(ids) > 0) and ((ids[0] < 0) or (ids[-1] >= self.numGames)):
+                print(f"WARNING: Game ids must be from 0 to {self.numGames - 1}, so the others aren't moved.")
+                ids = ids[(ids >= 0) & (ids < self.numGames)]
+            ids = ids[~self._finished[ids]]
+
+        ## Moves each game's current player with their own roll
+        players = self._currentPlayer[ids].astype(np.int64) - 1 ### Column of the current player
+        turns = self._turns[ids]
+        fromSquares = self._positions[ids, players]
+        faces = self.Die.roll(np.size(ids))
+        toSquares = self._nextTable[fromSquares, faces]
+        self._positions[ids, players] = toSquares
+
+        rolls = self.game.Dice.Rolls[faces].astype(np.int16)
+        if self.sepSLturns == True:
+            rolls[self.game.JumpTable[fromSquares] != fromSquares] = 0 ### The die isn't used on a snake/ladder square
+
+        ## The first player in turn order to reach the last square wins
+        newWinner = self.game.TerminalMask[toSquares] & (self._winner[ids] == 0)
+        self._winner[ids[newWinner]] = players[newWinner] + 1
+
+        ## Games end after the last player's move, if there is a winner or it was the last turn
+        turnEnd = players == self.numPlayers - 1
+        finished = turnEnd & ((self._winner[ids] != 0) | (turns >= self.maxTurns))
+        self._finished[ids[finished]] = True
+        self._turns[ids[turnEnd & ~finished]] += 1
+        self._currentPlayer[ids] = np.where(turnEnd, 1, players + 2)
+
+        moves = {
+            'gameIds': ids,
+            'players': players + 1,
+            'turns': turns,
+            'rolls': rolls,
+            'fromSquares': fromSquares,
+            'toSquares': toSquares,
+            'finished': finished,
+        }
+
+        return moves
+
+
+
+    def finish(self, gameIds=None):
+        '''Moves a set of games until they end, moving every unfinished one of them each step.
+
+            Inputs:
+        gameIds: the list/ndarray of the ids of the games to finish. None finishes every game.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        if gameIds is None:
+            ids = np.flatnonzero(~self.Finished)
+        else:
+            ids = np.unique(np.asarray(gameIds, dtype=np.int64))
+
+        while np.size(ids) > 0:
+            moves = self.step(ids)
+            ids = moves['gameIds'][~moves['finished']]
+
+
+
+
+class GameBatch:
+    '''Stores the square numbers of a batch of played games in one integer array, and can be used like a list of the game arrays.
+
+        Attributes:
+    numPlayers: the number of players in every game.
+    sqrNums: the array that stores the square numbers of all the games one after another (rows are the players, columns are the turns), with unused space at the end.
+    gameStarts: the array of the column that each game starts at in sqrNums, with the column after the last game at the end.
+    numGames: the number of games stored.
+    gameLengths: the array of the number of turns in each game (not counting the zeroth turn).
+
+        Methods:
+    __init__(...): instantiates the class (defines and creates an empty batch of games).
+    append(...): adds a game array to the end of the batch.
+    extend(...): adds all the games of another batch to the end of the batch.
+    trim(...): frees the unused space at the end of the batch.
+    _add_games(...): reserves space for new games at the end of the batch.
+    __len__(...), __getitem__(...), __iter__(...): list-like access to the game arrays (rows are the players, columns are the turns).
+    '''
+
+
+    def __init__(self, numPlayers, dtype=np.int16, capacity=1024):
+        '''Instantiates the class (defines and creates an empty batch of games).
+
+            Inputs:
+        numPlayers: the number of players in every game.
+        dtype: the integer type used to store the square numbers.
+        capacity: the number of columns (turns of all games) to allocate at the start.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.numPlayers = numPlayers
+        self.sqrNums = np.empty((numPlayers, max(capacity, 1)), dtype=dtype)
+        self.gameStarts = np.zeros(1, dtype=np.int64)
+        self.numGames = 0
+
+
+    @property
+    def gameLengths(self):
+        return np.diff(self.gameStarts[:self.numGames + 1]) - 1 ## Subtracted by one to account for 'zeroth' turn at square 1
+
+
+
+    def _add_games(self, gameLengths):
+        '''Reserves space for new games at the end of the batch, growing the arrays geometrically if they are too small.
+
+            Inputs:
+        gameLengths: the list/ndarray of the number of turns in each new game (not counting the zeroth turn).
+
+            Outputs:
+        newGameStarts: the array of the column that each new game starts at in sqrNums.
+        '''
+
+        gameLengths = np.asarray(gameLengths, dtype=np.int64)
+        numNewGames = np.size(gameLengths)
+        newGameStarts = self.gameStarts[self.numGames] + np.concat(([0], np.cumsum(gameLengths + 1)))
+
+        ## Grows the square numbers array to at least double its size if the new games don't fit
+        if newGameStarts[-1] > np.shape(self.sqrNums)[1]:
+            newSqrNums = np.empty((self.numPlayers, max(newGameStarts[-1], 2*np.shape(self.sqrNums)[1])), dtype=self.sqrNums.dtype)
+            newSqrNums[:, :newGameStarts[0]] = self.sqrNums[:, :newGameStarts[0]]
+            self.sqrNums = newSqrNums
+
+        ## Grows the game starts array in the same way
+        if self.numGames + numNewGames + 1 > np.size(self.gameStarts):
+            newGameStartsArray = np.empty(max(self.numGames + numNewGames + 1, 2*np.size(self.gameStarts)), dtype=np.int64)
+            newGameStartsArray[:self.numGames + 1] = self.gameStarts[:self.numGames + 1]
+            self.gameStarts = newGameStartsArray
+
+        self.gameStarts[self.numGames + 1:self.numGames + numNewGames + 1] = newGameStarts[1:]
+        self.numGames = self.numGames + numNewGames
+
+        return newGameStarts[:-1]
+
+
+
+    def append(self, game):
+        '''Adds a game array to the end of the batch.
+
+            Inputs:
+        game: the array containing the square number of each player for each turn of the game (rows are the players, columns are the turns).
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        numTurns = np.shape(game)[1]
+        start = int(self._add_games([numTurns - 1])[0])
+        self.sqrNums[:, start:start + numTurns] = game
+
+
+
+    def extend(self, other):
+        '''Adds all the games of another batch to the end of the batch.
+
+            Inputs:
+        other: the GameBatch with the games to add (with the same number of players).
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        otherStarts = other.gameStarts[:other.numGames + 1]
+        start = int(self._add_games(other.gameLengths)[0]) if other.numGames > 0 else 0
+        self.sqrNums[:, start:start + otherStarts[-1]] = other.sqrNums[:, :otherStarts[-1]]
+
+
+
+    def trim(self):
+        '''Frees the unused space at the end of the batch.
+
+            Inputs:
+        [No Inputs]
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.sqrNums = self.sqrNums[:, :self.gameStarts[self.numGames]].copy()
+        self.gameStarts = self.gameStarts[:self.numGames + 1].copy()
+
+
+
+    def __len__(self):
+        return self.numGames
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.numGames))]
+
+        i = int(index)
+        if i < 0: ## Negative index counts from the end
+            i = i + self.numGames
+        if not (0 <= i < self.numGames):
+            raise IndexError("GameBatch index out of range")
+
+        return self.sqrNums[:, self.gameStarts[i]:self.gameStarts[i+1]]
+
+
+    def __iter__(self):
+        gameStarts = self.gameStarts[:self.numGames + 1].tolist()
+        for i in range(0, self.numGames):
+            yield self.sqrNums[:, gameStarts[i]:gameStarts[i+1]]
+
+
+    def __repr__(self):
+        return f"GameBatch({list(self)})"
+
+
+    def iter_segments(self):
+        '''Yields the games as one segment, like GameArchive.iter_segments, so both can be analysed the same way.
+
+            Inputs:
+        [No Inputs]
+
+            Outputs (yielded):
+        sqrNums: the array of the square numbers of all the games one after another (rows are the players, columns are the turns).
+        gameStarts: the array of the column that each game starts at in sqrNums, with the column after the last game at the end.
+        '''
+
+        yield self.sqrNums[:, :self.gameStarts[self.numGames]], self.gameStarts[:self.numGames + 1]
+
+
+
+
+class GameArchiveWriter:
+    '''Writes batches of played games to a directory on disk as they are played, so that the games don't have to fit in memory. Each batch is saved as its own segment: a .npy file of its square numbers and a .npy file of the column each game starts at, with info.json describing the archive.
+
+        Attributes:
+    path: the directory the archive is written to.
+    numPlayers: the number of players in every game.
+    dtype: the integer type of the square numbers.
+    encoding: how the square numbers are stored. 'none': as they are; 'delta': as the change in square from the previous turn (zero at the start of each game), using 8-bit integers for segments where every change fits.
+    numGames: the number of games written.
+    segmentGames: the list of the number of games in each segment.
+
+        Methods:
+    __init__(...): instantiates the class (creates the archive directory).
+    add(...): writes a batch of games as a new segment.
+    close(...): finishes writing the archive.
+    __enter__(...), __exit__(...): use as a context manager, closing the archive at the end.
+    '''
+
+
+    def __init__(self, path, numPlayers, dtype=np.int16, encoding='none'):
+        '''Instantiates the class (creates the archive directory).
+
+            Inputs:
+        path: the directory to write the archive to (created if it doesn't exist).
+        numPlayers: the number of players in every game.
+        dtype: the integer type of the square numbers.
+        encoding: how the square numbers are stored, 'none' or 'delta'.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        ## Makes sure that encoding type is valid and stores it as an attribute
+        try:
+            match encoding.lower():
+                case 'none'|'n':
+                    self.encoding = 'none'
+                case 'delta'|'d':
+                    self.encoding = 'delta'
+                case _: #### Invalid type
+                    print("WARNING: encoding is not valid. Setting to none.")
+                    self.encoding = 'none'
+        except Exception as e: ## Catch any exceptions, especially AttributeError from not having lower() method
+            if encoding == None:
+                self.encoding = 'none'
+            else:
+                print(f"WARNING: {str(e)}, so encoding is not valid. Setting to none.") ### e is the error message
+                self.encoding = 'none'
+
+        self.path = path
+        self.numPlayers = numPlayers
+        self.dtype = np.dtype(dtype)
+        self.numGames = 0
+        self.segmentGames = []
+
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, 'info.json')):
+            print(f"WARNING: {path} already has an archive, so it is written over.")
+
+        self._write_info()
+
+
+
+    def add(self, gamesList):
+        '''Writes a batch of games as a new segment.
+
+            Inputs:
+        gamesList: the GameBatch (or list) of arrays containing the square number of each player for each turn of a game.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        if not isinstance(gamesList, GameBatch): ## Lists of game arrays are put into a batch first
+            batch = GameBatch(numPlayers=self.numPlayers, dtype=self.dtype)
+            for game in gamesList:
+                batch.append(game)
+            gamesList = batch
+
+        if len(gamesList) == 0:
+            return
+
+        sqrNums, gameStarts = next(gamesList.iter_segments())
+
+        ## Change in square from the previous turn, with zero at the start of each game
+        if self.encoding == 'delta':
+            deltas = np.diff(sqrNums.astype(np.int64), axis=1, prepend=0)
+            deltas[:, gameStarts[:-1]] = 0
+
+            if (deltas.size == 0) or ((deltas.min() >= np.iinfo(np.int8).min) and (deltas.max() <= np.iinfo(np.int8).max)):
+                sqrNums = deltas.astype(np.int8)
+            else:
+                sqrNums = deltas.astype(self.dtype) ### Changes can't be bigger than the largest square number
+
+        segment = len(self.segmentGames)
+        np.save(os.path.join(self.path, f'sqrNums_{segment:06d}.npy'), np.ascontiguousarray(sqrNums))
+        np.save(os.path.join(self.path, f'gameStarts_{segment:06d}.npy'), np.asarray(gameStarts, dtype=np.int64))
+
+        self.segmentGames.append(len(gamesList))
+        self.numGames = self.numGames + len(gamesList)
+        self._write_info()
+
+
+
+    def close(self):
+        '''Finishes writing the archive.
+
+            Inputs:
+        [No Inputs]
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self._write_info()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *excInfo):
+        self.close()
+
+
+    def _write_info(self):
+        '''Writes info.json, which describes the archive (rewritten after every segment so an unfinished archive can still be read).'''
+
+        info = {'numPlayers': self.numPlayers, 'dtype': self.dtype.name, 'encoding': self.encoding, 'numGames': self.numGames, 'segmentGames': self.segmentGames}
+        with open(os.path.join(self.path, 'info.json'), 'w') as file:
+            json.dump(info, file)
+
+
+
+
+class GameArchive:
+    '''Reads an archive of played games written by GameArchiveWriter, memory-mapping its segments so that games are only loaded from disk when they are used. It can be used like a list of the game arrays, and shared between processes.
+
+        Attributes:
+    path: the directory of the archive.
+    numPlayers: the number of players in every game.
+    dtype: the integer type of the square numbers.
+    encoding: how the square numbers are stored ('none' or 'delta').
+    numGames: the number of games in the archive.
+    segmentFirstGames: the array of the index of the first game in each segment, with the number of games at the end.
+    gameLengths: the array of the number of turns in each game (not counting the zeroth turn).
+
+        Methods:
+    __init__(...): instantiates the class (opens the archive).
+    iter_segments(...): yields the square numbers and game starts of each segment.
+    square_frequency(...): counts the number of times any player was on each square.
+    __len__(...), __getitem__(...), __iter__(...): list-like access to the game arrays (rows are the players, columns are the turns).
+    _load_segment(...): memory-maps a segment's arrays.
+    '''
+
+
+    def __init__(self, path):
+        '''Instantiates the class (opens the archive).
+
+            Inputs:
+        path: the directory of the archive.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        with open(os.path.join(path, 'info.json')) as file:
+            info = json.load(file)
+
+        self.path = path
+        self.numPlayers = info['numPlayers']
+        self.dtype = np.dtype(info['dtype'])
+        self.encoding = info['encoding']
+        self.numGames = info['numGames']
+        self.segmentFirstGames = np.concat([[0], np.cumsum(info['segmentGames'], dtype=np.int64)])
+        self._segments = [None] * len(info['segmentGames']) ## Memory-mapped segments, opened when first needed
+
+
+    def _load_segment(self, segment):
+        '''Memory-maps a segment's arrays (only done once per segment).
+
+            Inputs:
+        segment: the segment number.
+
+            Outputs:
+        sqrNums: the memory-mapped array of the stored square numbers of the segment's games.
+        gameStarts: the memory-mapped array of the column that each game starts at in sqrNums, with the column after the last game at the end.
+        '''
+
+        if self._segments[segment] == None:
+            sqrNums = np.load(os.path.join(self.path, f'sqrNums_{segment:06d}.npy'), mmap_mode='r')
+            gameStarts = np.load(os.path.join(self.path, f'gameStarts_{segment:06d}.npy'), mmap_mode='r')
+            self._segments[segment] = (sqrNums, gameStarts)
+
+        return self._segments[segment]
+
+
+
+    @property
+    def gameLengths(self):
+        return np.concat([np.diff(self._load_segment(segment)[1]) - 1 for segment in range(0, len(self._segments))] + [np.zeros(0, dtype=np.int64)]) ## Subtracted by one to account for 'zeroth' turn at square 1
+
+
+
+    def iter_segments(self):
+        '''Yields the square numbers and game starts of each segment, decoding them if needed (only the segment being used is in memory).
+
+            Inputs:
+        [No Inputs]
+
+            Outputs (yielded):
+        sqrNums: the array of the square numbers of the segment's games one after another (rows are the players, columns are the turns), memory-mapped if not encoded.
+        gameStarts: the array of the column that each game starts at in sqrNums, with the column after the last game at the end.
+        '''
+
+        for segment in range(0, len(self._segments)):
+            sqrNums, gameStarts = self._load_segment(segment)
+
+            ## Adds up the changes in square within each game, starting from square 1
+            if self.encoding == 'delta' and len(gameStarts) > 1:
+                deltas = sqrNums.astype(np.int32)
+                deltas[:, gameStarts[1:-1]] -= np.add.reduceat(deltas, gameStarts[:-1], axis=1)[:, :-1] ### Takes away the previous game's total change at the start of each game, so the totals start again from 0
+                sqrNums = (np.cumsum(deltas, axis=1, dtype=np.int32) + 1).astype(self.dtype)
+
+            yield sqrNums, gameStarts
+
+
+
+    def square_frequency(self, numSquares):
+        '''Counts the number of times any player was on each square in any turn of the games (starting from the zeroth turn), a segment at a time.
+
+            Inputs:
+        numSquares: the number of squares on the board.
+
+            Outputs:
+        squareFreq: the array of the number of times any player was on each square (index 0 is square 1).
+        '''
+
+        squareFreq = np.zeros(numSquares + 1, dtype=np.int64)
+        for sqrNums, gameStarts in self.iter_segments():
+            squareFreq += np.bincount(np.ravel(sqrNums), minlength=numSquares + 1)
+
+        return squareFreq[1:]
+
+
+
+    def __len__(self):
+        return self.numGames
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.numGames))]
+
+        i = int(index)
+        if i < 0: ## Negative index counts from the end
+            i = i + self.numGames
+        if not (0 <= i < self.numGames):
+            raise IndexError("GameArchive index out of range")
+
+        segment = int(np.searchsorted(self.segmentFirstGames, i, side='right')) - 1
+        sqrNums, gameStarts = self._load_segment(segment)
+        j = i - self.segmentFirstGames[segment] ## Game index within the segment
+        game = sqrNums[:, gameStarts[j]:gameStarts[j+1]]
+
+        if self.encoding == 'delta':
+            game = (np.cumsum(game, axis=1, dtype=np.int64) + 1).astype(self.dtype)
+
+        return game
+
+
+    def __iter__(self):
+        for sqrNums, gameStarts in self.iter_segments():
+            gameStarts = gameStarts.tolist()
+            for j in range(0, len(gameStarts) - 1):
+                yield sqrNums[:, gameStarts[j]:gameStarts[j+1]]
+
+
+    def __repr__(self):
+        return f"GameArchive({self.path!r}, numGames={self.numGames})"
+
+
+
+
+class ResultCache:
+    '''On-disk cache of play_game and analyse_game results, with one file per result named by a hash of the board and run parameters. When the cache is bigger than its maximum size, the least recently used results are deleted.
+
+        Attributes:
+    path: the directory of the cache.
+    maxSize: the maximum total size (in bytes) of the cached results.
+    size: the total size (in bytes) of the cached results.
+
+        Methods:
+    __init__(...): instantiates the class (creates the directory if needed).
+    make_key(...): hashes a dictionary of parameters into a cache key.
+    get(...): gets a cached result.
+    put(...): caches a result.
+    clear(...): deletes every cached result.
+    __len__(...), __contains__(...): the number of cached results and whether a key is cached.
+    _files(...): gets the cached result files, least recently used first.
+    '''
+
+
+    def __init__(self, path, maxSizeMB=1024):
+        '''Instantiates the class (creates the directory if needed).
+
+            Inputs:
+        path: the directory of the cache.
+        maxSizeMB: the maximum total size (in MB) of the cached results.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.maxSize = int(maxSizeMB * 1024**2)
+
+
+    @staticmethod
+    def make_key(params):
+        '''Hashes a dictionary of parameters into a cache key (the order of the dictionary doesn't matter).
+
+            Inputs:
+        params: the dictionary of parameters, which must be JSON serialisable.
+
+            Outputs:
+        key: the hexadecimal SHA-256 hash of the parameters.
+        '''
+
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+    def _files(self):
+        '''Gets the cached result files, least recently used first.
+
+            Inputs:
+        [No Inputs]
+
+            Outputs:
+        files: the list of the (last used time, size, file name) of each cached result.
+        '''
+
+        files = []
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.name.endswith('.pkl'):
+                    info = entry.stat()
+                    files.append((info.st_mtime_ns, info.st_size, entry.path))
+
+        return sorted(files)
+
+
+    @property
+    def size(self):
+        return sum(size for lastUsed, size, file in self._files())
+
+
+    def get(self, key):
+        '''Gets a cached result, marking it as just used.
+
+            Inputs:
+        key: the cache key.
+
+            Outputs:
+        result: the cached result, or None if it isn't cached.
+        '''
+
+        file = os.path.join(self.path, f"{key}.pkl")
+        try:
+            with open(file, 'rb') as f:
+                result = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError): ## Not cached, or deleted/being written by another process
+            return None
+
+        os.utime(file) ### Last used time is the modified time
+
+        return result
+
+
+    def put(self, key, result):
+        '''Caches a result, then deletes the least recently used results until the cache fits in its maximum size.
+
+            Inputs:
+        key: the cache key.
+        result: the result to cache (anything that can be pickled).
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        ## Writes to a temporary file first, so other processes never read a half written result
+        file = os.path.join(self.path, f"{key}.pkl")
+        tempFile = f"{file}.{os.getpid()}.tmp"
+        with open(tempFile, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if os.path.getsize(tempFile) > self.maxSize:
+            print("WARNING: The result is bigger than the maximum cache size, so it isn't cached.")
+            os.remove(tempFile)
+            return
+
+        os.replace(tempFile, file)
+
+        ## Evicts the least recently used results
+        files = self._files()
+        totalSize = sum(size for lastUsed, size, name in files)
+        for lastUsed, size, name in files:
+            if totalSize <= self.maxSize:
+                break
+            if name != file:
+                try:
+                    os.remove(name)
+                except FileNotFoundError: ### Already evicted by another process
+                    pass
+                totalSize = totalSize - size
+
+
+    def clear(self):
+        for lastUsed, size, name in self._files():
+            try:
+                os.remove(name)
+            except FileNotFoundError: ## Already evicted by another process
+                pass
+
+
+    def __len__(self):
+        return len(self._files())
+
+
+    def __contains__(self, key):
+        return os.path.exists(os.path.join(self.path, f"{key}.pkl"))
+
+
+    def __repr__(self):
+        return f"ResultCache({self.path!r}, maxSizeMB={self.maxSize / 1024**2:g})"
+
+
+
+
+class GameEvent:
+    '''Something that happened in a game played by the loop engine, which is sent to the event sinks.
+
+        Attributes:
+    kind: the type of event. 'game': a game starts; 'turn': a turn starts; 'roll': a player rolls the die; 'snake'/'ladder': a player goes down a snake/up a ladder; 'overflow': a player's roll was too big and ignored; 'move': a player ends their move; 'win': a player wins the game; 'timeout': the game reaches the maximum number of turns.
+    game: the game number (starting from 1).
+    turn: the turn number (None for 'game').
+    player: the player number (None for 'game', 'turn' and 'timeout', and the winner for 'win').
+    fromSquare: the square that the player moved from (None if the player didn't move).
+    toSquare: the square that the player moved to (None if the player didn't move).
+    roll: the rolled number (None if not for a roll).
+    squares: the tuple of every player's final square (None if not for 'win' or 'timeout').
+    '''
+
+    __slots__ = ('kind', 'game', 'turn', 'player', 'fromSquare', 'toSquare', 'roll', 'squares')
+
+
+    def __init__(self, kind, game, turn=None, player=None, fromSquare=None, toSquare=None, roll=None, squares=None):
+        self.kind = kind
+        self.game = game
+        self.turn = turn
+        self.player = player
+        self.fromSquare = fromSquare
+        self.toSquare = toSquare
+        self.roll = roll
+        self.squares = squares
+
+
+    def __repr__(self):
+        info = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__ if getattr(self, name) != None)
+        return f"GameEvent({info})"
+
+
+
+
+class PrintSink:
+    '''Event sink that prints the game messages for a Verbosity, as play_game does when Verbosity is 'full' or 'reduced'.
+
+        Attributes:
+    Verbosity: 'full': shows the square for each player for each turn; 'reduced': only shows a summary at the end of each game.
+
+        Methods:
+    __init__(...): instantiates the class.
+    __call__(...): prints the message for an event.
+    '''
+
+
+    def __init__(self, Verbosity='full'):
+        self.Verbosity = Verbosity
+
+
+    def __call__(self, event):
+        '''Prints the message for an event (if there is one for the Verbosity).
+
+            Inputs:
+        event: the GameEvent.
+
+            Outputs:
+        [No Outputs]
+        '''
 
-        ## Square creation loop
-        for i in range(0, self.numSquares):
-            ### Predefines Square parameters
-            sqrNum = i+1
-            nxtSqrs = None
-            hsSnk = False
-            hsLdr = False
-
-            ### Checks if the square has a snake
-            for s in self.Snakes:
-                if sqrNum == np.max(s):
-                    if sqrNum == self.numSquares:
-                        print("WARNING: The last square can't have a snake.")
+        match event.kind:
+            case 'game':
+                print(f"\n \t Game: {event.game}")
+            case 'turn':
+                if self.Verbosity == 'full':
+                    print(f"\n \t \t Turn: {event.turn}")
+            case 'snake':
+                if self.Verbosity == 'full':
+                    print(f"Player {event.player} went down the snake at square {event.fromSquare}.")
+            case 'ladder':
+                if self.Verbosity == 'full':
+                    print(f"Player {event.player} went up the ladder at square {event.fromSquare}.")
+            case 'overflow':
+                if self.Verbosity == 'full':
+                    print(f"Player {event.player}'s roll ({event.fromSquare + event.roll}) was too big.")
+            case 'move':
+                if self.Verbosity == 'full':
+                    print(f"Player {event.player}, next square: {event.toSquare}")
+            case 'win'|'timeout':
+                if self.Verbosity == 'full':
+                    if event.kind == 'win':
+                        print(f"Player {event.player} won the game.")
                     else:
-                        nxtSqrs = int(np.min(s)) ###### Converted from numpy.int64 to int to make datatype comparison in roll_die() easier
-                        hsSnk = True
-                    break
-            
-            ### Checks if the square has a ladder
-            for l in self.Ladders:
-                if sqrNum == np.min(l):
-                    if sqrNum == self.numSquares:
-                        print("WARNING: The last square can't have a ladder.")
+                        print(f"Max turns ({event.turn}) exceeded, ending game.")
+                else:
+                    if event.kind == 'win':
+                        print(f"Number of turns: {event.turn}")
                     else:
-                        nxtSqrs = int(np.max(l)) ###### Converted from numpy.int64 to int to make datatype comparison in roll_die() easier
-                        hsLdr = True
-                    break
+                        print(f"Number of turns: {event.turn} (timed out)")
 
-            ### Sets nxtSqrs (nextSquares) if the square doesn't have a snake/ladder 
-            if nxtSqrs == None:
-                if sqrNum == self.numSquares:
-                    nxtSqrs = None
-                
-                elif (self.numSquares - 6) < sqrNum < self.numSquares: #### 5th last to penultimate squares
-
-                    match self.Overflow.lower():
-                        case 'classic'|'c'|'ignore'|'i': ###### Both 'classic' and 'ignore'
-                            nxtSqrs = np.arange(sqrNum + 1, sqrNum + 7) ####### NP array with next 6 square numbers from current
-                        case 'rollback'|'r':
-                            nxtSqrs = np.arange(self.numSquares - 5, self.numSquares + 1) ####### NP array with last 6 square numbers from end
-                            
-                else:
-                    nxtSqrs = np.arange(sqrNum + 1, sqrNum + 7)
-                        
-            
-            ### Creates square and adds it to the list
-            square = Square(squareNum=sqrNum, nextSquares=nxtSqrs, hasSnake=hsSnk, hasLadder=hsLdr)
-            self.Squares.append(square)
+                    ## Individual player message loop
+                    for plyrNum, sqr in enumerate(event.squares, start=1):
+                        if (plyrNum == event.player): ### If the current player won the game
+                            print(f"Player {plyrNum}'s square: {sqr} (winner)")
+                        else:
+                            print(f"Player {plyrNum}'s square: {sqr}")
 
 
 
-    def play_game(self, numPlayers, numTimes, maxTurns=100, Verbosity='full', sepSLturns=True):
-        '''Plays Snakes and Ladder game a specified number of times.
 
-            Inputs:
-        numPlayers: the number of players for the game. 
-        numTimes: the number of times to play the game.
-        maxTurns: the maximum number of turns before the game ends automatically.
-        Verbosity: the amount of messages about the game to show the user. 'full': shows the square for each player for each turn; 'reduced': only shows a summary including the number of turns, the winner and the final square of the other players at the end of the game; 'none': shows no messages about the game, only showing warning/error messages
-        sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together.
-        
-            Outputs:
-        gamesList: the list of arrays containing the square number of each player for each turn of a game (starting from the zeroth turn).
-        '''
+class TraceSink:
+    '''Event sink that records the events compactly in one integer array, which can be saved to a file.
 
-        ## Makes sure that Verbosity type is valid and stores it as a new variable
-        default = 'full' ## default verbosity type for invalid inputs
-        try:
-            match Verbosity.lower():
-                case 'full'|'f':
-                    newVerbosity = 'full'
-                case 'reduced'|'r':
-                    newVerbosity = 'reduced'
-                case 'none'|'n':
-                    newVerbosity = 'none'
-                case _: #### Invalid type
-                    print(f"WARNING: Verbosity is not valid. Setting to {default}.")
-                    newVerbosity = default
-        except Exception as e: ## Catch any exceptions, especially AttributeError from not having lower() method
-            if Verbosity == None:
-                newVerbosity = 'none'
-            else:
-                print(f"WARNING: {str(e)}, so Verbosity is not valid. Setting to {default}.") #### e is the error message
-                newVerbosity = default
+        Attributes:
+    Kinds: the tuple of event kinds, with each kind's code being its index.
+    Fields: the tuple of the event attributes stored in each row of the trace (missing attributes are stored as 0, and the kind as its code).
+    trace: the array of recorded events (rows are the events, columns are the Fields), with unused space at the end.
+    numEvents: the number of events recorded.
+    events: the array of recorded events without the unused space.
 
-        ## Predefines gamesList
-        gamesList = []
+        Methods:
+    __init__(...): instantiates the class (creates an empty trace).
+    __call__(...): records an event.
+    save(...): saves the recorded events to a .npy file.
+    __len__(...), __iter__(...): access to the recorded events as GameEvents (without squares).
+    '''
 
-        ## Loop per game
-        for i in range(0,numTimes):
-            game = i + 1
-            turn = 0
-            gameEnd = False
-            gameSqrNums = np.ones((numPlayers,1)) ### Rows are the players, columns are the turns
+    Kinds = ('game', 'turn', 'roll', 'snake', 'ladder', 'overflow', 'move', 'win', 'timeout')
+    Fields = ('kind', 'game', 'turn', 'player', 'fromSquare', 'toSquare', 'roll')
 
-            ### Outputs game number (doesn't output for no verbosity)
-            match newVerbosity:
-                case 'full'|'reduced':
-                    print(f"\n \t Game: {game}") 
 
+    def __init__(self, capacity=1024):
+        '''Instantiates the class (creates an empty trace).
 
-            ### Loop within each game
-            while gameEnd == False:
-                turn = turn + 1
-                turnSqrNums = np.empty((numPlayers,1)) #### Predefines current turn square number array for later
-                firstWinner = True #### Indicates whether the current player would be the first winner if they won
-                player = 1 #### Player number
-                winner = None #### The winning player's number
+            Inputs:
+        capacity: the number of events to allocate space for at the start.
 
-                #### Outputs turn number (full verbosity only)
-                match newVerbosity:
-                    case 'full':
-                        print(f"\n \t \t Turn: {turn}")
+            Outputs:
+        [No Outputs]
+        '''
 
+        self.trace = np.zeros((max(capacity, 1), len(self.Fields)), dtype=np.int32)
+        self.numEvents = 0
+        self._kindCodes = {kind: code for code, kind in enumerate(self.Kinds)}
 
-                #### Turn loop
-                for j in range(0,numPlayers):
-                    player = j + 1
-                    prevNum = int(gameSqrNums[j,turn-1]) ##### The previous turn's square number for the player, converted from numpy.float64 to integers
-                    prevSqr = self.Squares[prevNum-1] ##### The Square class with the corresponding previous number
-
-                    
-                    ##### Messages for reaching a snake/ladder (full verbosity only), included with later merged turn code on off-chance that first square has a ladder
-                    match newVerbosity:
-                        case 'full':
-                            if prevSqr.hasSnake == True:
-                                print(f"Player {player} went down the snake at square {prevNum}.")
-                            elif prevSqr.hasLadder == True:
-                                print(f"Player {player} went up the ladder at square {prevNum}.")
-                    
-                    currNum = prevSqr.roll_die() ##### The current turn's (rolled) square number for the player
-
-
-                    ##### Special cases of currNum
-                    if (currNum == self.numSquares)|(currNum == False): ##### Player reaches the last square
-                        gameEnd = True
-                        
-                        ###### Makes sure that this is the first valid winner
-                        if firstWinner == True: 
-                            winner = player
-                            firstWinner = False
-                    elif currNum > self.numSquares: ##### Player rolls a higher square than the last (if possible)
-
-                        match self.Overflow:
-                            ###### case 'rollback' was already dealt with by generated square numbers
-
-                            case 'classic':
-                                currNum = self.numSquares
-                                gameEnd = True
-
-                                ######## Makes sure that this is the first valid winner
-                                if firstWinner == True: 
-                                    winner = player
-                                    firstWinner = False
-                            case 'ignore':
-                                ######## Shows message for full verbosity only
-                                match newVerbosity:
-                                    case 'full':
-                                        print(f"Player {player}'s roll ({currNum}) was too big.")
-
-                                currNum = int(gameSqrNums[j,turn-1]) ######## Use previous turn's square number, with the number converted to int as it produces numpy.float64 type, which is invalid for indexing
-
-                    
-                    ##### For merged Snake and Ladder turn 
-                    if sepSLturns == False:
-                        newPrevSqr = self.Squares[currNum-1] ###### The Square class with the corresponding current number
-                        newPrevNum = newPrevSqr.squareNum ###### Square number for display in the messages below
-
-                        ###### Messages for reaching a snake/ladder (full verbosity only)
-                        match newVerbosity:
-                            case 'full':
-                                if newPrevSqr.hasSnake == True:
-                                    print(f"Player {player} went down the snake at square {newPrevNum}.")                                    
-                                elif newPrevSqr.hasLadder == True:
-                                    print(f"Player {player} went up the ladder at square {newPrevNum}.")
-
-                        ###### Merges turn by rolling new square if current has snake/ladder
-                        if (newPrevSqr.hasSnake == True)|(newPrevSqr.hasLadder == True):
-                            currNum = newPrevSqr.roll_die() ####### The new current turn's (rolled) square number for the player
-
-
-                    ##### Shows player's next (current) square (full verbosity only)
-                    match newVerbosity:
-                        case 'full':
-                            print(f"Player {player}, next square: {currNum}")
 
-                    ##### Adds player's current square number to the array
-                    turnSqrNums[j, 0] = currNum 
+    @property
+    def events(self):
+        return self.trace[:self.numEvents]
+
 
+    def __call__(self, event):
+        '''Records an event.
 
-                #### Adds current turn square number array to previous turns array
-                gameSqrNums = np.concat((gameSqrNums, turnSqrNums), axis=1) 
+            Inputs:
+        event: the GameEvent.
+
+            Outputs:
+        [No Outputs]
+        '''
 
+        ## Grows the trace geometrically if it is full
+        if self.numEvents == len(self.trace):
+            self.trace = np.concat([self.trace, np.zeros_like(self.trace)])
+
+        self.trace[self.numEvents] = (self._kindCodes[event.kind], event.game, event.turn or 0, event.player or 0, event.fromSquare or 0, event.toSquare or 0, event.roll or 0)
+        self.numEvents = self.numEvents + 1
 
-                #### Deals with end game
-                if (gameEnd == True)|(turn == maxTurns):
-                    match newVerbosity:
-                        case 'full':
-                            if gameEnd == True:
-                                print(f"Player {winner} won the game.")
-                            else: ####### If the turns reaches the maximum
-                                print(f"Max turns ({maxTurns}) exceeded, ending game.")
-                                gameEnd = True
 
-                        case 'reduced':
-                            if gameEnd == True:
-                                print(f"Number of turns: {turn}")
-                            else: ####### If the turns reaches the maximum
-                                gameEnd = True
-                                print(f"Number of turns: {turn} (timed out)")
+    def save(self, file):
+        '''Saves the recorded events to a .npy file, which can be loaded with numpy.load.
 
-                            plyrNum = 1 ####### Player's number for display
+            Inputs:
+        file: the file name or file object.
 
-                            ####### Individual player message loop
-                            for sqr in gameSqrNums[:,-1]: ####### Gets square number for each player during the last turn
-                                if (plyrNum == winner): ######## If the current player won the game
-                                    print(f"Player {plyrNum}'s square: {sqr} (winner)")
-                                else:
-                                    print(f"Player {plyrNum}'s square: {sqr}")
+            Outputs:
+        [No Outputs]
+        '''
 
-                                plyrNum = plyrNum + 1
+        np.save(file, self.events)
 
-                        case 'none':
-                            ####### Flags game as ending if max turn is reached
-                            if gameEnd == False:
-                                gameEnd = True
 
+    def __len__(self):
+        return self.numEvents
 
-            ## Adds array of square numbers for the game to the list for all games
-            gamesList.append(gameSqrNums) 
 
-        return gamesList
+    def __iter__(self):
+        for row in self.events.tolist():
+            info = {name: (value if value != 0 else None) for name, value in zip(self.Fields[1:], row[1:])}
+            yield GameEvent(kind=self.Kinds[row[0]], **info)
 
 
 
 
-class Square:
-    '''Implements each square on a snakes and ladder board.
+class _RunRecorder:
+    '''Records where the time of a play_game call goes and counts what happened in its games, for the run report (see play_game).
 
         Attributes:
-    squareNum: the number of the square.
-    hasSnake = True (has a snake) if square is on the top of a snake.
-    hasLadder = True (has a ladder) if square is on the bottom of a ladder.
-    nextSquares: the list/ndarray of the numbers, or value of the number, of the square(s) that can be reached by this square.
+    phaseTimes: the dictionary of the time (in seconds) spent on each phase. 'lookup': finding the squares reached in the tables; 'rng': rolling the die; 'bookkeeping': tracking the unfinished games and statistics; 'output': storing the games and sending events.
+    counts: the dictionary of the number of 'snakeHits', 'ladderHits', 'overflows' (rolls past the last square) and 'timeouts'.
+    lastTime: the time of the last tick.
 
         Methods:
-    __init__(...): instantiates the class (defines and creates a square).
-    roll_die(...): Gets a random square that can be reached from current square.
+    __init__(...): instantiates the class (with every time and count at zero).
+    tick(...): adds the time since the last tick to a phase.
+    add(...): adds another recorder's times and counts (e.g. from another process).
+    make_report(...): makes the run report dictionary.
     '''
 
+    __slots__ = ('phaseTimes', 'counts', 'lastTime')
 
-    def __init__(self, squareNum, nextSquares=None, hasSnake=False, hasLadder=False):
-        '''instantiates the class (defines and creates a square). 
 
-           Inputs:
-        squareNum: the number of the square.
-        hasSnake = True (has a snake) if square is on the top of a snake.
-        hasLadder = True (has a ladder) if square is on the bottom of a ladder.
-        nextSquares: the list/ndarray of the numbers, or value of the number, of the square(s) that can be reached by this square.
+    def __init__(self):
+        self.phaseTimes = {'lookup': 0.0, 'rng': 0.0, 'bookkeeping': 0.0, 'output': 0.0}
+        self.counts = {'snakeHits': 0, 'ladderHits': 0, 'overflows': 0, 'timeouts': 0}
+        self.lastTime = time.perf_counter()
 
-           Outputs:
+
+    def tick(self, phase):
+        '''Adds the time since the last tick to a phase.
+
+            Inputs:
+        phase: the phase name (see phaseTimes).
+
+            Outputs:
         [No Outputs]
         '''
 
-        ## Makes sure that squareNum is the correct type
-        if type(squareNum) == int: 
-            self.squareNum = squareNum
-        else:
-            print("WARNING: The given square number isn't an integer, so it is set to zero.")
-            self.squareNum = 0
-
+        currTime = time.perf_counter()
+        self.phaseTimes[phase] += currTime - self.lastTime
+        self.lastTime = currTime
 
-        if ( isinstance(nextSquares, tp.NoneType) ) or (np.size(nextSquares) == 0): ## Square has no following squares
-            ### Checks if it has a snake/ladder
-            if (hasSnake == True) and (hasLadder == False): 
-                print("WARNING: Square",self.squareNum,"can't have a snake as it has no following squares, so it is removed.")
-            elif (hasSnake == False) and (hasLadder == True):
-                print("WARNING: Square",self.squareNum,"can't have a ladder as it has no following squares, so it is removed.")
-            elif (hasSnake == True) and (hasLadder == True):
-                print("WARNING: Square",self.squareNum,"can't have a snake or ladder as it has no following squares, so both are removed.")
-                
-            self.hasSnake = False
-            self.hasLadder = False
-            self.nextSquares = None
-            
-        elif (hasSnake == True) and (hasLadder == True): ## Square has both a snake and ladder
-            print("WARNING: Square",self.squareNum,"can't have both snakes and ladders, so it will have neither.")
-            
-            self.nextSquares = nextSquares
-            self.hasSnake = False
-            self.hasLadder = False
 
-        elif ((hasSnake == True) or (hasLadder == True)) and (np.size(nextSquares) > 1):
-            ## If there is a snake/ladder and more than one following square
-            print("WARNING: Square",self.squareNum,"has a snake/ladder, so it should have only one following square.")
+    def add(self, other):
+        '''Adds another recorder's times and counts (e.g. from another process).
 
-            self.hasSnake = hasSnake
-            self.hasLadder = hasLadder
+            Inputs:
+        other: the other _RunRecorder.
 
-            for i in nextSquares:
-                if ((hasSnake == True) and (i < squareNum)) or ((hasLadder == True) and (i > squareNum)):
-                    #### If next square in list is on the bottom of a snake or the top of a ladder (whichever is applicable)
-                    if self.hasSnake == True:
-                        print(f"Valid nextSquares number found ({i}) for square {self.squareNum} (with snake). Setting nextSquares to it.")
-                    elif self.hasLadder == True:
-                        print(f"Valid nextSquares number found ({i}) for square {self.squareNum} (with ladder). Setting nextSquares to it.")                    
+            Outputs:
+        [No Outputs]
+        '''
 
-                    self.nextSquares = i
-                    break
-            else:
-                print("WARNING: Square",self.squareNum,"has no valid following squares, so none will be selected.")
-                self.nextSquares = None
+        for phase in self.phaseTimes:
+            self.phaseTimes[phase] += other.phaseTimes[phase]
+        for count in self.counts:
+            self.counts[count] += other.counts[count]
 
-        else: ### Default case
-            self.hasSnake = hasSnake
-            self.hasLadder = hasLadder
-            self.nextSquares = nextSquares
 
-    
 
-    def roll_die(self):
-        '''Gets a random square that can be reached from current square.
+    def make_report(self, result, numPlayers, engine, wallTime, peakMemory=None):
+        '''Makes the run report dictionary (see play_game).
 
-           Inputs:
-        [No Inputs]
+            Inputs:
+        result: the GameBatch or game statistics dictionary returned by play_game.
+        numPlayers: the number of players for the game.
+        engine: the engine that played the games.
+        wallTime: the time (in seconds) that play_game took.
+        peakMemory: the peak memory (in bytes) traced by tracemalloc, or None if it wasn't traced.
 
-           Output:
-        Next: the number/ID of a random square following this one (False if there is no next square available).
+            Outputs:
+        runReport: the run report dictionary.
         '''
 
-        match self:
-            
-            case Square(nextSquares=None): ### If there are no squares after this one
-                print("WARNING: Square",self.squareNum,"has no connections.")
-                Next = False
-            
-            case _: ### Anything else 
-                if isinstance(self.nextSquares,int): #### nextSquares is an integer
-                    Next = self.nextSquares
-                else:
-                    Next = rd.choice(self.nextSquares) ## Gets random square from nextSquares list
-        
-        return Next
+        if isinstance(result, dict):
+            numGames = result['numGames']
+            numTurns = int(np.sum(np.arange(0, len(result['gameLengthCounts'])) * result['gameLengthCounts']))
+        else:
+            numGames = len(result)
+            numTurns = int(np.sum(result.gameLengths))
+
+        runReport = {
+            'engine': engine,
+            'wallTime': wallTime,
+            'phaseTimes': dict(self.phaseTimes),
+            'numGames': numGames,
+            'numMoves': numTurns * numPlayers,
+            'gamesPerSec': numGames / wallTime if wallTime > 0 else float('inf'),
+            'movesPerSec': numTurns * numPlayers / wallTime if wallTime > 0 else float('inf'),
+            'peakMemoryMB': None if peakMemory == None else peakMemory / 1e6,
+        }
+        runReport.update(self.counts)
+
+        return runReport
 
 
 
@@ -567,6 +3695,40 @@ print(f"Square 8: Next square: {next_8}\n")
 
 
 
+## 1.3 Die Class
+print("\n \t","Die test")
+die1_3_1 = Die(seed=1, blockSize=4)
+print(f"Single rolls: {[die1_3_1.roll() for i in range(0, 6)]}")
+print(f"Array of rolls: {die1_3_1.roll((2,3))}")
+
+die1_3_2 = Die(seed=1, blockSize=4)
+print(f"Same rolls from one array: {die1_3_2.roll(12)}")
+
+
+
+## 1.4 Dice Class
+print("\n \t","Dice test")
+dice1_4_1 = Dice(numFaces=6, numDice=2) # 2d6
+print(f"2d6 totals: {dice1_4_1.Rolls}, probabilities (x36): {dice1_4_1.Probs*36}")
+
+dice1_4_2 = Dice(numFaces=6, rollAgainOn=6, maxRollAgain=1) # Roll again on a 6, once
+print(f"Roll again on a 6 totals: {dice1_4_2.Rolls}, probabilities (x36): {dice1_4_2.Probs*36}")
+
+dice1_4_3 = Dice(numFaces=4, Weights=[1, 1, 1, 5]) # Weighted d4, rolled with the alias table
+die1_4_3 = Die(seed=1, dice=dice1_4_3)
+print(f"Weighted d4 probabilities: {dice1_4_3.Probs}, from 100000 rolls: {np.bincount(die1_4_3.roll(100000))/100000}")
+
+dice1_4_4 = Dice(numFaces=7, Weights=[1, 2]) # Wrong number of weights
+dice1_4_5 = Dice(numFaces=6, rollAgainOn=7) # Total that can't be rolled
+dice1_4_6 = Dice(numFaces=6, rollAgainOn=6, maxRollAgain=None) # No limit on the extra rolls
+print(f"maxRollAgain: {dice1_4_6.maxRollAgain}")
+
+slg1_4_6 = SnakesAndLadders(numSquares=30, Snakes=[[17,4]], Ladders=[[3,22]], Overflow='rollback', dice=dice1_4_1)
+print(f"2d6 rollback next squares from square 25: {slg1_4_6.Squares[24].nextSquares}")
+print(f"2d6 exact expected length: {slg1_4_6.analyse_game()['expectedLength']}, simulated: {np.mean(slg1_4_6.play_game(numPlayers=1, numTimes=10000, maxTurns=1000, Verbosity='none', seed=1).gameLengths)}")
+
+
+
 ## 2. SnakesAndLadders Class
 ### 2.1 __init__ function (Definition and assignment)
 #### 2.1.1 Default square creation testing
@@ -698,6 +3860,30 @@ print(f"\nGame 3: (None)")
 slg2_1_3_2_3 = SnakesAndLadders(numSquares=10, Snakes=[], Ladders=[], Overflow=None)
 
 
+#### 2.1.4 Chained snakes and ladders test
+print("\n \t","Chained snakes and ladders test")
+slg2_1_4_1 = SnakesAndLadders(numSquares=10, Snakes=[[8,5],[7,2]], Ladders=[[2,4],[4,7]], Overflow='classic')
+print(f"Jump table: {slg2_1_4_1.JumpTable}")
+print(f"Chain table: {slg2_1_4_1.ChainTable}") ### 7 goes down to 2, which goes up to 4 and then 7 again, so only the first snake/ladder is kept
+
+slg2_1_4_2 = SnakesAndLadders(numSquares=10, Snakes=[[8,5]], Ladders=[[3,6],[5,9]], Overflow='classic')
+print(f"Chain table: {slg2_1_4_2.ChainTable}")
+
+
+
+#### 2.1.5 Storage test
+print("\n \t","Storage test")
+slg2_1_5_1 = SnakesAndLadders(numSquares=10, Snakes=[[8,5],[7,2]], Ladders=[[2,4],[4,7]], Overflow='rollback', Storage='sparse')
+print(f"Sparse chain table: {np.asarray(slg2_1_5_1.ChainTable)}, same as dense: {np.array_equal(slg2_1_5_1.ChainTable, slg2_1_4_1.ChainTable)}")
+print(f"Next squares from squares 6 and 9: {slg2_1_5_1.NextTable[[6, 9]]}")
+
+slg2_1_5_2 = SnakesAndLadders(numSquares=10000000, Snakes=[[9999999, 5]], Ladders=[[2, 5000000]], Overflow='classic') # Sparse, as it has more than a million squares
+print(f"Storage: {slg2_1_5_2.Storage}, square 2: {slg2_1_5_2.Squares[1].nextSquares}, square 5000000: {slg2_1_5_2.Squares[4999999].nextSquares}")
+print(f"Game: {slg2_1_5_2.play_game(numPlayers=1, numTimes=1, maxTurns=3, Verbosity='none', seed=1)[0]}")
+
+slg2_1_5_3 = SnakesAndLadders(numSquares=10, Snakes=[], Ladders=[], Storage='compressed') # Invalid storage
+
+
 
 ### 2.2 play_game function
 #### 2.2.1 Single game, single player test
@@ -861,4 +4047,199 @@ slg2_2_7_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8]
 
 gl2_2_7_1 = slg2_2_7_1.play_game(numPlayers=1, numTimes=1, maxTurns=100, sepSLturns=False)
 print(f"\n Game List (sepSLturns = False): {gl2_2_7_1}")
+
+
+#### 2.2.8 Engine test
+print("\n \t","Engine test")
+slg2_2_8_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='ignore')
+
+gl2_2_8_1 = slg2_2_8_1.play_game(numPlayers=2, numTimes=3, maxTurns=100, Verbosity='none', Engine='batch')
+print(f"\n Game List (batch engine): {gl2_2_8_1}")
+
+gl2_2_8_2 = slg2_2_8_1.play_game(numPlayers=2, numTimes=3, maxTurns=100, Verbosity='none', sepSLturns=False, Engine='batch')
+print(f"\n Game List (batch engine, sepSLturns = False): {gl2_2_8_2}")
+
+gl2_2_8_3 = slg2_2_8_1.play_game(numPlayers=2, numTimes=1, maxTurns=100, Verbosity='reduced', Engine='batch')
+print(f"\n Game List (batch engine, Verbosity='reduced'): {gl2_2_8_3}")
+
+
+#### 2.2.9 seed and numWorkers test
+print("\n \t","seed and numWorkers test")
+slg2_2_9_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='classic')
+
+gl2_2_9_1 = slg2_2_9_1.play_game(numPlayers=2, numTimes=4, maxTurns=100, Verbosity='none', seed=1, numWorkers=2)
+gl2_2_9_2 = slg2_2_9_1.play_game(numPlayers=2, numTimes=4, maxTurns=100, Verbosity='none', seed=1, numWorkers=2)
+print(f"\n Game List (seed=1, numWorkers=2): {gl2_2_9_1}")
+print(f"Same games for the same seed: {list(gl2_2_9_1.gameLengths) == list(gl2_2_9_2.gameLengths)}")
+
+slg2_2_9_2= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='classic', seed=1)
+slg2_2_9_3= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='classic', seed=1)
+gl2_2_9_3 = slg2_2_9_2.play_game(numPlayers=1, numTimes=3, maxTurns=100, Verbosity='none')
+gl2_2_9_4 = slg2_2_9_3.play_game(numPlayers=1, numTimes=3, maxTurns=100, Verbosity='none')
+print(f"Same games for the same game seed: {list(gl2_2_9_3.gameLengths) == list(gl2_2_9_4.gameLengths)}")
+
+
+#### 2.2.10 iter_games test
+print("\n \t","iter_games test")
+slg2_2_10_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='classic')
+
+for game in slg2_2_10_1.iter_games(numPlayers=2, numTimes=3, maxTurns=100, seed=1):
+    print(f"Game: {game}")
+
+for chunk in slg2_2_10_1.iter_games(numPlayers=1, numTimes=5, maxTurns=100, seed=1, chunkSize=2):
+    print(f"Chunk game lengths: {chunk.gameLengths}")
+
+
+#### 2.2.11 collect test
+print("\n \t","collect test")
+slg2_2_11_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='classic')
+
+st2_2_11_1 = slg2_2_11_1.play_game(numPlayers=2, numTimes=100, maxTurns=5, Verbosity='none', collect='stats')
+print(f"Stats (batch engine): {st2_2_11_1}")
+
+st2_2_11_2 = slg2_2_11_1.play_game(numPlayers=2, numTimes=100, maxTurns=5, Verbosity='none', Engine='loop', collect='stats')
+print(f"Stats (loop engine): {st2_2_11_2}")
+
+
+#### 2.2.12 sinks test
+print("\n \t","sinks test")
+slg2_2_12_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='ignore')
+
+trc2_2_12_1 = TraceSink()
+slg2_2_12_1.play_game(numPlayers=2, numTimes=2, maxTurns=5, Verbosity='none', sinks=trc2_2_12_1)
+print(f"Trace: {trc2_2_12_1.events}")
+print(f"Events: {list(trc2_2_12_1)}")
+
+evt2_2_12_1 = []
+slg2_2_12_1.play_game(numPlayers=2, numTimes=1, maxTurns=5, Verbosity='reduced', sinks=evt2_2_12_1.append) ### Prints and sends events to the list
+print(f"Last event: {evt2_2_12_1[-1]}")
+
+
+#### 2.2.13 archive_games test
+print("\n \t","archive_games test")
+slg2_2_13_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='classic')
+
+arc2_2_13_1 = slg2_2_13_1.archive_games(path='test_archive', numPlayers=2, numTimes=5, maxTurns=5, chunkSize=2, encoding='delta') ### Writes the test_archive directory
+print(f"Archive: {arc2_2_13_1}, segment first games: {arc2_2_13_1.segmentFirstGames}")
+print(f"Games: {list(arc2_2_13_1)}")
+print(f"Last game: {arc2_2_13_1[-1]}")
+print(f"Square frequency: {arc2_2_13_1.square_frequency(numSquares=10)}")
+
+
+#### 2.2.14 report test
+print("\n \t","report test")
+slg2_2_14_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='ignore')
+
+gl2_2_14_1, rpt2_2_14_1 = slg2_2_14_1.play_game(numPlayers=2, numTimes=100, maxTurns=5, Verbosity='none', report='timing')
+print(f"Report (batch engine): {rpt2_2_14_1}")
+
+gl2_2_14_2, rpt2_2_14_2 = slg2_2_14_1.play_game(numPlayers=2, numTimes=100, maxTurns=5, Verbosity='none', Engine='loop', report='memory')
+print(f"Report (loop engine): {rpt2_2_14_2}")
+
+
+#### 2.2.15 cache test
+print("\n \t","cache test")
+slg2_2_15_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='classic')
+slg2_2_15_2= SnakesAndLadders(numSquares=10, Snakes=[[7,5],[9,2],[9,3]], Ladders=[[4,6],[3,8]], Overflow='c') # Same board listed differently
+cache2_2_15_1 = ResultCache('cache_test', maxSizeMB=1)
+
+gl2_2_15_1 = slg2_2_15_1.play_game(numPlayers=2, numTimes=1000, maxTurns=20, Verbosity='none', seed=7, cache=cache2_2_15_1)
+gl2_2_15_2 = slg2_2_15_2.play_game(numPlayers=2, numTimes=1000, maxTurns=20, Verbosity='none', seed=7, cache=cache2_2_15_1) # Cached
+print(f"Same games: {list(map(len, gl2_2_15_1)) == list(map(len, gl2_2_15_2))}, cached results: {len(cache2_2_15_1)}")
+
+gl2_2_15_3 = slg2_2_15_1.play_game(numPlayers=2, numTimes=1000, maxTurns=20, Verbosity='none', cache=cache2_2_15_1) # Not seeded, so not cached
+cache2_2_15_1.clear()
+
+
+#### 2.2.16 play_until test
+print("\n \t","play_until test")
+slg2_2_16_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='rollback')
+
+st2_2_16_1, pr2_2_16_1 = slg2_2_16_1.play_until(numPlayers=2, maxTurns=20, meanHalfWidth=0.05, squareFreqHalfWidth=0.01, winProbHalfWidth=0.01, seed=3)
+print(f"Number of games: {pr2_2_16_1['numGames']}, converged: {pr2_2_16_1['converged']}")
+print(f"Mean game length: {pr2_2_16_1['meanLength']} +/- {pr2_2_16_1['meanHalfWidth']}")
+print(f"Win probabilities: {pr2_2_16_1['winProbs']} +/- {pr2_2_16_1['winProbHalfWidth']}")
+print(f"Square frequency half-widths: {pr2_2_16_1['squareFreqHalfWidth']}")
+
+st2_2_16_2, pr2_2_16_2 = slg2_2_16_1.play_until(numPlayers=2, maxTurns=20, meanHalfWidth=0.0001, maxGames=5000, seed=3) # Warning
+
+st2_2_16_3, pr2_2_16_3 = slg2_2_16_1.play_until(numPlayers=1, maxTurns=1000, winProbHalfWidth=0.01, batchSize=10, seed=3) # The player always wins, but more than one batch is needed
+print(f"Number of games (always won): {pr2_2_16_3['numGames']}, win probability half-width: {pr2_2_16_3['winProbHalfWidth']}")
+
+
+#### 2.2.17 Backend test
+print("\n \t","Backend test")
+slg2_2_17_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='ignore')
+
+gl2_2_17_1 = slg2_2_17_1.play_game(numPlayers=3, numTimes=1000, maxTurns=20, Verbosity='none', sepSLturns=False, seed=5, Backend='numpy')
+gl2_2_17_2 = slg2_2_17_1.play_game(numPlayers=3, numTimes=1000, maxTurns=20, Verbosity='none', sepSLturns=False, seed=5, Backend='numba') # Warning if Numba isn't installed
+print(f"Same games: {np.array_equal(gl2_2_17_1.sqrNums, gl2_2_17_2.sqrNums)}")
+
+st2_2_17_1 = slg2_2_17_1.play_game(numPlayers=3, numTimes=1000, maxTurns=20, Verbosity='none', seed=5, collect='stats', Backend='numpy')
+st2_2_17_2 = slg2_2_17_1.play_game(numPlayers=3, numTimes=1000, maxTurns=20, Verbosity='none', seed=5, collect='stats', Backend='numba')
+print(f"Same stats: {all(np.array_equal(st2_2_17_1[key], st2_2_17_2[key]) for key in st2_2_17_1)}")
+
+gl2_2_17_3 = slg2_2_17_1.play_game(numPlayers=3, numTimes=10, Verbosity='none', Backend='fast') # Warning
+
+
+
+### 2.3 analyse_game function
+print("\n \t","analyse_game test")
+slg2_3_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='rollback')
+
+an2_3_1 = slg2_3_1.analyse_game(maxTurns=20)
+print(f"Expected game length: {an2_3_1['expectedLength']}, timeout probability: {an2_3_1['timeoutProb']}")
+print(f"Game length PMF: {an2_3_1['lengthPMF']}")
+print(f"Expected square visits: {an2_3_1['expectedVisits']}\n")
+
+slg2_3_2= SnakesAndLadders(numSquares=10, Snakes=[[5,3]], Ladders=[[3,5]], Overflow='classic') # Snake and ladder loop that can't be left
+an2_3_2 = slg2_3_2.analyse_game(maxTurns=20)
+print(f"Expected game length (loop): {an2_3_2['expectedLength']}")
+
+slg2_3_3= SnakesAndLadders(numSquares=1000000, Snakes=[[999999,2],[500000,5]], Ladders=[[3,400000]], Overflow='classic', Storage='sparse') # Large board (solved as a sparse matrix if SciPy is installed)
+an2_3_3 = slg2_3_3.analyse_game(maxTurns=20)
+print(f"Expected game length (1000000 squares): {an2_3_3['expectedLength']}")
+
+
+
+### 2.4 analyse_multiplayer_game function
+print("\n \t","analyse_multiplayer_game test")
+slg2_4_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='classic')
+
+an2_4_1 = slg2_4_1.analyse_multiplayer_game(numPlayers=3, maxTurns=20)
+print(f"Win probabilities: {an2_4_1['winProbs']}, timeout probability: {an2_4_1['timeoutProb']}")
+print(f"Expected game length: {an2_4_1['expectedLength']}")
+
+
+
+### 2.5 compare_variants function
+print("\n \t","compare_variants test")
+slg2_5_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='classic')
+slg2_5_2= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='ignore')
+
+cmp2_5_1 = compare_variants({'classic': (slg2_5_1, True), 'ignore': (slg2_5_2, True), 'merged': (slg2_5_1, False)}, numPlayers=2, numTimes=5000, maxTurns=20, seed=4)
+for name, diff in cmp2_5_1['differences'].items():
+    print(f"{name} - classic mean length: {diff['meanLength']} +/- {diff['meanHalfWidth']} (+/- {diff['meanIndependentHalfWidth']} from separate runs)")
+    print(f"{name} - classic win probabilities: {diff['winProbs']} +/- {diff['winProbHalfWidth']}")
+
+
+
+
+## 3. GameSession Class
+print("\n \t","GameSession test")
+slg3_1= SnakesAndLadders(numSquares=10, Snakes=[[9,2],[7,5]], Ladders=[[3,8],[4,6]], Overflow='ignore')
+gs3_1 = GameSession(slg3_1, numPlayers=2, maxTurns=20, seed=6)
+
+ids3_1 = gs3_1.new_games(3)
+mv3_1 = gs3_1.step([0, 2]) # Player 1 of games 0 and 2 moves
+print(f"Moves: {mv3_1}")
+mv3_2 = gs3_1.step() # Player 2 of games 0 and 2, and player 1 of game 1 moves
+print(f"Positions: {gs3_1.Positions.tolist()}, turns: {gs3_1.Turns}, current players: {gs3_1.CurrentPlayer}")
+
+gs3_1.finish()
+print(f"Winners: {gs3_1.Winner}, game lengths: {gs3_1.Turns}, finished: {gs3_1.Finished}")
+
+gs3_1.reset([1]) # Reuses game 1's row
+print(f"Finished after reset: {gs3_1.Finished}")
+mv3_3 = gs3_1.step([1, 5]) # Warning
 '''
\ No newline at end of file
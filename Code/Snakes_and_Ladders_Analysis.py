@@ -0,0 +1,391 @@
+import numpy as np
+import time
+
+from Snakes_and_Ladders import SnakesAndLadders as SL
+
+
+class GameStatistics:
+    '''Adds up the square counts and game length counts of played games as they are given to it, so the summary statistics of any number of games can be found
+    without keeping the games. Game lengths are whole numbers of turns (at most maxTurns), so the count of each length is kept and the median, quantiles and mode
+    are exact, using memory for each possible length rather than each game.
+
+        Attributes:
+    numSquares: the number of squares on the board (None until the first games are added, if not given).
+    numGames: the number of games added.
+    numPlayers: the number of players in every game (None until the first games are added, if not given).
+    squareCounts: the array of the number of times any player was on each square in any turn of the games, starting from the zeroth turn (index 0 is square 1).
+    lengthCounts: the array of the number of games that lasted each number of turns (index 0 is 0 turns), with timed out games lasting maxTurns.
+
+        Methods:
+    __init__(...): instantiates the class (defines and creates empty counts).
+    add(...): adds the counts of played games (a games list, GameBatch, GameArchive or game statistics dictionary).
+    add_lengths(...): adds game lengths only.
+    square_frequency(...): the number of times each square was visited, per game and per player if relative.
+    length_histogram(...): the game length histogram, already binned for plotting.
+    quantile(...): the game length quantiles.
+    mode(...): the most common game length.
+    summary(...): the summary statistics of the game lengths.
+    _add_square_counts(...): adds square counts to squareCounts, growing it if needed.
+    _length_at_rank(...): the game length at positions in the sorted game lengths.
+    '''
+
+
+    def __init__(self, numSquares=None, numPlayers=None):
+        '''Instantiates the class (defines and creates empty counts).
+
+            Inputs:
+        numSquares: the number of squares on the board. If None, the counts grow to the highest square seen.
+        numPlayers: the number of players in every game. If None, it is taken from the first games added.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.numSquares = numSquares
+        self.numPlayers = numPlayers
+        self.numGames = 0
+        self.squareCounts = np.zeros(0 if numSquares == None else numSquares, dtype=np.int64)
+        self.lengthCounts = np.zeros(0, dtype=np.int64)
+
+
+
+    def _add_square_counts(self, counts):
+        '''Adds square counts to squareCounts, growing it if needed.
+
+            Inputs:
+        counts: the array of the number of times each square was visited (index 0 is square 1).
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        if len(counts) > len(self.squareCounts):
+            if self.numSquares != None:
+                print(f"WARNING: Square {len(counts)} was visited, but the board only has {self.numSquares} squares.")
+            self.squareCounts = np.concat((self.squareCounts, np.zeros(len(counts) - len(self.squareCounts), dtype=np.int64)))
+
+        self.squareCounts[:len(counts)] += counts
+
+
+
+    def add_lengths(self, gameLengths):
+        '''Adds game lengths only (e.g. from GameBatch.gameLengths), for when the square numbers aren't needed.
+
+            Inputs:
+        gameLengths: the list/ndarray of the number of turns in each game (not counting the zeroth turn).
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        counts = np.bincount(np.asarray(gameLengths, dtype=np.int64).ravel())
+        if len(counts) > len(self.lengthCounts):
+            self.lengthCounts = np.concat((self.lengthCounts, np.zeros(len(counts) - len(self.lengthCounts), dtype=np.int64)))
+
+        self.lengthCounts[:len(counts)] += counts
+        self.numGames = self.numGames + int(np.sum(counts))
+
+
+
+    def add(self, gamesList, chunkSize=65536):
+        '''Adds the counts of played games. The square numbers are counted with one np.bincount over each segment (GameBatch/GameArchive), or over a flat buffer of
+        each chunk of games (lists of game arrays), so the counting doesn't depend on the number of different squares.
+
+            Inputs:
+        gamesList: the games to add, which can be:
+            the list with the arrays containing the square numbers each player were on in each turn in a game, starting from the zeroth turn at square 1
+            (rows are the players, columns are the turns), e.g. from play_game or iter_games;
+            a GameBatch or a GameArchive;
+            a game statistics dictionary (see play_game with collect='stats').
+        chunkSize: the number of games in a list that are flattened and counted together.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        ## Game statistics dictionaries are already counted
+        if isinstance(gamesList, dict):
+            numPlayers = len(gamesList['winnerCounts'])
+            self._add_square_counts(gamesList['squareFreq'])
+
+            lengthCounts = gamesList['gameLengthCounts']
+            if len(lengthCounts) > len(self.lengthCounts):
+                self.lengthCounts = np.concat((self.lengthCounts, np.zeros(len(lengthCounts) - len(self.lengthCounts), dtype=np.int64)))
+            self.lengthCounts[:len(lengthCounts)] += lengthCounts
+            self.numGames = self.numGames + gamesList['numGames']
+
+        ## Game batches and archives are counted a segment at a time, so the games never have to be loaded all at once
+        elif hasattr(gamesList, 'iter_segments'):
+            numPlayers = gamesList.numPlayers
+            for sqrNums, gameStarts in gamesList.iter_segments():
+                self._add_square_counts(np.bincount(np.ravel(sqrNums))[1:]) ### Square numbers start from 1
+                self.add_lengths(np.diff(gameStarts) - 1) ### Subtracted by one to account for 'zeroth' turn at square 1
+
+        ## Lists of game arrays are flattened into one buffer for each chunk of games
+        else:
+            numPlayers = None
+            chunk = []
+            for game in list(gamesList) + [None]: ### None marks the end, to count the last chunk
+                if game is not None:
+                    chunk.append(game)
+                    if numPlayers == None:
+                        numPlayers = np.shape(game)[0]
+
+                if (len(chunk) == chunkSize) or ((game is None) and (len(chunk) > 0)):
+                    self._add_square_counts(np.bincount(np.concat([np.ravel(chunkGame) for chunkGame in chunk]))[1:])
+                    self.add_lengths([np.shape(chunkGame)[1] - 1 for chunkGame in chunk])
+                    chunk = []
+
+        if numPlayers != None:
+            if self.numPlayers == None:
+                self.numPlayers = numPlayers
+            elif numPlayers != self.numPlayers:
+                print(f"WARNING: The games added have {numPlayers} players, but the earlier games have {self.numPlayers}, so the relative square frequencies are wrong.")
+
+
+
+    def square_frequency(self, relative=False):
+        '''Gets the number of times any player was on each square in any turn of the games (starting from the zeroth turn).
+
+            Inputs:
+        relative: True to divide the counts by the number of games and players (i.e. the mean number of times each player is on each square in a game).
+
+            Outputs:
+        squareFreq: the array of the (relative) frequency of each square (index 0 is square 1).
+        '''
+
+        if relative == True:
+            if self.numGames == 0:
+                print("WARNING: No games have been added, so there are no relative square frequencies.")
+                return np.zeros(len(self.squareCounts))
+            return self.squareCounts / (self.numGames * self.numPlayers)
+
+        return self.squareCounts.copy()
+
+
+
+    def _length_at_rank(self, ranks):
+        '''Gets the game length at positions in the sorted game lengths, from the cumulative length counts.
+
+            Inputs:
+        ranks: the ndarray of the positions (0 is the shortest game).
+
+            Outputs:
+        lengths: the ndarray of the game lengths at the positions.
+        '''
+
+        return np.searchsorted(np.cumsum(self.lengthCounts), ranks, side='right')
+
+
+
+    def quantile(self, q):
+        '''Gets the game length quantiles, interpolated between game lengths in the same way as np.quantile (so the 0.5 quantile is the same as np.median).
+
+            Inputs:
+        q: the quantile, or list/ndarray of quantiles, between 0 and 1.
+
+            Outputs:
+        quantiles: the quantile game length(s), as a float or ndarray.
+        '''
+
+        if self.numGames == 0:
+            print("WARNING: No games have been added, so there are no quantiles.")
+            return np.full(np.shape(q), np.nan)[()]
+
+        positions = np.asarray(q, dtype=float) * (self.numGames - 1)
+        lower = np.floor(positions)
+        lowerLengths = self._length_at_rank(lower)
+        upperLengths = self._length_at_rank(np.minimum(lower + 1, self.numGames - 1))
+
+        return (lowerLengths + (positions - lower) * (upperLengths - lowerLengths))[()] ### [()] returns a float for a single quantile
+
+
+
+    def mode(self):
+        '''Gets the most common game length (the shortest one if there are several).
+
+            Inputs:
+        [No Inputs]
+
+            Outputs:
+        mode: the most common game length.
+        count: the number of games with that length.
+        '''
+
+        if self.numGames == 0:
+            print("WARNING: No games have been added, so there is no mode.")
+            return None, 0
+
+        mode = int(np.argmax(self.lengthCounts))
+
+        return mode, int(self.lengthCounts[mode])
+
+
+
+    def length_histogram(self, binWidth=1, density=False):
+        '''Gets the game length histogram, already binned so it can be plotted without the game lengths (e.g. ax.stairs(values, binEdges, fill=True)).
+
+            Inputs:
+        binWidth: the number of turns in each bin, or 'auto' to choose it from the game lengths (Freedman-Diaconis rule, at least 1 turn).
+        density: True for the probability density of each bin instead of the number of games.
+
+            Outputs:
+        values: the array of the number of games (or probability density) in each bin.
+        binEdges: the array of the bin edges, half a turn either side of the game lengths in each bin, with one more edge than there are bins.
+        '''
+
+        if self.numGames == 0:
+            print("WARNING: No games have been added, so the histogram is empty.")
+            return np.zeros(0), np.zeros(1)
+
+        lengths = np.nonzero(self.lengthCounts)[0]
+        minLength, maxLength = int(lengths[0]), int(lengths[-1])
+
+        ## Chooses the bin width from the spread of the middle half of the game lengths
+        if isinstance(binWidth, str):
+            match binWidth.lower():
+                case 'auto':
+                    q1, q3 = self.quantile([0.25, 0.75])
+                    binWidth = max(int(round(2 * (q3 - q1) / self.numGames**(1/3))), 1)
+                case _:
+                    print(f"WARNING: binWidth '{binWidth}' is not 'auto' or a number of turns. The width is set to 1 turn.")
+                    binWidth = 1
+        binWidth = max(int(binWidth), 1)
+
+        ## Adds up the counts of the game lengths in each bin
+        numBins = (maxLength - minLength) // binWidth + 1
+        counts = np.zeros(numBins * binWidth, dtype=np.int64)
+        counts[:maxLength - minLength + 1] = self.lengthCounts[minLength:maxLength + 1]
+        values = np.sum(np.reshape(counts, (numBins, binWidth)), axis=1)
+        binEdges = minLength - 0.5 + binWidth * np.arange(0, numBins + 1)
+
+        if density == True:
+            values = values / (self.numGames * binWidth)
+
+        return values, binEdges
+
+
+
+    def summary(self, quantiles=[0.05, 0.25, 0.75, 0.95]):
+        '''Gets the summary statistics of the game lengths, the same as scipy.stats.describe (with the sample variance and the biased skewness and excess kurtosis) together
+        with the median, mode and quantiles.
+
+            Inputs:
+        quantiles: the list of quantiles to include.
+
+            Outputs:
+        summary: the dictionary containing:
+            'nobs': the number of games.
+            'minmax': the (shortest, longest) game length.
+            'mean', 'variance', 'skewness', 'kurtosis': the moments of the game lengths.
+            'median': the median game length.
+            'mode', 'modeCount': the most common game length and the number of games with that length.
+            'quantiles': the dictionary of each quantile and its game length.
+        '''
+
+        if self.numGames == 0:
+            print("WARNING: No games have been added, so there are no summary statistics.")
+            return {'nobs': 0}
+
+        lengths = np.arange(0, len(self.lengthCounts))
+        probs = self.lengthCounts / self.numGames
+        nonZeroLengths = np.nonzero(self.lengthCounts)[0]
+
+        mean = float(np.sum(lengths * probs))
+        m2 = float(np.sum((lengths - mean)**2 * probs)) ### Central moments
+        m3 = float(np.sum((lengths - mean)**3 * probs))
+        m4 = float(np.sum((lengths - mean)**4 * probs))
+        mode, modeCount = self.mode()
+
+        summary = {
+            'nobs': self.numGames,
+            'minmax': (int(nonZeroLengths[0]), int(nonZeroLengths[-1])),
+            'mean': mean,
+            'variance': m2 * self.numGames / (self.numGames - 1) if self.numGames > 1 else np.nan,
+            'skewness': m3 / m2**1.5 if m2 > 0 else np.nan,
+            'kurtosis': m4 / m2**2 - 3 if m2 > 0 else np.nan,
+            'median': float(self.quantile(0.5)),
+            'mode': mode,
+            'modeCount': modeCount,
+            'quantiles': dict(zip(quantiles, np.atleast_1d(self.quantile(quantiles)).tolist())),
+        }
+
+        return summary
+
+
+
+def square_frequency(gamesList, numSquares=None, relative=False):
+    '''Gets the frequency of each square in played games (see GameStatistics.add).
+
+        Inputs:
+    gamesList: the games (a games list, GameBatch, GameArchive or game statistics dictionary).
+    numSquares: the number of squares on the board. If None, it is the highest square visited.
+    relative: True to divide the counts by the number of games and players.
+
+        Outputs:
+    squareFreq: the array of the (relative) frequency of each square (index 0 is square 1).
+    '''
+
+    statistics = GameStatistics(numSquares=numSquares)
+    statistics.add(gamesList)
+
+    return statistics.square_frequency(relative=relative)
+
+
+
+def game_lengths(gamesList):
+    '''Gets the number of turns each game lasts in a games list.
+
+        Inputs:
+    gamesList: the list with the arrays containing the square numbers each player were on in each turn in a game (rows are the players, columns are the turns),
+    or a GameBatch or a GameArchive.
+
+        Outputs:
+    gameLengths: the array of the game lengths, in the order of the games.
+    '''
+
+    ## Game batches and archives already store the length of each game
+    if hasattr(gamesList, 'gameLengths'):
+        return np.asarray(gamesList.gameLengths)
+
+    return np.fromiter((np.shape(game)[1] - 1 for game in gamesList), dtype=np.int64) ## Subtracted by one to account for 'zeroth' turn at square 1
+
+
+
+def length_summary(gamesList, quantiles=[0.05, 0.25, 0.75, 0.95]):
+    '''Gets the summary statistics of the game lengths of played games (see GameStatistics.summary).
+
+        Inputs:
+    gamesList: the games (a games list, GameBatch, GameArchive or game statistics dictionary).
+    quantiles: the list of quantiles to include.
+
+        Outputs:
+    summary: the summary statistics dictionary.
+    '''
+
+    statistics = GameStatistics()
+    if isinstance(gamesList, dict):
+        statistics.add(gamesList)
+    else:
+        statistics.add_lengths(game_lengths(gamesList))
+
+    return statistics.summary(quantiles=quantiles)
+
+
+
+if __name__ == '__main__':
+    Snakes = [[29,7],[38,20],[44,14],[55,11],[62,40],[73,52],[82,60],[93,43],[96,17],[98,48]]
+    Ladders = [[3,21],[4,36],[15,48],[24,58],[31,70],[49,90],[60,79],[63,99],[72,91],[77,97]]
+    game = SL(numSquares=100, Snakes=Snakes, Ladders=Ladders, Overflow='classic', seed=0)
+
+    ## Games are added a chunk at a time, so only the counts are kept
+    startTime = time.perf_counter()
+    statistics = GameStatistics(numSquares=100)
+    for gamesList in game.iter_games(numPlayers=1, numTimes=1000000, maxTurns=1000, sepSLturns=False, chunkSize=200000):
+        statistics.add(gamesList)
+    print(f"Played and counted {statistics.numGames} games in {time.perf_counter() - startTime:.1f} s")
+
+    print(f"Relative square frequencies: {np.round(statistics.square_frequency(relative=True)[:10], 3)} ...")
+    print(f"Summary: {statistics.summary()}")
+    values, binEdges = statistics.length_histogram(binWidth='auto', density=True)
+    print(f"Histogram: {len(values)} bins of {binEdges[1] - binEdges[0]:.0f} turns")
@@ -0,0 +1,349 @@
+import numpy as np
+import time
+import tracemalloc
+import json
+import io
+import contextlib
+import platform
+import subprocess
+import os
+import argparse
+
+import Snakes_and_Ladders as SLmodule
+from Snakes_and_Ladders import SnakesAndLadders as SL
+
+
+## Board used in the analysis notebook, for 100 square benchmarks
+classicSnakes = [[29,7],[38,20],[44,14],[55,11],[62,40],[73,52],[82,60],[93,43],[96,17],[98,48]]
+classicLadders = [[3,21],[4,36],[15,48],[24,58],[31,70],[49,90],[60,79],[63,99],[72,91],[77,97]]
+
+## Settings that every benchmark uses unless it changes them
+baseConfig = {
+    'numSquares': 100,
+    'numPlayers': 1,
+    'Overflow': 'classic',
+    'sepSLturns': True,
+    'maxTurns': 100,
+    'Verbosity': 'none',
+    'Engine': 'auto',
+    'collect': 'games',
+    'Backend': 'auto',
+    'numTimes': 10000,
+}
+
+## Values tried for each setting, one setting at a time (number of games for the slow settings is reduced so the suite takes minutes rather than hours)
+sweepValues = {
+    'numSquares': [100, 1000, 10000, 100000, 1000000],
+    'numPlayers': [1, 2, 4, 8],
+    'Overflow': ['classic', 'rollback', 'ignore'],
+    'sepSLturns': [True, False],
+    'maxTurns': [100, 1000],
+    'Verbosity': [('none', 10000), ('reduced', 1000), ('full', 100)],
+    'Engine': [('batch', 10000), ('loop', 1000)],
+    'collect': ['games', 'stats'],
+    'Backend': ['numpy', 'numba'],
+}
+
+
+def make_board(numSquares, seed=0):
+    '''Makes the snakes and ladders of a benchmark board, using the notebook's board for 100 squares and otherwise a random board with a snake and a ladder for every 10 squares.
+
+        Inputs:
+    numSquares: the number of squares on the board.
+    seed: the seed for the random board, so the same board is made every run.
+
+        Outputs:
+    Snakes: the 2D list/ndarray containing the start and end square for every snake.
+    Ladders: the 2D list/ndarray containing the start and end square for every ladder.
+    '''
+
+    if numSquares == 100:
+        return classicSnakes, classicLadders
+
+    rng = np.random.default_rng(seed)
+    numJumps = numSquares // 10
+
+    ## Different start squares for every snake and ladder, none on the first or last square
+    starts = rng.choice(np.arange(2, numSquares), size=2 * numJumps, replace=False)
+    snkStarts, lddrStarts = starts[:numJumps], starts[numJumps:]
+
+    ## Ends anywhere below each snake and above each ladder
+    snkEnds = rng.integers(1, snkStarts)
+    lddrEnds = rng.integers(lddrStarts + 1, numSquares + 1)
+
+    Snakes = np.stack([snkStarts, snkEnds], axis=1)
+    Ladders = np.stack([lddrStarts, lddrEnds], axis=1)
+
+    return Snakes, Ladders
+
+
+
+def get_configs(quick=False):
+    '''Gets the benchmark settings, changing one setting at a time from baseConfig.
+
+        Inputs:
+    quick: True to use 10 times fewer games and only boards of up to 10,000 squares, for a fast check.
+
+        Outputs:
+    configs: the list of dictionaries of the settings for each benchmark (without duplicates).
+    '''
+
+    configs = []
+    for name, values in sweepValues.items():
+        for value in values:
+            config = dict(baseConfig)
+
+            if isinstance(value, tuple): ### (value, numTimes)
+                config[name], config['numTimes'] = value
+            else:
+                config[name] = value
+
+            if quick == True:
+                if config['numSquares'] > 10000:
+                    continue
+                config['numTimes'] = max(config['numTimes'] // 10, 10)
+
+            if config not in configs:
+                configs.append(config)
+
+    return configs
+
+
+
+def benchmark(config, repeats=3, seed=0):
+    '''Times building a game and playing it with the given settings, keeping the fastest of the repeats, and measures the peak memory of playing it.
+
+        Inputs:
+    config: the dictionary of settings (see baseConfig).
+    repeats: the number of times to run the benchmark.
+    seed: the seed for the die rolls, so every run plays the same games.
+
+        Outputs:
+    result: the dictionary of the settings along with:
+        'initSeconds': the time to build the game.
+        'playSeconds': the time to play the games.
+        'gamesPerSec': the number of games played per second.
+        'movesPerSec': the number of player moves played per second.
+        'peakMemoryMB': the largest amount of memory used while playing the games (in MB).
+    '''
+
+    Snakes, Ladders = make_board(config['numSquares'])
+    initTimes, playTimes = [], []
+
+    def play(game):
+        '''Plays the games, with any game messages printed to memory so the terminal doesn't slow them down.'''
+        with contextlib.redirect_stdout(io.StringIO()):
+            return game.play_game(numPlayers=config['numPlayers'], numTimes=config['numTimes'], maxTurns=config['maxTurns'], Verbosity=config['Verbosity'],
+                                  sepSLturns=config['sepSLturns'], Engine=config['Engine'], seed=seed, collect=config['collect'], Backend=config['Backend'])
+
+    for i in range(0, repeats):
+        ## Building the game
+        startTime = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()): ### Hides the warnings about random boards
+            game = SL(numSquares=config['numSquares'], Snakes=Snakes, Ladders=Ladders, Overflow=config['Overflow'])
+        initTimes.append(time.perf_counter() - startTime)
+
+        ## Playing the games
+        startTime = time.perf_counter()
+        games = play(game)
+        playTimes.append(time.perf_counter() - startTime)
+
+    ## Peak memory from one more run, as tracing the memory slows the games down
+    tracemalloc.start()
+    play(game)
+    peakMemory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    ## Number of turns played in all the games
+    if config['collect'] == 'stats':
+        numTurns = int(np.sum(np.arange(0, len(games['gameLengthCounts'])) * games['gameLengthCounts']))
+    else:
+        numTurns = int(np.sum(games.gameLengths))
+
+    result = dict(config)
+    result['initSeconds'] = min(initTimes)
+    result['playSeconds'] = min(playTimes)
+    result['gamesPerSec'] = config['numTimes'] / result['playSeconds']
+    result['movesPerSec'] = numTurns * config['numPlayers'] / result['playSeconds']
+    result['peakMemoryMB'] = peakMemory / 1e6
+
+    return result
+
+
+
+def check_equivalence(game, numPlayers, numTimes=100000, maxTurns=100, sepSLturns=True, seed=0, **playSettings):
+    '''Checks that the games played by play_game (e.g. with a new engine or result type) follow the exact distributions from analyse_multiplayer_game.
+
+        Inputs:
+    game: the SnakesAndLadders game to check (small enough to analyse).
+    numPlayers, numTimes, maxTurns, sepSLturns, seed: see play_game.
+    playSettings: any other play_game settings, e.g. Engine or collect.
+
+        Outputs:
+    check: the dictionary containing:
+        'lengthZScore': the difference between the average and expected game length, in standard errors.
+        'lengthKS': the largest difference between the played and exact game length cumulative distributions.
+        'winnerKS': the same for the winning player (with timed out games counted after the last player).
+        'ksLimit': the difference that the KS values only go over 5% of the time if the games are correct.
+        'passed': whether the z-score is within 3 and both KS values are within ksLimit.
+    '''
+
+    analysis = game.analyse_multiplayer_game(numPlayers=numPlayers, maxTurns=maxTurns, sepSLturns=sepSLturns)
+    playSettings.setdefault('Verbosity', 'none')
+    games = game.play_game(numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns, sepSLturns=sepSLturns, seed=seed, **playSettings)
+
+    ## Played game length and winner counts, from either result type
+    if isinstance(games, dict):
+        lengthCounts = games['gameLengthCounts']
+        winnerCounts = np.append(games['winnerCounts'], games['timeoutCount'])
+    else:
+        lengthCounts = np.bincount(games.gameLengths, minlength=maxTurns + 1)
+        winners = np.full(len(games), numPlayers) ### Timed out games are counted after the last player
+        for i, gameSqrNums in enumerate(games):
+            finished = np.flatnonzero(game.TerminalMask[gameSqrNums[:, -1]])
+            if len(finished) > 0:
+                winners[i] = finished[0]
+        winnerCounts = np.bincount(winners, minlength=numPlayers + 1)
+
+    exactLengths = analysis['lengthPMF']
+    exactWinners = np.append(analysis['winProbs'], analysis['timeoutProb'])
+
+    ## Average game length compared to the exact expected length
+    turns = np.arange(0, len(exactLengths))
+    lengthSD = np.sqrt(np.sum(turns**2 * exactLengths) - analysis['expectedLength']**2)
+    averageLength = np.sum(turns * lengthCounts) / numTimes
+    lengthZScore = float((averageLength - analysis['expectedLength']) / (lengthSD / np.sqrt(numTimes))) if lengthSD > 0 else 0.0
+
+    ## Largest differences between the cumulative distributions (Kolmogorov-Smirnov statistics)
+    lengthKS = float(np.max(np.abs(np.cumsum(lengthCounts) / numTimes - np.cumsum(exactLengths))))
+    winnerKS = float(np.max(np.abs(np.cumsum(winnerCounts) / numTimes - np.cumsum(exactWinners))))
+    ksLimit = float(1.36 / np.sqrt(numTimes))
+
+    check = {
+        'lengthZScore': lengthZScore,
+        'lengthKS': lengthKS,
+        'winnerKS': winnerKS,
+        'ksLimit': ksLimit,
+        'passed': bool((abs(lengthZScore) < 3) and (lengthKS < ksLimit) and (winnerKS < ksLimit)),
+    }
+
+    return check
+
+
+
+def get_run_info():
+    '''Gets the details of the computer and code that the benchmarks ran on, so runs can be compared across commits.
+
+        Inputs:
+    [No Inputs]
+
+        Outputs:
+    info: the dictionary of the time, git commit, Python, NumPy and Numba versions, and platform.
+    '''
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except Exception: ## Not a git repository or git isn't installed
+        commit = None
+
+    info = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'numba': getattr(SLmodule.numba, '__version__', None), ### None if it isn't installed
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpuCount': os.cpu_count(),
+    }
+
+    return info
+
+
+
+def run_benchmarks(configs=None, repeats=3, file=None, equivalence=True):
+    '''Runs the benchmarks (and the equivalence checks) and saves the results as JSON.
+
+        Inputs:
+    configs: the list of dictionaries of settings (see baseConfig). None uses get_configs().
+    repeats: the number of times to run each benchmark.
+    file: the JSON file name to save the results to. None doesn't save them.
+    equivalence: True to check every engine and result type on the notebook's board with check_equivalence.
+
+        Outputs:
+    results: the dictionary containing 'info' (see get_run_info), 'benchmarks' (the list of benchmark results) and 'equivalence' (the list of equivalence checks).
+    '''
+
+    if configs == None:
+        configs = get_configs()
+
+    results = {'info': get_run_info(), 'benchmarks': [], 'equivalence': []}
+
+    for config in configs:
+        result = benchmark(config, repeats=repeats)
+        results['benchmarks'].append(result)
+        print(f"{config}: {result['gamesPerSec']:.0f} games/s, {result['movesPerSec']:.0f} moves/s, {result['peakMemoryMB']:.1f} MB")
+
+    ## Checks every engine and result type against the exact distributions
+    if equivalence == True:
+        game = SL(numSquares=100, Snakes=classicSnakes, Ladders=classicLadders, Overflow='classic')
+        for settings in [{'Engine': 'batch', 'Backend': 'numpy'}, {'Engine': 'batch', 'collect': 'stats', 'Backend': 'numpy'}, {'Engine': 'batch', 'Backend': 'numba'}, {'Engine': 'batch', 'collect': 'stats', 'Backend': 'numba'},
+                         {'Engine': 'loop', 'numTimes': 10000}, {'Engine': 'loop', 'collect': 'stats', 'numTimes': 10000}]:
+            for numPlayers in [1, 4]:
+                for sepSLturns in [True, False]:
+                    check = check_equivalence(game, numPlayers=numPlayers, sepSLturns=sepSLturns, **settings)
+                    check.update(settings, numPlayers=numPlayers, sepSLturns=sepSLturns)
+                    results['equivalence'].append(check)
+                    print(f"Equivalence {settings}, {numPlayers} players, sepSLturns={sepSLturns}: {'passed' if check['passed'] else 'FAILED'}")
+
+    if file != None:
+        with open(file, 'w') as f:
+            json.dump(results, f, indent=1)
+
+    return results
+
+
+
+def compare_benchmarks(oldFile, newFile):
+    '''Prints the speed up of each benchmark between two saved runs (e.g. from different commits).
+
+        Inputs:
+    oldFile: the JSON file of the earlier run.
+    newFile: the JSON file of the later run.
+
+        Outputs:
+    speedUps: the list of (settings, games/s speed up, peak memory ratio) for the benchmarks in both runs.
+    '''
+
+    with open(oldFile) as f:
+        oldResults = json.load(f)
+    with open(newFile) as f:
+        newResults = json.load(f)
+
+    speedUps = []
+    for new in newResults['benchmarks']:
+        config = {name: new[name] for name in baseConfig}
+        for old in oldResults['benchmarks']:
+            if {name: old.get(name, baseConfig[name]) for name in baseConfig} == config: ### Settings added since the old run have their default value
+                speedUp = new['gamesPerSec'] / old['gamesPerSec']
+                memoryRatio = new['peakMemoryMB'] / old['peakMemoryMB'] if old['peakMemoryMB'] > 0 else float('nan')
+                speedUps.append((config, speedUp, memoryRatio))
+                print(f"{config}: {speedUp:.2f}x speed, {memoryRatio:.2f}x memory")
+
+    return speedUps
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks building and playing Snakes and Ladders games.")
+    parser.add_argument('--out', default='benchmarks.json', help="JSON file to save the results to.")
+    parser.add_argument('--repeats', type=int, default=3, help="Number of times to run each benchmark.")
+    parser.add_argument('--quick', action='store_true', help="Fewer games and smaller boards, for a fast check.")
+    parser.add_argument('--no-equivalence', action='store_true', help="Skip the equivalence checks.")
+    parser.add_argument('--compare', metavar='OLD_JSON', help="Saved run to compare the new results to.")
+    args = parser.parse_args()
+
+    run_benchmarks(configs=get_configs(quick=args.quick), repeats=args.repeats, file=args.out, equivalence=not args.no_equivalence)
+
+    if args.compare != None:
+        compare_benchmarks(args.compare, args.out)
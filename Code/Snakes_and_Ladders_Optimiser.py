@@ -0,0 +1,254 @@
+import numpy as np
+import io
+import contextlib
+import os
+import concurrent.futures as cf
+
+from Snakes_and_Ladders import SnakesAndLadders as SL
+from Snakes_and_Ladders import multiplayer_distributions
+
+
+def board_metrics(game, numPlayers=1, maxTurns=100, sepSLturns=True):
+    '''Calculates the exact game length summary of a board, from its game length distribution (see SnakesAndLadders.analyse_multiplayer_game).
+
+        Inputs:
+    game: the SnakesAndLadders game.
+    numPlayers: the number of players for the game.
+    maxTurns: the maximum number of turns before the game ends automatically.
+    sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together.
+
+        Outputs:
+    metrics: the dictionary containing the 'mean', 'median' and 'variance' of the number of turns of the game (with timed out games lasting maxTurns), and the 'timeoutProb' of no player finishing within maxTurns.
+    '''
+
+    with contextlib.redirect_stdout(io.StringIO()): ## Hides the warnings about boards that might never finish, which show up as timeouts instead
+        lengthPMF = game.analyse_game(maxTurns=maxTurns, sepSLturns=sepSLturns)['lengthPMF']
+
+    analysis = multiplayer_distributions(lengthPMF=lengthPMF, numPlayers=numPlayers)
+    turns = np.arange(0, maxTurns + 1)
+    mean = float(np.sum(turns * analysis['lengthPMF']))
+
+    metrics = {
+        'mean': mean,
+        'median': int(np.searchsorted(np.cumsum(analysis['lengthPMF']), 0.5)),
+        'variance': float(np.sum(turns**2 * analysis['lengthPMF']) - mean**2),
+        'timeoutProb': analysis['timeoutProb'],
+    }
+
+    return metrics
+
+
+
+def board_loss(metrics, targets):
+    '''Scores how far a board's game length summary is from the targets, as the sum of the squared relative differences (0 if every target is met).
+
+        Inputs:
+    metrics: the dictionary from board_metrics.
+    targets: the dictionary of the targets, with any of 'mean', 'median', 'variance' and 'maxTimeoutProb' (the largest allowed timeoutProb).
+
+        Outputs:
+    loss: the score, where smaller is better.
+    '''
+
+    loss = 0.0
+    for name in ['mean', 'median', 'variance']:
+        if targets.get(name) != None:
+            loss = loss + ((metrics[name] - targets[name]) / max(targets[name], 1))**2
+
+    ## Timeout probability only counts when it is over the bound
+    if (targets.get('maxTimeoutProb') != None) and (metrics['timeoutProb'] > targets['maxTimeoutProb']):
+        loss = loss + ((metrics['timeoutProb'] - targets['maxTimeoutProb']) / max(targets['maxTimeoutProb'], 0.01))**2
+
+    return loss
+
+
+
+def random_board(numSquares, numSnakes, numLadders, rng):
+    '''Places snakes and ladders randomly, with no two on the same square and none on the first or last square.
+
+        Inputs:
+    numSquares: the number of squares on the board.
+    numSnakes: the number of snakes.
+    numLadders: the number of ladders.
+    rng: the numpy.random.Generator used to place them.
+
+        Outputs:
+    Snakes: the array of the start and end square for every snake.
+    Ladders: the array of the start and end square for every ladder.
+    '''
+
+    starts = rng.choice(np.arange(2, numSquares), size=numSnakes + numLadders, replace=False)
+    snkStarts, lddrStarts = starts[:numSnakes], starts[numSnakes:]
+
+    Snakes = np.stack([snkStarts, rng.integers(1, snkStarts)], axis=1)
+    Ladders = np.stack([lddrStarts, rng.integers(lddrStarts + 1, numSquares + 1)], axis=1)
+
+    return Snakes, Ladders
+
+
+
+def _move_board(Snakes, Ladders, numSquares, rng):
+    '''Makes a neighbouring board by moving one snake or ladder, either its end or both its start and end.
+
+        Inputs:
+    Snakes, Ladders: the arrays of the current board (see random_board).
+    numSquares: the number of squares on the board.
+    rng: the numpy.random.Generator used to move it.
+
+        Outputs:
+    newSnakes, newLadders: the arrays of the new board.
+    '''
+
+    newSnakes, newLadders = np.copy(Snakes), np.copy(Ladders)
+    if len(Snakes) + len(Ladders) == 0: ## Nothing to move
+        return newSnakes, newLadders
+
+    isSnake = rng.random() < len(Snakes) / (len(Snakes) + len(Ladders))
+    jumps = newSnakes if isSnake else newLadders
+    i = rng.integers(0, len(jumps))
+
+    ## Moves the start to a free square half the time
+    if rng.random() < 0.5:
+        used = np.concat([newSnakes[:, 0], newLadders[:, 0]])
+        free = np.setdiff1d(np.arange(2, numSquares), used)
+        if len(free) > 0:
+            jumps[i, 0] = rng.choice(free)
+
+    ## New end below a snake's start or above a ladder's start
+    if isSnake:
+        jumps[i, 1] = rng.integers(1, jumps[i, 0])
+    else:
+        jumps[i, 1] = rng.integers(jumps[i, 0] + 1, numSquares + 1)
+
+    return newSnakes, newLadders
+
+
+
+def _anneal_board(numSquares, numSnakes, numLadders, Overflow, targets, numPlayers, maxTurns, sepSLturns, numSteps, seedSequence):
+    '''Searches for a board close to the targets with simulated annealing, starting from a random board (run in each process by optimise_board).
+
+        Inputs:
+    numSquares, numSnakes, numLadders, Overflow, targets, numPlayers, maxTurns, sepSLturns, numSteps: see optimise_board.
+    seedSequence: the numpy.random.SeedSequence for this search.
+
+        Outputs:
+    bestLoss: the loss of the best board found.
+    bestSnakes, bestLadders: the arrays of the best board found.
+    '''
+
+    rng = np.random.default_rng(seedSequence)
+
+    def loss_of(Snakes, Ladders):
+        '''Builds the board and scores it.'''
+        with contextlib.redirect_stdout(io.StringIO()): ## Hides the warnings about chains that loop
+            game = SL(numSquares=numSquares, Snakes=Snakes, Ladders=Ladders, Overflow=Overflow, seed=0)
+        return board_loss(board_metrics(game, numPlayers=numPlayers, maxTurns=maxTurns, sepSLturns=sepSLturns), targets)
+
+    Snakes, Ladders = random_board(numSquares, numSnakes, numLadders, rng)
+    loss = loss_of(Snakes, Ladders)
+    bestLoss, bestSnakes, bestLadders = loss, Snakes, Ladders
+
+    ## Temperature falls from accepting most worse boards to accepting almost none
+    temperatures = np.geomspace(max(loss, 1e-3) * 0.1, 1e-6, max(numSteps, 1))
+
+    for step in range(0, numSteps):
+        if bestLoss == 0:
+            break
+
+        newSnakes, newLadders = _move_board(Snakes, Ladders, numSquares, rng)
+        newLoss = loss_of(newSnakes, newLadders)
+
+        if (newLoss <= loss) or (rng.random() < np.exp((loss - newLoss) / temperatures[step])):
+            Snakes, Ladders, loss = newSnakes, newLadders, newLoss
+
+            if loss < bestLoss:
+                bestLoss, bestSnakes, bestLadders = loss, Snakes, Ladders
+
+    return bestLoss, bestSnakes, bestLadders
+
+
+
+def optimise_board(numSquares, numSnakes, numLadders, Overflow='classic', targetMean=None, targetMedian=None, targetVariance=None, maxTimeoutProb=None,
+                   numPlayers=1, maxTurns=100, sepSLturns=True, numSteps=2000, numWorkers=None, seed=None):
+    '''Searches for snake and ladder placements whose game length is close to the targets, using the exact game length distribution to score each board. Each process runs its own search from a different random board, and the best board is kept.
+
+        Inputs:
+    numSquares: the number of squares on the board.
+    numSnakes: the number of snakes.
+    numLadders: the number of ladders.
+    Overflow: What to do if the rolled square is beyond the last on the board (see SnakesAndLadders).
+    targetMean: the target mean number of turns of the game (None for no target).
+    targetMedian: the target median number of turns of the game (None for no target).
+    targetVariance: the target variance of the number of turns of the game (None for no target).
+    maxTimeoutProb: the largest allowed probability of the game reaching maxTurns without a winner (None for no bound).
+    numPlayers: the number of players for the game.
+    maxTurns: the maximum number of turns before the game ends automatically.
+    sepSLturns: True if going up a ladder/down a snake is considered to be a separate turn from originally moving to the square, False if they are merged together.
+    numSteps: the number of boards each process tries.
+    numWorkers: the number of processes to search with. None uses every CPU.
+    seed: the seed for the searches, so the same seed and numWorkers give the same board.
+
+        Outputs:
+    game: the SnakesAndLadders game with the best board found, ready to play.
+    result: the dictionary containing the 'loss' (see board_loss), the 'metrics' of the board (see board_metrics) and the 'targets'.
+    '''
+
+    targets = {'mean': targetMean, 'median': targetMedian, 'variance': targetVariance, 'maxTimeoutProb': maxTimeoutProb}
+    if all(target == None for target in targets.values()):
+        print("WARNING: No targets were given, so any board is as good as another.")
+
+    if numSnakes < 0:
+        print("WARNING: The number of snakes can't be negative, so it is set to 0.")
+        numSnakes = 0
+    if numLadders < 0:
+        print("WARNING: The number of ladders can't be negative, so it is set to 0.")
+        numLadders = 0
+
+    ## With no snakes or ladders there is only one board, so there is nothing to search
+    if numSnakes + numLadders == 0:
+        print("WARNING: There are no snakes or ladders to place, so the board without any is returned.")
+        game = SL(numSquares=numSquares, Snakes=[], Ladders=[], Overflow=Overflow)
+        metrics = board_metrics(game, numPlayers=numPlayers, maxTurns=maxTurns, sepSLturns=sepSLturns)
+        return game, {'loss': board_loss(metrics, targets), 'metrics': metrics, 'targets': targets}
+
+    if numSnakes + numLadders > numSquares - 2:
+        print(f"WARNING: There are only {numSquares - 2} squares that can have a snake or ladder, so there are fewer snakes and ladders.")
+        numSnakes = min(numSnakes, numSquares - 2)
+        numLadders = numSquares - 2 - numSnakes
+
+    if numWorkers == None:
+        numWorkers = os.cpu_count()
+    numWorkers = max(numWorkers, 1)
+
+    ## Independent searches for each process
+    seeds = np.random.SeedSequence(seed).spawn(numWorkers)
+    searchArgs = [(numSquares, numSnakes, numLadders, Overflow, targets, numPlayers, maxTurns, sepSLturns, numSteps, seeds[w]) for w in range(0, numWorkers)]
+
+    if numWorkers == 1:
+        searches = [_anneal_board(*searchArgs[0])]
+    else:
+        with cf.ProcessPoolExecutor(max_workers=numWorkers) as executor:
+            searches = list(executor.map(_anneal_board, *zip(*searchArgs)))
+
+    ## Keeps the best board (the first process' on ties, so the result doesn't depend on timing)
+    bestLoss, Snakes, Ladders = min(searches, key=lambda search: search[0])
+
+    ## Builds the board, which is checked as a normal game would be
+    game = SL(numSquares=numSquares, Snakes=Snakes.tolist(), Ladders=Ladders.tolist(), Overflow=Overflow)
+    metrics = board_metrics(game, numPlayers=numPlayers, maxTurns=maxTurns, sepSLturns=sepSLturns)
+
+    result = {
+        'loss': board_loss(metrics, targets),
+        'metrics': metrics,
+        'targets': targets,
+    }
+
+    return game, result
+
+
+
+if __name__ == '__main__':
+    game, result = optimise_board(numSquares=100, numSnakes=10, numLadders=10, targetMean=30, targetVariance=200, maxTimeoutProb=0.01, numSteps=500)
+    print(f"Snakes: {game.Snakes}")
+    print(f"Ladders: {game.Ladders}")
+    print(f"Result: {result}")
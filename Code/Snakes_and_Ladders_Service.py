@@ -0,0 +1,696 @@
+import numpy as np
+import asyncio
+import json
+import os
+import time
+import argparse
+import concurrent.futures as cf
+
+from Snakes_and_Ladders import SnakesAndLadders as SL
+
+
+def _board_key(board):
+    '''Gets the key of a board from its request definition, so requests for the same board share the compiled game.
+
+        Inputs:
+    board: the dictionary of the board's 'numSquares', 'Snakes', 'Ladders', 'Overflow' and (optionally) 'Dice', the dictionary of its Dice's inputs (see SnakesAndLadders and Dice.spec).
+
+        Outputs:
+    key: the JSON text of the board, with its keys in order.
+    '''
+
+    return json.dumps({'numSquares': board['numSquares'], 'Snakes': board.get('Snakes', []), 'Ladders': board.get('Ladders', []), 'Overflow': board.get('Overflow', 'classic'),
+                       'Dice': board.get('Dice')}, sort_keys=True)
+
+
+
+def _check_board(board):
+    '''Checks a board's request definition before it is compiled, since the SnakesAndLadders constructor would only warn on the service's own output and play a different board.
+
+        Inputs:
+    board: the board definition (see _board_key).
+
+        Outputs:
+    [No Outputs] (raises ValueError with the reason if the board isn't valid, which is sent back as the error of the request)
+    '''
+
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    if not isinstance(board, dict):
+        raise ValueError(f"board should be a dictionary but is {type(board).__name__}.")
+    unknown = set(board) - {'numSquares', 'Snakes', 'Ladders', 'Overflow', 'Dice'}
+    if len(unknown) > 0:
+        raise ValueError(f"board has unknown keys {sorted(unknown)}.")
+
+    numSquares = board.get('numSquares')
+    if not (is_int(numSquares) and numSquares >= 2):
+        raise ValueError(f"board numSquares should be an integer of at least 2 but is {numSquares!r}.")
+
+    ## Snakes and ladders, as [start, end] pairs on the board
+    for name in ['Snakes', 'Ladders']:
+        jumps = board.get(name, [])
+        if not isinstance(jumps, list):
+            raise ValueError(f"board {name} should be a list of [start, end] pairs but is {type(jumps).__name__}.")
+        for jump in jumps:
+            if not (isinstance(jump, list) and len(jump) == 2 and all(is_int(sqrNum) for sqrNum in jump)):
+                raise ValueError(f"board {name} should be a list of [start, end] pairs of integers, but has {jump!r}.")
+            if not (1 <= min(jump) and max(jump) <= numSquares and jump[0] != jump[1]):
+                raise ValueError(f"board {name} has {jump}, which should be two different squares from 1 to {numSquares}.")
+
+    Overflow = board.get('Overflow', 'classic')
+    if not (isinstance(Overflow, str) and Overflow.lower() in ['classic', 'c', 'rollback', 'r', 'rb', 'ignore', 'i']):
+        raise ValueError(f"board Overflow should be 'classic', 'rollback' or 'ignore' but is {Overflow!r}.")
+
+    ## Dice, with the inputs of Dice
+    dice = board.get('Dice')
+    if dice == None:
+        return
+    if not isinstance(dice, dict):
+        raise ValueError(f"board Dice should be a dictionary but is {type(dice).__name__}.")
+    unknown = set(dice) - {'numFaces', 'numDice', 'Weights', 'rollAgainOn', 'maxRollAgain'}
+    if len(unknown) > 0:
+        raise ValueError(f"board Dice has unknown keys {sorted(unknown)}.")
+
+    numFaces = dice.get('numFaces', 6)
+    for name, default in [('numFaces', 6), ('numDice', 1)]:
+        if not (is_int(dice.get(name, default)) and dice.get(name, default) >= 1):
+            raise ValueError(f"board Dice {name} should be a positive integer but is {dice.get(name)!r}.")
+
+    Weights = dice.get('Weights')
+    if Weights != None:
+        if not (isinstance(Weights, list) and len(Weights) == numFaces and all(isinstance(w, (int, float)) and not isinstance(w, bool) and w >= 0 for w in Weights) and sum(Weights) > 0):
+            raise ValueError(f"board Dice Weights should be {numFaces} non-negative numbers (one for each face) that aren't all zero.")
+
+    rollAgainOn = dice.get('rollAgainOn')
+    if rollAgainOn != None:
+        numDice = dice.get('numDice', 1)
+        if not (is_int(rollAgainOn) and numDice <= rollAgainOn <= numDice * numFaces):
+            raise ValueError(f"board Dice rollAgainOn should be a total from {numDice} to {numDice * numFaces} but is {rollAgainOn!r}.")
+        if not (is_int(dice.get('maxRollAgain', 2)) and dice.get('maxRollAgain', 2) >= 0):
+            raise ValueError(f"board Dice maxRollAgain should be a non-negative integer but is {dice.get('maxRollAgain')!r}.")
+
+
+
+def _check_counts(**counts):
+    '''Checks that the counts of a request (e.g. numPlayers, numTimes, maxTurns) are positive integers, since play_game would otherwise return empty statistics.
+
+        Inputs:
+    **counts: the counts by name.
+
+        Outputs:
+    [No Outputs] (raises ValueError with the reason if a count isn't valid, which is sent back as the error of the request)
+    '''
+
+    for name, value in counts.items():
+        if not (isinstance(value, int) and not isinstance(value, bool) and value >= 1):
+            raise ValueError(f"{name} should be a positive integer but is {value!r}.")
+
+
+
+def _to_json(value):
+    '''Converts a result (e.g. a game statistics dictionary) into something JSON can save, with arrays as lists.
+
+        Inputs:
+    value: the result.
+
+        Outputs:
+    jsonValue: the result with every array and NumPy number converted.
+    '''
+
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+
+def _simulate_batch(game, numPlayers, maxTurns, sepSLturns, pieceTimes, seed=None):
+    '''Plays the games of several requests as one batch and splits the statistics back up (run in each process by SimulationService).
+
+        Inputs:
+    game: the SnakesAndLadders game, compiled once for every request on the board.
+    numPlayers, maxTurns, sepSLturns, seed: see play_game (a request's own seed for a seeded batch, which only has one request, otherwise a seed spawned by SimulationService for the batch).
+    pieceTimes: the list of the number of games for each request in the batch, in order.
+
+        Outputs:
+    statsList: the list of the game statistics dictionaries (see play_game) of each request's games.
+    '''
+
+    ## A single request gets its statistics straight from play_game, so a seeded request gives the same statistics as playing it in-process
+    if len(pieceTimes) == 1:
+        return [game.play_game(numPlayers=numPlayers, numTimes=pieceTimes[0], maxTurns=maxTurns, Verbosity='none', sepSLturns=sepSLturns, Engine='batch', seed=seed, collect='stats')]
+
+    gamesList = game.play_game(numPlayers=numPlayers, numTimes=int(np.sum(pieceTimes)), maxTurns=maxTurns, Verbosity='none', sepSLturns=sepSLturns, Engine='batch', seed=seed)
+    gameLengths = gamesList.gameLengths
+    pieceStarts = np.concat([[0], np.cumsum(pieceTimes)])
+
+    ## Each request gets the next pieceTimes games of the batch
+    statsList = []
+    for p in range(0, len(pieceTimes)):
+        start, stop = pieceStarts[p], pieceStarts[p+1]
+        sqrNums = gamesList.sqrNums[:, gamesList.gameStarts[start]:gamesList.gameStarts[stop]]
+
+        ### The first player in turn order on the last square at the end of a game won it
+        finished = game.TerminalMask[gamesList.sqrNums[:, gamesList.gameStarts[start+1:stop+1] - 1]]
+        gameEnd = np.any(finished, axis=0)
+
+        statsList.append({
+            'numGames': int(stop - start),
+            'squareFreq': np.bincount(np.ravel(sqrNums), minlength=game.numSquares + 1)[1:],
+            'gameLengthCounts': np.bincount(gameLengths[start:stop], minlength=maxTurns + 1),
+            'winnerCounts': np.bincount(np.argmax(finished[:, gameEnd], axis=0), minlength=numPlayers),
+            'timeoutCount': int(np.count_nonzero(~gameEnd)),
+        })
+
+    return statsList
+
+
+
+def _analyse(game, numPlayers, maxTurns, sepSLturns):
+    '''Calculates the exact distributions of a game (run in each process by SimulationService, see SnakesAndLadders.analyse_multiplayer_game).'''
+    return game.analyse_multiplayer_game(numPlayers=numPlayers, maxTurns=maxTurns, sepSLturns=sepSLturns)
+
+
+
+
+class SimulationService:
+    '''Implements a local asyncio service that plays and analyses Snakes and Ladders games on request, over TCP or a Unix socket.
+
+    Each request and response is one line of JSON. Concurrent unseeded 'simulate' requests for the same board and settings are joined into one batch of games (micro-batching), which is played in a separate process and split back up. Large requests are split into several batches, with the statistics so far streamed back after each one.
+
+    Requests: {"id": ..., "kind": "simulate", "board": {"numSquares": 100, "Snakes": [...], "Ladders": [...], "Overflow": "classic", "Dice": {"numFaces": 6, "numDice": 1}}, "numPlayers": 1, "numTimes": 10000, "maxTurns": 100, "sepSLturns": true, "seed": null}
+              {"id": ..., "kind": "analyse", "board": {...}, "numPlayers": 1, "maxTurns": 100, "sepSLturns": true}
+    Responses: {"id": ..., "ok": true, "done": false/true, "result": {...}} or {"id": ..., "ok": false, "error": "..."}, where result is the game statistics (see play_game) or analysis (see analyse_multiplayer_game).
+    Requests with an invalid board (see _check_board), or a numPlayers, numTimes or maxTurns below 1, are answered with an error rather than played.
+
+        Attributes:
+    numWorkers: the number of processes that play the batches.
+    maxDelay: the longest time (in seconds) a request waits for others to join its batch.
+    maxBatchGames: the largest number of games in a batch (larger requests are split).
+    maxBoards: the number of compiled boards kept, with the least recently used removed.
+    numBatches, numRequests: the number of batches played and simulate requests received.
+
+        Methods:
+    __init__(...): instantiates the class.
+    start(...): starts listening for connections.
+    close(...): stops listening and shuts down the processes.
+    simulate(...): plays games for a request, yielding the statistics so far after each of its batches.
+    analyse(...): calculates the exact distributions for a request.
+    _get_game(...): gets the compiled game of a board.
+    _flush(...): sends a group of waiting requests off as one batch.
+    _start_task(...): runs a coroutine as a task, keeping a reference to it.
+    _run_batch(...): plays a batch in a separate process and hands each request its statistics.
+    _handle_connection(...), _handle_request(...): read the requests of a connection and write back the responses.
+    '''
+
+
+    def __init__(self, numWorkers=None, maxDelay=0.005, maxBatchGames=50000, maxBoards=64):
+        '''Instantiates the class.
+
+            Inputs:
+        numWorkers: the number of processes that play the batches. None uses every CPU.
+        maxDelay: the longest time (in seconds) a request waits for others to join its batch.
+        maxBatchGames: the largest number of games in a batch (larger requests are split).
+        maxBoards: the number of compiled boards kept.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.numWorkers = numWorkers if numWorkers != None else os.cpu_count()
+        self.maxDelay = maxDelay
+        self.maxBatchGames = max(int(maxBatchGames), 1)
+        self.maxBoards = maxBoards
+        self.numBatches = 0
+        self.numRequests = 0
+
+        self._executor = None
+        self._server = None
+        self._games = {} ## Compiled games by board key, in order of last use
+        self._pending = {} ## Requests waiting for their batch by batch key, each as [pieces, total games, timer]
+        self._analyses = {} ## Analyses being calculated by key, shared by identical requests
+        self._tasks = set() ## Batches being played
+        self._connections = {} ## Writer of each open connection, by its handler task
+        self._seedSequence = np.random.SeedSequence() ## Spawns the seed of each unseeded batch, so every batch plays different games
+        self._slots = None ## Limits the batches running at once to the number of processes, so waiting requests keep joining batches
+
+
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        '''Starts listening for connections (call close to stop).
+
+            Inputs:
+        host, port: the address to listen on over TCP (localhost by default). A port of 0 picks a free port.
+        path: the Unix socket file to listen on instead of TCP (None uses TCP).
+
+            Outputs:
+        address: the (host, port) being listened on, or the Unix socket path.
+        '''
+
+        self._executor = cf.ProcessPoolExecutor(max_workers=self.numWorkers)
+        self._slots = asyncio.Semaphore(self.numWorkers)
+
+        if path != None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=path, limit=2**24)
+            return path
+
+        self._server = await asyncio.start_server(self._handle_connection, host=host, port=port, limit=2**24)
+        return self._server.sockets[0].getsockname()[:2]
+
+
+
+    async def close(self):
+        if self._server != None:
+            self._server.close()
+            await self._server.wait_closed()
+
+        ## Closes the open connections, letting their handlers finish
+        handlers = list(self._connections.keys())
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+        if self._executor != None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+
+    def _get_game(self, board):
+        '''Gets the compiled game of a board, compiling it the first time it is asked for.
+
+            Inputs:
+        board: the board definition (see _board_key).
+
+            Outputs:
+        key: the board key.
+        game: the SnakesAndLadders game.
+        '''
+
+        _check_board(board)
+        key = _board_key(board)
+        game = self._games.pop(key, None)
+        if game == None:
+            game = SL(numSquares=board['numSquares'], Snakes=board.get('Snakes', []), Ladders=board.get('Ladders', []), Overflow=board.get('Overflow', 'classic'), dice=board.get('Dice'))
+
+        ## Moves the board to the end as the most recently used, and removes the least recently used if there are too many
+        self._games[key] = game
+        if len(self._games) > self.maxBoards:
+            del self._games[next(iter(self._games))]
+
+        return key, game
+
+
+
+    async def simulate(self, board, numPlayers=1, numTimes=10000, maxTurns=100, sepSLturns=True, seed=None):
+        '''Plays games for a request, joining unseeded requests for the same board and settings into shared batches.
+
+            Inputs:
+        board: the board definition (see _board_key).
+        numPlayers, numTimes, maxTurns, sepSLturns: see play_game.
+        seed: the seed for the die rolls. A seeded request is played in its own batch (and never split), so it gives the same statistics as play_game with collect 'stats'.
+
+            Outputs (yielded):
+        stats: the game statistics dictionary (see play_game) of the request's games played so far, after each of its batches.
+        '''
+
+        _check_counts(numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns)
+        boardKey, game = self._get_game(board)
+        self.numRequests += 1
+        loop = asyncio.get_running_loop()
+
+        ## Seeded requests aren't joined with others, so they can be repeated
+        if seed != None:
+            pieceFutures = [loop.create_future()]
+            self._start_task(self._run_batch((boardKey, numPlayers, maxTurns, bool(sepSLturns), seed), game, [(numTimes, pieceFutures[0])]))
+        else:
+            batchKey = (boardKey, numPlayers, maxTurns, bool(sepSLturns), None)
+            pieceFutures = []
+
+            ### Splits the request into pieces that fit in a batch, each joining the group of waiting requests
+            for start in range(0, numTimes, self.maxBatchGames):
+                pieceTimes = min(self.maxBatchGames, numTimes - start)
+                pieceFutures.append(loop.create_future())
+
+                group = self._pending.get(batchKey)
+                if (group != None) and (group[1] + pieceTimes > self.maxBatchGames):
+                    self._flush(batchKey, game)
+                    group = None
+
+                if group == None:
+                    group = [[], 0, loop.call_later(self.maxDelay, self._flush, batchKey, game)]
+                    self._pending[batchKey] = group
+
+                group[0].append((pieceTimes, pieceFutures[-1]))
+                group[1] += pieceTimes
+
+        ## Streams back the statistics so far as each piece is played
+        stats = None
+        for future in pieceFutures:
+            pieceStats = await future
+            stats = pieceStats if stats == None else {key: stats[key] + pieceStats[key] for key in stats}
+            yield stats
+
+
+
+    def _flush(self, batchKey, game):
+        '''Sends a group of waiting requests off as one batch.
+
+            Inputs:
+        batchKey: the key of the group (board key, numPlayers, maxTurns, sepSLturns, seed).
+        game: the SnakesAndLadders game of the board.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        group = self._pending.pop(batchKey, None)
+        if group == None: ## Already sent off when it got full
+            return
+
+        if group[2] != None:
+            group[2].cancel()
+
+        self._start_task(self._run_batch(batchKey, game, group[0]))
+
+
+
+    def _start_task(self, coroutine):
+        '''Runs a coroutine as a task, keeping a reference to it until it finishes so it isn't garbage collected.'''
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+
+    async def _run_batch(self, batchKey, game, pieces):
+        '''Plays a batch in a separate process (once a process is free) and hands each request its statistics.
+
+            Inputs:
+        batchKey: the key of the group (see _flush).
+        game: the SnakesAndLadders game of the board.
+        pieces: the list of the (number of games, future) of each request in the batch.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        boardKey, numPlayers, maxTurns, sepSLturns, seed = batchKey
+        loop = asyncio.get_running_loop()
+
+        ## The game is copied to the process with its die as it was when compiled, so unseeded batches each get their own seed
+        if seed == None:
+            seed = self._seedSequence.spawn(1)[0]
+
+        async with self._slots:
+            self.numBatches += 1
+            try:
+                statsList = await loop.run_in_executor(self._executor, _simulate_batch, game, numPlayers, maxTurns, sepSLturns, [pieceTimes for pieceTimes, future in pieces], seed)
+            except Exception as e: ## Passes the error on to every request in the batch
+                for pieceTimes, future in pieces:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        for (pieceTimes, future), stats in zip(pieces, statsList):
+            if not future.done():
+                future.set_result(stats)
+
+
+
+    async def analyse(self, board, numPlayers=1, maxTurns=100, sepSLturns=True):
+        '''Calculates the exact distributions for a request in a separate process, sharing the calculation between identical requests made at the same time.
+
+            Inputs:
+        board: the board definition (see _board_key).
+        numPlayers, maxTurns, sepSLturns: see analyse_multiplayer_game.
+
+            Outputs:
+        analysis: the dictionary returned by analyse_multiplayer_game.
+        '''
+
+        _check_counts(numPlayers=numPlayers, maxTurns=maxTurns)
+        boardKey, game = self._get_game(board)
+        key = (boardKey, numPlayers, maxTurns, bool(sepSLturns))
+
+        if key not in self._analyses:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, _analyse, game, numPlayers, maxTurns, sepSLturns)
+            self._analyses[key] = future
+            future.add_done_callback(lambda done: self._analyses.pop(key, None))
+
+        return await asyncio.shield(self._analyses[key])
+
+
+
+    async def _handle_request(self, message, send):
+        '''Runs a request and sends back its responses.
+
+            Inputs:
+        message: the request dictionary.
+        send: the coroutine function that writes a response dictionary to the connection.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        requestId = message.get('id')
+        try:
+            settings = {name: message[name] for name in ['numPlayers', 'maxTurns', 'sepSLturns'] if name in message}
+            match message.get('kind'):
+                case 'simulate':
+                    stats = None
+                    async for stats in self.simulate(message['board'], numTimes=message.get('numTimes', 10000), seed=message.get('seed'), **settings):
+                        if stats['numGames'] < message.get('numTimes', 10000):
+                            await send({'id': requestId, 'ok': True, 'done': False, 'result': _to_json(stats)})
+                    await send({'id': requestId, 'ok': True, 'done': True, 'result': _to_json(stats)})
+                case 'analyse':
+                    analysis = await self.analyse(message['board'], **settings)
+                    await send({'id': requestId, 'ok': True, 'done': True, 'result': _to_json(analysis)})
+                case _:
+                    await send({'id': requestId, 'ok': False, 'error': f"Unknown request kind {message.get('kind')!r}."})
+        except Exception as e: ## Any error is sent back rather than stopping the service
+            await send({'id': requestId, 'ok': False, 'error': f"{type(e).__name__}: {e}"})
+
+
+
+    async def _handle_connection(self, reader, writer):
+        '''Reads the requests of a connection (one JSON line each) and runs them at the same time, writing each response line as it is ready.
+
+            Inputs:
+        reader, writer: the asyncio streams of the connection.
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        writeLock = asyncio.Lock()
+
+        async def send(response):
+            async with writeLock: ### Responses of different requests are never mixed up on the line
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        self._connections[asyncio.current_task()] = writer
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as e:
+                    await send({'id': None, 'ok': False, 'error': f"Invalid JSON: {e}"})
+                    continue
+
+                task = asyncio.get_running_loop().create_task(self._handle_request(message, send))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            await asyncio.gather(*tasks)
+        except ConnectionError: ## The client went away
+            pass
+        finally:
+            del self._connections[asyncio.current_task()]
+            writer.close()
+
+
+
+
+class SimulationClient:
+    '''Implements an asyncio client for a SimulationService, which can have many requests in progress on one connection.
+
+        Methods:
+    __init__(...): instantiates the class.
+    connect(...), close(...): opens and closes the connection (or use "async with").
+    simulate(...): plays games on the service, returning the statistics of all of them.
+    stream_simulate(...): plays games on the service, yielding the statistics so far as they arrive.
+    analyse(...): calculates the exact distributions on the service.
+    _request(...): sends a request and yields its responses.
+    _read_responses(...): hands each response line to the request it belongs to.
+    '''
+
+
+    def __init__(self, host='127.0.0.1', port=8765, path=None):
+        '''Instantiates the class.
+
+            Inputs:
+        host, port: the address of the service over TCP.
+        path: the Unix socket file of the service (used instead of host and port).
+
+            Outputs:
+        [No Outputs]
+        '''
+
+        self.host, self.port, self.path = host, port, path
+        self._reader, self._writer = None, None
+        self._queues = {} ## Response queue of each request in progress, by id
+        self._nextId = 0
+        self._readTask = None
+
+
+    async def connect(self):
+        if self.path != None:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=2**24)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=2**24)
+        self._readTask = asyncio.get_running_loop().create_task(self._read_responses())
+        return self
+
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._readTask.cancel()
+
+
+    async def __aenter__(self):
+        return await self.connect()
+
+
+    async def __aexit__(self, *excInfo):
+        await self.close()
+
+
+    async def _read_responses(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            if response.get('id') in self._queues:
+                self._queues[response['id']].put_nowait(response)
+
+
+    async def _request(self, message):
+        '''Sends a request and yields its responses until the last one.
+
+            Inputs:
+        message: the request dictionary (without its id).
+
+            Outputs (yielded):
+        result: the result of each response.
+        '''
+
+        self._nextId += 1
+        requestId = self._nextId
+        queue = asyncio.Queue()
+        self._queues[requestId] = queue
+
+        self._writer.write(json.dumps(dict(message, id=requestId)).encode() + b'\n')
+        await self._writer.drain()
+
+        try:
+            while True:
+                response = await queue.get()
+                if response['ok'] == False:
+                    raise RuntimeError(response['error'])
+                yield response['result']
+                if response['done'] == True:
+                    break
+        finally:
+            del self._queues[requestId]
+
+
+    async def stream_simulate(self, board, numPlayers=1, numTimes=10000, maxTurns=100, sepSLturns=True, seed=None):
+        '''Plays games on the service, yielding the statistics of the games played so far as they arrive (see SimulationService.simulate).'''
+        async for stats in self._request({'kind': 'simulate', 'board': board, 'numPlayers': numPlayers, 'numTimes': numTimes, 'maxTurns': maxTurns, 'sepSLturns': sepSLturns, 'seed': seed}):
+            yield stats
+
+
+    async def simulate(self, board, numPlayers=1, numTimes=10000, maxTurns=100, sepSLturns=True, seed=None):
+        '''Plays games on the service, returning the game statistics dictionary (with lists instead of arrays) of all of them (see SimulationService.simulate).'''
+        async for stats in self.stream_simulate(board, numPlayers=numPlayers, numTimes=numTimes, maxTurns=maxTurns, sepSLturns=sepSLturns, seed=seed):
+            pass
+        return stats
+
+
+    async def analyse(self, board, numPlayers=1, maxTurns=100, sepSLturns=True):
+        '''Calculates the exact distributions on the service, returning the analysis dictionary (see SimulationService.analyse).'''
+        async for analysis in self._request({'kind': 'analyse', 'board': board, 'numPlayers': numPlayers, 'maxTurns': maxTurns, 'sepSLturns': sepSLturns}):
+            return analysis
+
+
+
+async def _demo(numClients=200, numTimes=1000, numWorkers=None):
+    '''Starts a service on a free localhost port and sends it many requests at once, printing the throughput and latencies.'''
+
+    board = {'numSquares': 100, 'Snakes': [[29,7],[38,20],[44,14],[55,11],[62,40],[73,52],[82,60],[93,43],[96,17],[98,48]],
+             'Ladders': [[3,21],[4,36],[15,48],[24,58],[31,70],[49,90],[60,79],[63,99],[72,91],[77,97]], 'Overflow': 'classic'}
+
+    service = SimulationService(numWorkers=numWorkers)
+    host, port = await service.start(port=0)
+
+    async def client():
+        async with SimulationClient(host, port) as conn:
+            startTime = time.perf_counter()
+            stats = await conn.simulate(board, numPlayers=2, numTimes=numTimes)
+            return time.perf_counter() - startTime, stats['numGames']
+
+    startTime = time.perf_counter()
+    results = await asyncio.gather(*[client() for c in range(0, numClients)])
+    wallTime = time.perf_counter() - startTime
+
+    latencies = np.array([latency for latency, numGames in results])
+    print(f"{numClients} requests of {numTimes} games in {wallTime:.2f} s ({numClients / wallTime:.0f} requests/s) using {service.numBatches} batches")
+    print(f"Latency: median {np.median(latencies)*1000:.0f} ms, max {np.max(latencies)*1000:.0f} ms")
+
+    async with SimulationClient(host, port) as conn:
+        analysis = await conn.analyse(board, numPlayers=2)
+        print(f"Exact expected game length: {analysis['expectedLength']}")
+
+        ### Requests with invalid settings are answered with an error
+        try:
+            await conn.simulate(board, numPlayers=0, numTimes=numTimes)
+        except RuntimeError as e:
+            print(f"Rejected request: {e}")
+
+    await service.close()
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local service that plays and analyses Snakes and Ladders games on request.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on.")
+    parser.add_argument('--port', type=int, default=8765, help="Port to listen on.")
+    parser.add_argument('--unix', default=None, help="Unix socket file to listen on instead of TCP.")
+    parser.add_argument('--workers', type=int, default=None, help="Number of processes that play the games.")
+    parser.add_argument('--demo', action='store_true', help="Start a service on a free port and send it many requests at once.")
+    args = parser.parse_args()
+
+    async def serve():
+        service = SimulationService(numWorkers=args.workers)
+        address = await service.start(host=args.host, port=args.port, path=args.unix)
+        print(f"Listening on {address}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await service.close()
+
+    asyncio.run(_demo(numWorkers=args.workers) if args.demo else serve())
@@ -0,0 +1,152 @@
+import numpy as np
+import time
+import os
+import csv
+import itertools
+import concurrent.futures as cf
+
+from Snakes_and_Ladders import SnakesAndLadders as SL
+
+
+def _play_cells(game, cells):
+    '''Plays the cells of a sweep that share a compiled board (run in each process by run_sweep).
+
+        Inputs:
+    game: the SnakesAndLadders game, compiled once for all the cells.
+    cells: the list of dictionaries of each cell's settings, including its 'seed' and 'numTimes'.
+
+        Outputs:
+    rows: the list of the result table rows of the cells (see run_sweep).
+    '''
+
+    rows = []
+    for cell in cells:
+        startTime = time.perf_counter()
+        stats = game.play_game(numPlayers=cell['numPlayers'], numTimes=cell['numTimes'], maxTurns=cell['maxTurns'], Verbosity='none', sepSLturns=cell['sepSLturns'],
+                               Engine='batch', seed=cell['seed'], collect='stats')
+        seconds = time.perf_counter() - startTime
+
+        ## Summary of the game lengths (timed out games last maxTurns)
+        lengthProbs = stats['gameLengthCounts'] / stats['numGames']
+        turns = np.arange(0, len(lengthProbs))
+        meanLength = float(np.sum(turns * lengthProbs))
+
+        row = {name: value for name, value in cell.items() if name != 'seed'}
+        row['meanLength'] = meanLength
+        row['medianLength'] = int(np.searchsorted(np.cumsum(lengthProbs), 0.5))
+        row['lengthVariance'] = float(np.sum(turns**2 * lengthProbs) - meanLength**2)
+        row['timeoutProb'] = stats['timeoutCount'] / stats['numGames']
+        row['winProbs'] = (stats['winnerCounts'] / stats['numGames']).tolist()
+        row['seconds'] = seconds
+
+        ### Exact values for the same cell, to compare with
+        if cell['exact'] == True:
+            analysis = game.analyse_multiplayer_game(numPlayers=cell['numPlayers'], maxTurns=cell['maxTurns'], sepSLturns=cell['sepSLturns'])
+            row['exactMeanLength'] = analysis['expectedLength']
+            row['exactTimeoutProb'] = analysis['timeoutProb']
+            row['exactWinProbs'] = analysis['winProbs'].tolist()
+
+        rows.append(row)
+
+    return rows
+
+
+
+def run_sweep(boards, Overflows=['classic'], numPlayers=[1], maxTurns=[100], sepSLturns=[True], numTimes=10000, numWorkers=None, seed=None, exact=False):
+    '''Plays every combination (cell) of the boards and settings, and summarises each cell's games in one table. Each board is compiled once for each Overflow type and reused by all of its cells, and the cells are split between processes.
+
+        Inputs:
+    boards: the dictionary of each board's name and its (numSquares, Snakes, Ladders), e.g. {'notebook': (100, snks, lddrs)}.
+    Overflows: the list of Overflow types (see SnakesAndLadders).
+    numPlayers: the list of numbers of players.
+    maxTurns: the list of maximum numbers of turns.
+    sepSLturns: the list of sepSLturns values (see play_game).
+    numTimes: the number of games to play in each cell.
+    numWorkers: the number of processes to split the cells between. None uses every CPU.
+    seed: the seed for the die rolls. Each cell gets its own seed from it, so a cell's results don't depend on the other cells or numWorkers.
+    exact: True to also add the exact mean length, timeout probability and win probabilities of each cell (see SnakesAndLadders.analyse_multiplayer_game).
+
+        Outputs:
+    rows: the list of dictionaries of each cell's results (in the order of the grid), containing the cell's 'board', 'numSquares', 'Overflow', 'numPlayers', 'maxTurns', 'sepSLturns' and 'numTimes', and:
+        'meanLength', 'medianLength', 'lengthVariance': the summary of the number of turns of the games (with timed out games lasting maxTurns).
+        'timeoutProb': the proportion of games that reached maxTurns without a winner.
+        'winProbs': the list of the proportion of games each player won (index 0 is player 1).
+        'seconds': the time taken to play the cell's games.
+        'exactMeanLength', 'exactTimeoutProb', 'exactWinProbs': the exact values, if exact is True.
+    '''
+
+    ## Compiles each board once for each Overflow type
+    games = {}
+    for name, (numSquares, Snakes, Ladders) in boards.items():
+        for Overflow in Overflows:
+            games[(name, Overflow)] = SL(numSquares=numSquares, Snakes=Snakes, Ladders=Ladders, Overflow=Overflow)
+
+    ## Every cell of the grid, with its own seed
+    grid = list(itertools.product(boards, Overflows, numPlayers, maxTurns, sepSLturns))
+    cellSeeds = np.random.SeedSequence(seed).spawn(len(grid))
+    cells = []
+    for c, (name, Overflow, plyrs, trns, sepTurns) in enumerate(grid):
+        cells.append({'board': name, 'numSquares': boards[name][0], 'Overflow': games[(name, Overflow)].Overflow, 'numPlayers': plyrs, 'maxTurns': trns, 'sepSLturns': sepTurns,
+                      'numTimes': numTimes, 'exact': exact, 'seed': cellSeeds[c]})
+
+    if numWorkers == None:
+        numWorkers = os.cpu_count()
+    numWorkers = max(min(numWorkers, len(cells)), 1)
+
+    ## Groups the cells by compiled board, split into a few tasks per process so that they are shared out evenly
+    tasks = []
+    for key in games:
+        boardCells = [c for c in range(0, len(cells)) if (grid[c][0], grid[c][1]) == key]
+        numChunks = min(len(boardCells), max(-(-4 * numWorkers // len(games)), 1)) ### Rounded up
+        for chunk in np.array_split(np.array(boardCells, dtype=int), numChunks):
+            tasks.append((key, chunk.tolist()))
+
+    rows = [None] * len(cells)
+
+    if numWorkers == 1:
+        for key, cellNums in tasks:
+            for c, row in zip(cellNums, _play_cells(games[key], [cells[c] for c in cellNums])):
+                rows[c] = row
+    else:
+        with cf.ProcessPoolExecutor(max_workers=numWorkers) as executor:
+            futures = [executor.submit(_play_cells, games[key], [cells[c] for c in cellNums]) for key, cellNums in tasks]
+
+            ### Puts the rows back in the order of the grid
+            for (key, cellNums), future in zip(tasks, futures):
+                for c, row in zip(cellNums, future.result()):
+                    rows[c] = row
+
+    for row in rows:
+        del row['exact']
+
+    return rows
+
+
+
+def save_sweep(rows, file):
+    '''Saves the results table of a sweep as a CSV file (lists are saved as text).
+
+        Inputs:
+    rows: the list of dictionaries from run_sweep.
+    file: the CSV file name.
+
+        Outputs:
+    [No Outputs]
+    '''
+
+    with open(file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+
+if __name__ == '__main__':
+    Snakes = [[16, 6], [47, 26], [49, 11], [56, 53], [62, 19], [64, 60], [87, 24], [93, 73], [95, 75], [98, 78]]
+    Ladders = [[1, 38], [4, 14], [9, 31], [21, 42], [28, 84], [36, 44], [51, 67], [71, 91], [80, 100]]
+
+    rows = run_sweep({'classic': (100, Snakes, Ladders), 'no jumps': (100, [], [])}, Overflows=['classic', 'rollback', 'ignore'], numPlayers=[1, 2, 4],
+                     maxTurns=[100], sepSLturns=[True, False], numTimes=10000, seed=0)
+    save_sweep(rows, 'sweep_results.csv')
+    for row in rows:
+        print(f"{row['board']}, {row['Overflow']}, {row['numPlayers']} players, sepSLturns={row['sepSLturns']}: mean length {row['meanLength']:.2f}, timeouts {row['timeoutProb']:.4f}")